@@ -23,7 +23,9 @@ CREATE TABLE IF NOT EXISTS useraccount (
     Email VARCHAR(150) NOT NULL UNIQUE,
     Role ENUM('admin','fact-checker','user') NOT NULL DEFAULT 'user',
     PasswordHash VARCHAR(255) NOT NULL,
-    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- GET /api/users (ORDER BY Name)
+    INDEX idx_user_name (Name)
 );
 
 -- SOURCE TABLE (uses column Name, Domain, TrustRating)
@@ -32,7 +34,11 @@ CREATE TABLE IF NOT EXISTS source (
     Name VARCHAR(150) NOT NULL,
     Domain VARCHAR(200) NOT NULL UNIQUE,
     TrustRating DECIMAL(5,2) DEFAULT 50.00 CHECK (TrustRating BETWEEN 0 AND 100),
-    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Top trusted sources (ORDER BY TrustRating DESC LIMIT 5)
+    INDEX idx_source_trust (TrustRating, SourceID),
+    -- GET /api/sources (ORDER BY Name)
+    INDEX idx_source_name (Name)
 );
 
 -- ARTICLE TABLE
@@ -44,10 +50,22 @@ CREATE TABLE IF NOT EXISTS article (
     SourceID INT NOT NULL,
     PublishDate DATE NOT NULL,
     CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Maintained by flag_article_after_report / report_count_after_delete
+    ReportCount INT NOT NULL DEFAULT 0,
     FOREIGN KEY (SourceID) REFERENCES source(SourceID)
-        ON DELETE CASCADE ON UPDATE CASCADE
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    -- Keyset pagination for GET /api/articles (ORDER BY CreatedAt DESC, ArticleID DESC)
+    INDEX idx_article_created (CreatedAt, ArticleID),
+    -- Top-N by report count (ORDER BY ReportCount DESC, ArticleID DESC)
+    INDEX idx_article_report_count (ReportCount, ArticleID),
+    -- GET /api/articles/search (MATCH ... AGAINST)
+    FULLTEXT INDEX ft_article_title_content (Title, Content)
 );
 
+-- Existing databases: run backend/migrate_add_report_count.py for ReportCount,
+-- then backend/migrate_add_query_indexes.py for the secondary indexes
+-- (including idx_article_review on (ReviewStatus, ReportCount))
+
 -- REPORT TABLE
 CREATE TABLE IF NOT EXISTS report (
     ReportID INT AUTO_INCREMENT PRIMARY KEY,
@@ -74,9 +92,168 @@ CREATE TABLE IF NOT EXISTS credibilitycheck (
     FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
         ON DELETE CASCADE ON UPDATE CASCADE,
     FOREIGN KEY (CheckedBy) REFERENCES useraccount(UserID)
-        ON DELETE SET NULL
+        ON DELETE SET NULL,
+    -- Latest check per article (ORDER BY CheckDate DESC, CheckID DESC):
+    -- article_latest_check maintenance and its fallback in GET /api/articles
+    INDEX idx_check_article_date (ArticleID, CheckDate, CheckID)
+);
+
+-- SOURCE CREDIBILITY STATS (running aggregate maintained by triggers)
+-- TrustRating = ScoreSum / CheckCount * 100, updated in O(1) per check
+CREATE TABLE IF NOT EXISTS source_credibility_stats (
+    SourceID INT PRIMARY KEY,
+    ScoreSum DECIMAL(14,4) NOT NULL DEFAULT 0,
+    CheckCount INT NOT NULL DEFAULT 0,
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (SourceID) REFERENCES source(SourceID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- SESSIONS (token SHA-256 -> user, issued on login / signup)
+CREATE TABLE IF NOT EXISTS user_session (
+    TokenHash CHAR(64) PRIMARY KEY,
+    UserID INT NOT NULL,
+    Role VARCHAR(32) NOT NULL,
+    CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    ExpiresAt DATETIME NOT NULL,
+    INDEX idx_session_expires (ExpiresAt),
+    INDEX idx_session_user (UserID),
+    FOREIGN KEY (UserID) REFERENCES useraccount(UserID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- NEAR-DUPLICATE INDEX (MinHash signature per article + LSH band buckets)
+-- Filled by the API on insert; backfill with migrate_add_near_duplicate_index.py
+CREATE TABLE IF NOT EXISTS article_minhash (
+    ArticleID INT PRIMARY KEY,
+    Signature VARBINARY(512) NOT NULL,
+    ShingleCount INT NOT NULL,
+    FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS article_lsh_band (
+    Band TINYINT UNSIGNED NOT NULL,
+    BucketHash BIGINT NOT NULL,
+    ArticleID INT NOT NULL,
+    PRIMARY KEY (Band, BucketHash, ArticleID),
+    INDEX idx_lsh_article (ArticleID),
+    FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- VERDICT PROPAGATION (maintained incrementally by propagate_verdicts.py)
+CREATE TABLE IF NOT EXISTS job_watermark (
+    JobName VARCHAR(64) PRIMARY KEY,
+    LastID BIGINT NOT NULL DEFAULT 0,
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Rows queued for a background job by the *_pending triggers
+CREATE TABLE IF NOT EXISTS job_pending (
+    JobName VARCHAR(64) NOT NULL,
+    RowID BIGINT NOT NULL,
+    PRIMARY KEY (JobName, RowID)
+);
+
+CREATE TABLE IF NOT EXISTS article_cluster (
+    ArticleID INT PRIMARY KEY,
+    ClusterID INT NOT NULL,
+    INDEX idx_cluster (ClusterID),
+    FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS article_cluster_size (
+    ClusterID INT PRIMARY KEY,
+    Size INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS suggested_verdict (
+    ArticleID INT PRIMARY KEY,
+    SuggestedVerdict ENUM('Fake','Real') NOT NULL,
+    Confidence DECIMAL(4,3) NOT NULL,
+    BasedOnArticleID INT NOT NULL,
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- TREND ROLLUPS (hourly / daily aggregates maintained by backend/rollup_trends.py,
+-- which folds the job_pending rows 'trend_rollups.reports' / '.checks')
+CREATE TABLE IF NOT EXISTS report_rollup_hourly (
+    BucketStart DATETIME PRIMARY KEY,
+    Reports INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS report_rollup_daily (
+    BucketDate DATE PRIMARY KEY,
+    Reports INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS check_rollup_hourly (
+    BucketStart DATETIME NOT NULL,
+    SourceID INT NOT NULL,
+    FinalVerdict ENUM('Fake','Real','Unverified') NOT NULL,
+    Checks INT NOT NULL DEFAULT 0,
+    ScoreSum DECIMAL(14,4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (BucketStart, SourceID, FinalVerdict),
+    INDEX idx_check_hourly_source (SourceID, BucketStart)
+);
+
+CREATE TABLE IF NOT EXISTS check_rollup_daily (
+    BucketDate DATE NOT NULL,
+    SourceID INT NOT NULL,
+    FinalVerdict ENUM('Fake','Real','Unverified') NOT NULL,
+    Checks INT NOT NULL DEFAULT 0,
+    ScoreSum DECIMAL(14,4) NOT NULL DEFAULT 0,
+    PRIMARY KEY (BucketDate, SourceID, FinalVerdict),
+    INDEX idx_check_daily_source (SourceID, BucketDate)
+);
+
+-- LATEST CHECK PER ARTICLE (projection maintained by latest_check_after_insert /
+-- latest_check_after_delete; GET /api/articles joins it on the primary key)
+CREATE TABLE IF NOT EXISTS article_latest_check (
+    ArticleID INT PRIMARY KEY,
+    CheckID INT NOT NULL,
+    FinalVerdict ENUM('Fake','Real','Unverified') DEFAULT 'Unverified',
+    FactCheckScore DECIMAL(3,2) DEFAULT NULL,
+    CheckedBy INT DEFAULT NULL,
+    CheckDate TIMESTAMP NULL,
+    FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+        ON DELETE CASCADE ON UPDATE CASCADE
+);
+
+-- TABLE VERSIONS (bumped by the API once per write; drive ETag / 304 responses)
+CREATE TABLE IF NOT EXISTS table_versions (
+    TableName VARCHAR(64) PRIMARY KEY,
+    Version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+INSERT IGNORE INTO table_versions (TableName, Version) VALUES
+('useraccount', 0), ('source', 0), ('article', 0), ('report', 0), ('credibilitycheck', 0);
+
+-- EVENT LOG (SSE events, cache invalidations and schema refreshes shared by
+-- all API worker processes; see backend/broadcast.py)
+CREATE TABLE IF NOT EXISTS event_log (
+    EventID BIGINT UNSIGNED PRIMARY KEY,
+    Channel VARCHAR(16) NOT NULL,
+    Kind VARCHAR(64) NOT NULL,
+    Payload TEXT NOT NULL,
+    Origin CHAR(32) NOT NULL,
+    PublishedAt DOUBLE NOT NULL,
+    INDEX idx_event_log_published (PublishedAt)
 );
 
+-- Id counter: its row lock makes event_log ids commit in order
+CREATE TABLE IF NOT EXISTS event_log_seq (
+    ID TINYINT PRIMARY KEY,
+    LastID BIGINT UNSIGNED NOT NULL
+);
+
+INSERT IGNORE INTO event_log_seq (ID, LastID) VALUES (1, 0);
+
 -- SAMPLE DATA (only run if you want sample rows)
 -- USERS
 INSERT INTO useraccount (Name, Email, Role, PasswordHash) VALUES
@@ -152,7 +329,31 @@ USE fakenewsdb;
 
 -- SAFE DROPS (if already exist)
 DROP TRIGGER IF EXISTS update_source_trust_after_check;
+DROP TRIGGER IF EXISTS update_source_stats_after_check_delete;
 DROP TRIGGER IF EXISTS flag_article_after_report;
+DROP TRIGGER IF EXISTS report_count_after_delete;
+DROP TRIGGER IF EXISTS latest_check_after_insert;
+DROP TRIGGER IF EXISTS latest_check_after_delete;
+DROP TRIGGER IF EXISTS verdict_propagation_articles_pending;
+DROP TRIGGER IF EXISTS verdict_propagation_checks_pending;
+DROP TRIGGER IF EXISTS trend_rollups_reports_pending;
+DROP TRIGGER IF EXISTS trend_rollups_checks_pending;
+-- Per-row version triggers of earlier releases (serialized writers on table_versions)
+DROP TRIGGER IF EXISTS useraccount_version_after_insert;
+DROP TRIGGER IF EXISTS useraccount_version_after_update;
+DROP TRIGGER IF EXISTS useraccount_version_after_delete;
+DROP TRIGGER IF EXISTS source_version_after_insert;
+DROP TRIGGER IF EXISTS source_version_after_update;
+DROP TRIGGER IF EXISTS source_version_after_delete;
+DROP TRIGGER IF EXISTS article_version_after_insert;
+DROP TRIGGER IF EXISTS article_version_after_update;
+DROP TRIGGER IF EXISTS article_version_after_delete;
+DROP TRIGGER IF EXISTS report_version_after_insert;
+DROP TRIGGER IF EXISTS report_version_after_update;
+DROP TRIGGER IF EXISTS report_version_after_delete;
+DROP TRIGGER IF EXISTS credibilitycheck_version_after_insert;
+DROP TRIGGER IF EXISTS credibilitycheck_version_after_update;
+DROP TRIGGER IF EXISTS credibilitycheck_version_after_delete;
 DROP PROCEDURE IF EXISTS perform_credibility_check;
 DROP PROCEDURE IF EXISTS mark_report_reviewed;
 DROP FUNCTION IF EXISTS avg_credibility_for_source;
@@ -165,51 +366,212 @@ CREATE TRIGGER update_source_trust_after_check
 AFTER INSERT ON credibilitycheck
 FOR EACH ROW
 BEGIN
-    DECLARE avg_score DECIMAL(5,4);
-
-    SELECT AVG(COALESCE(c.FactCheckScore, 0))
-    INTO avg_score
-    FROM credibilitycheck c
-    JOIN article a ON c.ArticleID = a.ArticleID
-    WHERE a.SourceID = (
-        SELECT SourceID FROM article WHERE ArticleID = NEW.ArticleID
-    );
+    DECLARE src_id INT;
+    DECLARE new_sum DECIMAL(14,4);
+    DECLARE new_count INT;
+
+    -- Batch loads (POST /api/perform_check/batch) set @skip_source_trust_trigger
+    -- and apply one grouped update per source afterwards
+    IF @skip_source_trust_trigger IS NULL THEN
+        SELECT SourceID INTO src_id FROM article WHERE ArticleID = NEW.ArticleID;
+
+        -- Fold this check into the running aggregate (O(1), no rescan)
+        INSERT INTO source_credibility_stats (SourceID, ScoreSum, CheckCount)
+        VALUES (src_id, COALESCE(NEW.FactCheckScore, 0), 1)
+        ON DUPLICATE KEY UPDATE
+            ScoreSum = ScoreSum + COALESCE(NEW.FactCheckScore, 0),
+            CheckCount = CheckCount + 1;
+
+        SELECT ScoreSum, CheckCount INTO new_sum, new_count
+        FROM source_credibility_stats
+        WHERE SourceID = src_id;
 
-    IF avg_score IS NOT NULL THEN
         -- Scale to 0-100 and round to 2 decimals
         UPDATE source
-        SET TrustRating = ROUND(avg_score * 100, 2)
-        WHERE SourceID = (
-            SELECT SourceID FROM article WHERE ArticleID = NEW.ArticleID
-        );
+        SET TrustRating = ROUND(new_sum / new_count * 100, 2)
+        WHERE SourceID = src_id;
     END IF;
 END$$
 DELIMITER ;
 
+DELIMITER $$
+CREATE TRIGGER update_source_stats_after_check_delete
+AFTER DELETE ON credibilitycheck
+FOR EACH ROW
+BEGIN
+    DECLARE src_id INT;
+    DECLARE new_sum DECIMAL(14,4);
+    DECLARE new_count INT;
+
+    SELECT SourceID INTO src_id FROM article WHERE ArticleID = OLD.ArticleID;
+
+    UPDATE source_credibility_stats
+    SET ScoreSum = ScoreSum - COALESCE(OLD.FactCheckScore, 0),
+        CheckCount = CheckCount - 1
+    WHERE SourceID = src_id AND CheckCount > 0;
+
+    SELECT ScoreSum, CheckCount INTO new_sum, new_count
+    FROM source_credibility_stats
+    WHERE SourceID = src_id;
+
+    IF new_count > 0 THEN
+        UPDATE source
+        SET TrustRating = ROUND(new_sum / new_count * 100, 2)
+        WHERE SourceID = src_id;
+    END IF;
+END$$
+DELIMITER ;
+
+-- Backfill the aggregate for checks inserted before the triggers existed
+-- (backend/migrate_source_credibility_stats.py does the same plus a consistency check)
+INSERT INTO source_credibility_stats (SourceID, ScoreSum, CheckCount)
+SELECT * FROM (
+    SELECT a.SourceID, SUM(COALESCE(c.FactCheckScore, 0)) AS ScoreSum, COUNT(*) AS CheckCount
+    FROM credibilitycheck c
+    JOIN article a ON c.ArticleID = a.ArticleID
+    GROUP BY a.SourceID
+) live
+ON DUPLICATE KEY UPDATE ScoreSum = live.ScoreSum, CheckCount = live.CheckCount;
+
 -- Add ReviewStatus column to article if not present
 -- Note: MySQL doesn't support IF NOT EXISTS for ALTER TABLE ADD COLUMN
 -- Run this manually if the column doesn't exist:
 -- ALTER TABLE article ADD COLUMN ReviewStatus ENUM('Normal','Under Review') DEFAULT 'Normal';
+-- CREATE INDEX idx_article_review ON article (ReviewStatus, ReportCount);
 
 DELIMITER $$
 CREATE TRIGGER flag_article_after_report
 AFTER INSERT ON report
 FOR EACH ROW
 BEGIN
-    DECLARE report_count INT;
+    -- Keep the denormalized count current; MySQL evaluates SET assignments
+    -- left to right, so ReviewStatus sees the incremented ReportCount
+    UPDATE article
+    SET ReportCount = ReportCount + 1,
+        ReviewStatus = IF(ReportCount >= 3, 'Under Review', ReviewStatus)
+    WHERE ArticleID = NEW.ArticleID;
+END$$
+DELIMITER ;
 
-    SELECT COUNT(*) INTO report_count
+DELIMITER $$
+CREATE TRIGGER report_count_after_delete
+AFTER DELETE ON report
+FOR EACH ROW
+BEGIN
+    UPDATE article
+    SET ReportCount = ReportCount - 1
+    WHERE ArticleID = OLD.ArticleID AND ReportCount > 0;
+END$$
+DELIMITER ;
+
+-- Backfill ReportCount for reports inserted before the trigger existed
+UPDATE article a
+LEFT JOIN (
+    SELECT ArticleID, COUNT(*) AS cnt
     FROM report
-    WHERE ArticleID = NEW.ArticleID;
+    GROUP BY ArticleID
+) r ON r.ArticleID = a.ArticleID
+SET a.ReportCount = COALESCE(r.cnt, 0);
+
+DELIMITER $$
+CREATE TRIGGER latest_check_after_insert
+AFTER INSERT ON credibilitycheck
+FOR EACH ROW
+BEGIN
+    -- The newer (CheckDate, CheckID) wins. SET assignments run left to
+    -- right, so CheckID and CheckDate go last and every condition
+    -- still compares against the stored row
+    INSERT INTO article_latest_check
+        (ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate)
+    VALUES
+        (NEW.ArticleID, NEW.CheckID, NEW.FinalVerdict, NEW.FactCheckScore, NEW.CheckedBy, NEW.CheckDate)
+    ON DUPLICATE KEY UPDATE
+        FinalVerdict = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.FinalVerdict, FinalVerdict),
+        FactCheckScore = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.FactCheckScore, FactCheckScore),
+        CheckedBy = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.CheckedBy, CheckedBy),
+        CheckID = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.CheckID, CheckID),
+        CheckDate = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.CheckDate, CheckDate);
+END$$
+DELIMITER ;
 
-    IF report_count >= 3 THEN
-        UPDATE article
-        SET ReviewStatus = 'Under Review'
-        WHERE ArticleID = NEW.ArticleID;
+DELIMITER $$
+CREATE TRIGGER latest_check_after_delete
+AFTER DELETE ON credibilitycheck
+FOR EACH ROW
+BEGIN
+    -- Only deleting the latest check changes the projection; fall back to
+    -- the next one (idx_check_article_date makes this a single seek)
+    IF EXISTS (SELECT 1 FROM article_latest_check
+               WHERE ArticleID = OLD.ArticleID AND CheckID = OLD.CheckID) THEN
+        DELETE FROM article_latest_check WHERE ArticleID = OLD.ArticleID;
+        INSERT INTO article_latest_check
+            (ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate)
+        SELECT ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate
+        FROM credibilitycheck
+        WHERE ArticleID = OLD.ArticleID
+        ORDER BY CheckDate DESC, CheckID DESC
+        LIMIT 1;
     END IF;
 END$$
 DELIMITER ;
 
+-- Backfill article_latest_check for checks inserted before the triggers existed
+-- (backend/migrate_add_latest_check.py does the same for existing databases)
+INSERT INTO article_latest_check
+    (ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate)
+SELECT c.ArticleID, c.CheckID, c.FinalVerdict, c.FactCheckScore, c.CheckedBy, c.CheckDate
+FROM credibilitycheck c
+WHERE c.CheckID = (
+    SELECT c2.CheckID FROM credibilitycheck c2
+    WHERE c2.ArticleID = c.ArticleID
+    ORDER BY c2.CheckDate DESC, c2.CheckID DESC
+    LIMIT 1
+)
+ON DUPLICATE KEY UPDATE
+    FinalVerdict = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+             VALUES(FinalVerdict), article_latest_check.FinalVerdict),
+    FactCheckScore = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+             VALUES(FactCheckScore), article_latest_check.FactCheckScore),
+    CheckedBy = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+             VALUES(CheckedBy), article_latest_check.CheckedBy),
+    CheckID = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+             VALUES(CheckID), article_latest_check.CheckID),
+    CheckDate = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+             VALUES(CheckDate), article_latest_check.CheckDate);
+
+-- Verdict propagation queue: each new row is pending from the moment it
+-- commits (backend/verdict_propagation.py)
+CREATE TRIGGER verdict_propagation_articles_pending
+AFTER INSERT ON article_minhash
+FOR EACH ROW
+    INSERT IGNORE INTO job_pending (JobName, RowID) VALUES ('verdict_propagation.articles', NEW.ArticleID);
+
+CREATE TRIGGER verdict_propagation_checks_pending
+AFTER INSERT ON credibilitycheck
+FOR EACH ROW
+    INSERT IGNORE INTO job_pending (JobName, RowID) VALUES ('verdict_propagation.checks', NEW.CheckID);
+
+-- Trend rollup queue (backend/trend_rollups.py)
+CREATE TRIGGER trend_rollups_reports_pending
+AFTER INSERT ON report
+FOR EACH ROW
+    INSERT IGNORE INTO job_pending (JobName, RowID) VALUES ('trend_rollups.reports', NEW.ReportID);
+
+CREATE TRIGGER trend_rollups_checks_pending
+AFTER INSERT ON credibilitycheck
+FOR EACH ROW
+    INSERT IGNORE INTO job_pending (JobName, RowID) VALUES ('trend_rollups.checks', NEW.CheckID);
+
+-- Queue rows inserted before the triggers existed
+INSERT IGNORE INTO job_pending (JobName, RowID)
+SELECT 'verdict_propagation.articles', ArticleID FROM article_minhash;
+INSERT IGNORE INTO job_pending (JobName, RowID)
+SELECT 'verdict_propagation.checks', CheckID FROM credibilitycheck;
+INSERT IGNORE INTO job_pending (JobName, RowID)
+SELECT 'trend_rollups.reports', ReportID FROM report;
+INSERT IGNORE INTO job_pending (JobName, RowID)
+SELECT 'trend_rollups.checks', CheckID FROM credibilitycheck;
+
 -- 2) PROCEDURES
 
 DELIMITER $$
@@ -242,27 +604,27 @@ DELIMITER ;
 DELIMITER $$
 CREATE FUNCTION avg_credibility_for_source(src_id INT)
 RETURNS DECIMAL(5,2)
-DETERMINISTIC
+READS SQL DATA
 BEGIN
-    DECLARE avg_score DECIMAL(5,4);
+    DECLARE avg_score DECIMAL(5,2);
 
-    SELECT AVG(COALESCE(FactCheckScore, 0))
+    -- Read the running aggregate instead of re-averaging every check
+    SELECT ROUND(ScoreSum / CheckCount * 100, 2)
     INTO avg_score
-    FROM credibilitycheck c
-    JOIN article a ON c.ArticleID = a.ArticleID
-    WHERE a.SourceID = src_id;
+    FROM source_credibility_stats
+    WHERE SourceID = src_id AND CheckCount > 0;
 
-    RETURN IFNULL(ROUND(avg_score * 100, 2), 0.00);
+    RETURN IFNULL(avg_score, 0.00);
 END$$
 DELIMITER ;
 
 DELIMITER $$
 CREATE FUNCTION report_count_for_article(art_id INT)
 RETURNS INT
-DETERMINISTIC
+READS SQL DATA
 BEGIN
     DECLARE rep_count INT;
-    SELECT COUNT(*) INTO rep_count FROM report WHERE ArticleID = art_id;
+    SELECT ReportCount INTO rep_count FROM article WHERE ArticleID = art_id;
     RETURN IFNULL(rep_count, 0);
 END$$
 DELIMITER ;
@@ -1,36 +1,227 @@
 # backend/app.py
-from flask import Flask, request, jsonify, redirect
+from flask import Flask, Response, g, request, jsonify, redirect
 from flask_cors import CORS
-from db_config import get_connection
+from db_config import add_query_observer, db_connection, pool_stats
+from schema_registry import schema
+from streaming import STREAM_FORMATS, stream_query
+from bulk_ingest import BULK_MAX_ROWS, BulkPayloadError, ingest_articles, ingest_checks, parse_payload
+from response_cache import cached, response_cache
+from table_versions import bump_versions, conditional
+from events import event_bus, parse_last_event_id
+from broadcast import broadcaster
+from search import FULLTEXT_INDEX, SearchQueryError, highlight, parse_query, snippet
+from near_duplicates import index_and_match
+from verdict_propagation import run_once as propagate_verdicts
+from trend_rollups import (
+    TrendQueryError,
+    parse_trend_range,
+    report_trend,
+    run_once as rollup_trends,
+    source_trust_trend,
+    verdict_trend,
+)
+from metrics import METRICS_ENABLED, metrics
+from migrate_source_credibility_stats import backfill as backfill_source_stats, install as install_source_stats
+from slow_query import PROFILING_ENABLED, profiler
+from pagination import PaginationError, decode_cursor, encode_cursor, parse_fields, parse_limit
+import os
 import traceback
-from werkzeug.security import generate_password_hash, check_password_hash
+import signal
+import time
+from auth import AUTH_RETRY_AFTER, AuthBusy, hasher
+from sessions import SESSION_TTL, USER_SESSION_SQL, bearer_token, session_store
 import secrets
+from datetime import timedelta
 
 app = Flask(__name__)
 CORS(app)
 
+# useraccount.Role values
+USER_ROLES = ("user", "fact-checker", "admin")
+
 
 # -----------------------
 # Helper Functions
 # -----------------------
 def recreate_trigger_without_ai_score(cursor, conn):
-    """Recreate the update_source_trust_after_check trigger without AI_Score"""
-    cursor.execute("DROP TRIGGER IF EXISTS update_source_trust_after_check")
-    conn.commit()
+    """
+    Recreate the source trust triggers without AI_Score and rebuild
+    source_credibility_stats, so checks that skipped the old trigger are counted
+    """
+    install_source_stats(cursor, conn)
+    backfill_source_stats(cursor, conn)
+
+
+def auth_busy_response(e):
+    response = jsonify({"error": str(e)})
+    response.headers["Retry-After"] = str(AUTH_RETRY_AFTER)
+    return response, 503
+
+
+def checker_denied(checked_by=None):
+    """
+    Error response unless the request's session belongs to a fact-checker or
+    admin, else None. Checks are recorded as g.user_id; a checked_by sent in
+    the body must name that same user.
+    """
+    if g.get("user_id") is None:
+        return jsonify({"error": "Sign in as a fact-checker or admin to perform credibility checks"}), 401
+    if checked_by is not None and checked_by != g.user_id:
+        return jsonify({"error": "checked_by must be the signed-in user"}), 403
+    if g.role not in ("fact-checker", "admin"):
+        return jsonify({
+            "error": "Unauthorized: Only fact-checkers and admins can perform credibility checks",
+            "user_role": g.role
+        }), 403
+    return None
+
+
+def role_grant_denied(role):
+    """
+    Error response unless the request may create an account with `role`,
+    else None. Anyone may create a 'user'; other roles need an admin session.
+    """
+    if role not in USER_ROLES:
+        return jsonify({"error": f"role must be one of {', '.join(USER_ROLES)}"}), 400
+    if role != "user" and g.get("role") != "admin":
+        return jsonify({"error": "Only admins can create fact-checker or admin accounts"}), 403
+    return None
+
 
+def issue_token(user_id, role):
+    """Session token for a freshly authenticated user"""
+    if schema.has_table("user_session"):
+        return session_store.issue(user_id, role)
+    # Session table missing (no CREATE privilege) - unvalidated token as before
+    return secrets.token_urlsafe(32)
 
-def ensure_password_column(cursor, conn):
-    """Ensure useraccount has PasswordHash column."""
+
+def source_trust_for_article(cursor, article_id):
+    """(SourceID, TrustRating) of the article's source; cursor must be a tuple cursor"""
+    cursor.execute("""
+        SELECT s.SourceID, s.TrustRating
+        FROM article a
+        JOIN source s ON a.SourceID = s.SourceID
+        WHERE a.ArticleID = %s
+    """, (article_id,))
+    row = cursor.fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def publish_verdict(article_id, verdict, score, checked_by, trust_before, trust_after):
+    """Publish a verdict event, plus a TrustRating event if the trigger moved it"""
+    event_bus.publish("verdict.created", {
+        "article_id": article_id,
+        "final_verdict": verdict,
+        "factcheck_score": score,
+        "checked_by": checked_by,
+    })
+    source_id, new_rating = trust_after
+    if source_id is not None and new_rating != trust_before[1]:
+        event_bus.publish("source.trust_changed", {
+            "source_id": source_id,
+            "old_trust_rating": None if trust_before[1] is None else float(trust_before[1]),
+            "trust_rating": None if new_rating is None else float(new_rating),
+        })
+
+
+def init_schema():
+    """
+    Probe the schema once and apply one-time repairs that used to run inside
+    request handlers (missing ReviewStatus / PasswordHash columns, leftover
+    AI_Score column, trigger still referencing AI_Score, missing session
+    table). Routes read the
+    cached capabilities.
+    """
+    schema.refresh()
+    changed = False
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        if not schema.has_column("article", "ReviewStatus"):
+            try:
+                cursor.execute("""
+                    ALTER TABLE article 
+                    ADD COLUMN ReviewStatus ENUM('Normal','Under Review') DEFAULT 'Normal'
+                """)
+                conn.commit()
+                changed = True
+                print("ReviewStatus column added to article table")
+            except Exception as alter_error:
+                # Permission issue - routes fall back to the query without ReviewStatus
+                print(f"Could not add ReviewStatus column: {alter_error}")
+
+        if not schema.has_column("useraccount", "PasswordHash"):
+            try:
+                cursor.execute("ALTER TABLE useraccount ADD COLUMN PasswordHash VARCHAR(255) NULL")
+                conn.commit()
+                changed = True
+                print("PasswordHash column added to useraccount table")
+            except Exception as alter_error:
+                print(f"Could not add PasswordHash column: {alter_error}")
+
+        if not schema.has_table("user_session"):
+            try:
+                cursor.execute(USER_SESSION_SQL)
+                conn.commit()
+                changed = True
+                print("user_session table created")
+            except Exception as create_error:
+                print(f"Could not create user_session table: {create_error}")
+
+        if schema.has_column("credibilitycheck", "AI_Score"):
+            try:
+                print("Removing AI_Score column from credibilitycheck table...")
+                cursor.execute("ALTER TABLE credibilitycheck DROP COLUMN AI_Score")
+                conn.commit()
+                changed = True
+                print("AI_Score column removed successfully")
+            except Exception as col_error:
+                print(f"Could not remove AI_Score column: {col_error}")
+
+        if schema.trigger_references("update_source_trust_after_check", "AI_Score"):
+            try:
+                print("Trigger still references AI_Score, recreating...")
+                recreate_trigger_without_ai_score(cursor, conn)
+                changed = True
+            except Exception as trigger_error:
+                print(f"Warning: Could not check/fix trigger: {trigger_error}")
+
+        cursor.close()
+
+    if changed:
+        schema.refresh()
+
+
+def _refresh_schema_on_signal(signum, frame):
     try:
-        cursor.execute("SHOW COLUMNS FROM useraccount LIKE 'PasswordHash'")
-        if cursor.fetchone() is None:
-            cursor.execute("ALTER TABLE useraccount ADD COLUMN PasswordHash VARCHAR(255) NULL")
-            conn.commit()
+        schema.refresh()
+        print("Schema capabilities refreshed")
     except Exception:
-        # ignore if cannot alter
+        traceback.print_exc()
+
+
+def install_schema_refresh_signal():
+    """
+    Refresh the schema snapshot on SIGHUP. Called by the serving process
+    itself (app.run, asgi.py, each gunicorn worker) - never at import, which
+    under gunicorn's preload would take over the master's reload signal.
+    """
+    if not hasattr(signal, "SIGHUP"):
+        return
+    try:
+        signal.signal(signal.SIGHUP, _refresh_schema_on_signal)
+    except ValueError:
+        # Not the main thread
         pass
 
 
+def _apply_schema_refresh(event_id, kind, data, published_at, own):
+    """broadcast subscriber: another worker's schema refresh"""
+    if not own:
+        _refresh_schema_on_signal(None, None)
+
+
 # -----------------------
 # AUTH ROUTES
 # -----------------------
@@ -40,50 +231,55 @@ def auth_signup():
     name = (data.get("name") or "").strip()
     email = (data.get("email") or "").strip().lower()
     password = data.get("password") or ""
-    role = (data.get("role") or "user").strip()
+    # Self-service accounts are always plain users; an admin grants other
+    # roles through POST /api/users
+    role = "user"
 
     if not name or not email or not password:
         return jsonify({"error": "Missing name, email, or password"}), 400
 
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Ensure PasswordHash column exists
-        ensure_password_column(cursor, conn)
+        with db_connection() as conn:
+            cursor = conn.cursor()
 
-        # Prevent duplicate emails
-        cursor.execute("SELECT UserID FROM useraccount WHERE Email = %s", (email,))
-        if cursor.fetchone():
+            # Prevent duplicate emails
+            cursor.execute("SELECT UserID FROM useraccount WHERE Email = %s", (email,))
+            duplicate = cursor.fetchone() is not None
+            cursor.close()
+        if duplicate:
             return jsonify({"error": "Email already registered"}), 409
 
-        pwd_hash = generate_password_hash(password)
-        cursor.execute(
-            "INSERT INTO useraccount (Name, Email, Role, PasswordHash) VALUES (%s, %s, %s, %s)",
-            (name, email, role, pwd_hash)
-        )
-        conn.commit()
+        # Hashed in the auth process pool, not on this request thread, and
+        # with no pooled connection checked out while it waits
+        pwd_hash = hasher.hash(password)
 
-        # Fetch inserted user (id)
-        cursor.execute("SELECT LAST_INSERT_ID()")
-        user_id_row = cursor.fetchone()
-        user_id = int(user_id_row[0]) if user_id_row else None
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO useraccount (Name, Email, Role, PasswordHash) VALUES (%s, %s, %s, %s)",
+                (name, email, role, pwd_hash)
+            )
+            conn.commit()
 
-        token = secrets.token_urlsafe(32)
+            # Fetch inserted user (id)
+            cursor.execute("SELECT LAST_INSERT_ID()")
+            user_id_row = cursor.fetchone()
+            user_id = int(user_id_row[0]) if user_id_row else None
+            cursor.close()
+            bump_versions(conn, "useraccount")
+        response_cache.invalidate("users")
+
+        token = issue_token(user_id, role)
         return jsonify({
             "token": token,
+            "expires_in": SESSION_TTL,
             "user": {"UserID": user_id, "Name": name, "Email": email, "Role": role}
         }), 201
+    except AuthBusy as e:
+        return auth_busy_response(e)
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
 @app.route("/api/auth/login", methods=["POST"])
@@ -94,58 +290,123 @@ def auth_login():
     if not email or not password:
         return jsonify({"error": "Missing email or password"}), 400
 
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Ensure PasswordHash column exists
-        ensure_password_column(cursor, conn)
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("SELECT UserID, Name, Email, Role, PasswordHash FROM useraccount WHERE Email = %s", (email,))
+            user = cursor.fetchone()
+            cursor.close()
 
-        cursor.execute("SELECT UserID, Name, Email, Role, PasswordHash FROM useraccount WHERE Email = %s", (email,))
-        user = cursor.fetchone()
         if not user or not user.get("PasswordHash"):
             return jsonify({"error": "Invalid credentials"}), 401
-        if not check_password_hash(user["PasswordHash"], password):
+        # The connection is back in the pool while the hash is checked
+        ok, new_hash = hasher.verify(user["PasswordHash"], password)
+        if not ok:
             return jsonify({"error": "Invalid credentials"}), 401
+        if new_hash:
+            # Hash predates the current AUTH_HASH_METHOD - upgrade it, unless
+            # the password was changed concurrently
+            with db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "UPDATE useraccount SET PasswordHash = %s WHERE UserID = %s AND PasswordHash = %s",
+                    (new_hash, user["UserID"], user["PasswordHash"]),
+                )
+                conn.commit()
+                cursor.close()
 
-        token = secrets.token_urlsafe(32)
+        token = issue_token(user["UserID"], user["Role"])
         return jsonify({
             "token": token,
+            "expires_in": SESSION_TTL,
             "user": {"UserID": user["UserID"], "Name": user["Name"], "Email": user["Email"], "Role": user["Role"]}
         }), 200
+    except AuthBusy as e:
+        return auth_busy_response(e)
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-    cursor.execute("""
-        CREATE TRIGGER update_source_trust_after_check
-        AFTER INSERT ON credibilitycheck
-        FOR EACH ROW
-        BEGIN
-            DECLARE avg_score DECIMAL(5,4);
-            SELECT AVG(COALESCE(c.FactCheckScore, 0))
-            INTO avg_score
-            FROM credibilitycheck c
-            JOIN article a ON c.ArticleID = a.ArticleID
-            WHERE a.SourceID = (
-                SELECT SourceID FROM article WHERE ArticleID = NEW.ArticleID
-            );
-            IF avg_score IS NOT NULL THEN
-                UPDATE source
-                SET TrustRating = ROUND(avg_score * 100, 2)
-                WHERE SourceID = (
-                    SELECT SourceID FROM article WHERE ArticleID = NEW.ArticleID
-                );
-            END IF;
-        END
-    """)
-    conn.commit()
+
+
+@app.route("/api/auth/logout", methods=["POST"])
+def auth_logout():
+    """Revoke the bearer token of the current session"""
+    token = bearer_token(request)
+    if not token:
+        return jsonify({"error": "Missing bearer token"}), 400
+    try:
+        if schema.has_table("user_session"):
+            session_store.revoke(token)
+        return jsonify({"message": "Logged out"}), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/auth/me", methods=["GET"])
+def auth_me():
+    """Identity attached by the session middleware"""
+    if g.get("user_id") is None:
+        return jsonify({"error": "Not authenticated"}), 401
+    return jsonify({"UserID": g.user_id, "Role": g.role}), 200
+
+
+@app.before_request
+def start_request_timer():
+    g._started = time.perf_counter()
+    # No-op once this process's poller runs (started per worker after fork)
+    broadcaster.start()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Per-route latency / status, plus the SQL time spent inside the request"""
+    if METRICS_ENABLED and "_started" in g:
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        metrics.observe_request(
+            route, request.method, response.status_code,
+            time.perf_counter() - g._started,
+            g.get("_sql_seconds", 0.0), g.get("_sql_count", 0),
+        )
+    return response
+
+
+@app.before_request
+def attach_session():
+    """
+    Validate 'Authorization: Bearer <token>' and attach g.user_id / g.role.
+    Requests without a valid token continue unauthenticated.
+    """
+    g.user_id = None
+    g.role = None
+    token = bearer_token(request)
+    if not token:
+        return
+    try:
+        if schema.has_table("user_session"):
+            session = session_store.validate(token)
+            if session:
+                g.user_id = session["user_id"]
+                g.role = session["role"]
+    except Exception:
+        traceback.print_exc()
+
+
+# -----------------------
+# Startup
+# -----------------------
+try:
+    init_schema()
+except Exception as e:
+    # DB not reachable yet - the registry retries lazily on first use
+    print(f"Schema probe deferred: {e}")
+
+if METRICS_ENABLED:
+    add_query_observer(metrics.observe_query)
+if PROFILING_ENABLED:
+    add_query_observer(profiler.observe)
+
+broadcaster.subscribe("schema", _apply_schema_refresh)
 
 
 # -----------------------
@@ -156,18 +417,163 @@ def ping():
     return "pong", 200
 
 
+@app.route("/api/health/pool", methods=["GET"])
+def get_pool_stats():
+    """Connection pool size, checkout hit rate and wait times"""
+    return jsonify(pool_stats()), 200
+
+
+@app.route("/api/health/broadcast", methods=["GET"])
+def get_broadcast_stats():
+    """This worker's event_log poller (events and cache invalidation across workers)"""
+    return jsonify({**broadcaster.stats(), "pid": os.getpid()}), 200
+
+
+@app.route("/api/health/cache", methods=["GET"])
+def get_cache_stats():
+    """Analytics response cache hit/miss counters, overall and per endpoint"""
+    return jsonify(response_cache.stats()), 200
+
+
+@app.route("/api/health/auth", methods=["GET"])
+def auth_health():
+    """Password hashing pool and session cache counters"""
+    return jsonify({"hashing": hasher.stats(), "sessions": session_store.stats()}), 200
+
+
+@app.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Prometheus text format by default; ?format=json for a JSON dump with
+    per-route latency, SQL share per route and the slowest statements
+    """
+    try:
+        if request.args.get("format") == "json":
+            return jsonify({
+                **metrics.snapshot(),
+                "pool": pool_stats(),
+                "cache": response_cache.stats(),
+            }), 200
+        return Response(
+            metrics.prometheus(pool_stats(), response_cache.stats()),
+            mimetype="text/plain; version=0.0.4",
+        )
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/events", methods=["GET"])
+def stream_events():
+    """
+    Server-Sent Events feed of write activity.
+    Event types: report.created, report.reviewed, article.under_review,
+    verdict.created, source.trust_changed (and reset if history was lost).
+    Resume with the Last-Event-ID header (or ?last_event_id=);
+    filter with ?types=report.created,verdict.created
+    """
+    last_id = parse_last_event_id(request.headers.get("Last-Event-ID") or request.args.get("last_event_id"))
+    types = {t.strip() for t in request.args.get("types", "").split(",") if t.strip()} or None
+    return Response(
+        event_bus.stream(last_id, types),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/admin/schema", methods=["GET"])
+def get_schema_capabilities():
+    """Cached schema capabilities the routes are currently using"""
+    try:
+        return jsonify(schema.describe()), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/schema/refresh", methods=["POST"])
+def refresh_schema_capabilities():
+    """
+    Re-probe the schema after a migration, in every worker once event_log
+    exists (same as sending SIGHUP to each)
+    """
+    try:
+        capabilities = schema.refresh()
+        if broadcaster.available():
+            broadcaster.publish("schema", [("refresh", {})])
+        return jsonify(capabilities), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/propagate_verdicts", methods=["POST"])
+def run_verdict_propagation():
+    """Run one verdict propagation batch now (normally propagate_verdicts.py does this)"""
+    try:
+        if not schema.has_table("suggested_verdict"):
+            return jsonify({"error": "Run migrate_add_verdict_propagation.py first"}), 503
+        return jsonify(propagate_verdicts()), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/rollup_trends", methods=["POST"])
+def run_trend_rollup():
+    """Fold one batch into the trend rollups now (normally rollup_trends.py does this)"""
+    try:
+        if not schema.has_table("check_rollup_daily"):
+            return jsonify({"error": "Run migrate_add_trend_rollups.py first"}), 503
+        stats = rollup_trends()
+        response_cache.invalidate("trends")
+        return jsonify(stats), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/slow_queries", methods=["GET"])
+def get_slow_queries():
+    """Slow statements with their EXPLAIN plans (needs SLOW_QUERY_PROFILING=1)"""
+    try:
+        return jsonify(profiler.describe()), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/admin/slow_queries", methods=["DELETE"])
+def clear_slow_queries():
+    """Empty the ring buffer, e.g. after adding an index"""
+    try:
+        profiler.clear()
+        return jsonify({"message": "Slow query log cleared"}), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route("/", methods=["GET"])
 def index():
     html = """
     <h2>Fake News Detection API</h2>
     <ul>
       <li><a href="/ping">/ping</a></li>
+      <li><a href="/api/health/pool">/api/health/pool</a></li>
+      <li><a href="/metrics">/metrics</a> (<a href="/metrics?format=json">JSON</a>)</li>
+      <li><a href="/api/admin/slow_queries">/api/admin/slow_queries</a></li>
+      <li><a href="/api/analytics/trends/reports">/api/analytics/trends/reports</a></li>
       <li><a href="/api/reports">/api/reports</a></li>
       <li><a href="/api/credibility">/api/credibility</a></li>
+      <li><a href="/api/articles/search?q=vaccine">/api/articles/search?q=</a></li>
+      <li><a href="/api/credibility/queue">/api/credibility/queue</a></li>
+      <li><a href="/api/events">/api/events</a> (Server-Sent Events)</li>
       <li>POST endpoints (use Postman/curl/Frontend)</li>
       <li>POST /api/users</li>
       <li>POST /api/sources</li>
       <li>POST /api/articles</li>
+      <li>POST /api/articles/bulk</li>
       <li>POST /api/reports</li>
       <li>POST /api/credibility</li>
     </ul>
@@ -188,11 +594,12 @@ def api_perform_credibility_check():
       "article_id": int,
       "factcheck_score": float (0..1),
       "final_verdict": "Real"|"Fake"|"Unverified",
-      "checked_by": int (UserID)
+      "checked_by": int (optional; must be the signed-in user)
     }
+    The check is recorded as the user of the bearer token's session.
     """
     data = request.json or {}
-    required = ("article_id", "factcheck_score", "final_verdict", "checked_by")
+    required = ("article_id", "factcheck_score", "final_verdict")
     if not all(k in data for k in required):
         return jsonify({"error": "Missing required fields"}), 400
 
@@ -201,7 +608,7 @@ def api_perform_credibility_check():
         article_id = int(data["article_id"])
         fact_score = float(data["factcheck_score"])
         final_verdict = str(data["final_verdict"])
-        checked_by = int(data["checked_by"])
+        checked_by = int(data["checked_by"]) if data.get("checked_by") not in (None, "") else None
 
         if not (0.0 <= fact_score <= 1.0):
             return jsonify({"error": "Fact-check score must be between 0 and 1"}), 400
@@ -210,108 +617,125 @@ def api_perform_credibility_check():
     except (ValueError, TypeError):
         return jsonify({"error": "Invalid numeric values"}), 400
 
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check if user is a fact-checker or admin
-        cursor.execute("SELECT Role FROM useraccount WHERE UserID = %s", (checked_by,))
-        user = cursor.fetchone()
-        
-        if not user:
-            return jsonify({"error": "User not found"}), 404
-        
-        if user["Role"] not in ("fact-checker", "admin"):
-            return jsonify({
-                "error": "Unauthorized: Only fact-checkers and admins can perform credibility checks",
-                "user_role": user["Role"]
-            }), 403
-        
+    try:
+        # Check if the signed-in user is a fact-checker or admin
+        denied = checker_denied(checked_by)
+        if denied:
+            return denied
+        checked_by = g.user_id
+
         # User is authorized, proceed with credibility check
-        
-        # First, check if AI_Score column exists and remove it
-        try:
-            cursor.execute("SHOW COLUMNS FROM credibilitycheck LIKE 'AI_Score'")
-            if cursor.fetchone():
-                print("Removing AI_Score column from credibilitycheck table...")
-                cursor.execute("ALTER TABLE credibilitycheck DROP COLUMN AI_Score")
-                conn.commit()
-                print("AI_Score column removed successfully")
-        except Exception as col_error:
-            # Column might not exist or already removed
-            pass
-        
-        # Reset cursor for procedure call (non-dictionary cursor for callproc)
-        cursor = conn.cursor()
-        
-        # Check and fix trigger if it references AI_Score
-        try:
-            # Check if trigger exists and has AI_Score reference
-            cursor.execute("SHOW TRIGGERS LIKE 'update_source_trust_after_check'")
-            trigger_exists = cursor.fetchone()
-            
-            if trigger_exists:
-                # Check trigger definition for AI_Score
-                cursor.execute("SHOW CREATE TRIGGER update_source_trust_after_check")
-                trigger_def = cursor.fetchone()
-                if trigger_def and len(trigger_def) > 2 and 'AI_Score' in trigger_def[2]:  # Column 2 contains the SQL
-                    print("Trigger still references AI_Score, recreating...")
-                    recreate_trigger_without_ai_score(cursor, conn)
-        except Exception as trigger_error:
-            # If we can't check/fix trigger, continue - will fail on INSERT if trigger is broken
-            print(f"Warning: Could not check/fix trigger: {trigger_error}")
-        
-        # Try calling the procedure - if it fails due to wrong signature, use direct INSERT
-        try:
-            cursor.callproc("perform_credibility_check", (article_id, fact_score, final_verdict, checked_by))
-        except Exception as proc_call_error:
-            error_msg = str(proc_call_error)
-            # If error is about incorrect number of arguments, use direct INSERT instead
-            # This handles the case where the database still has the old procedure with 5 params
-            if "Incorrect number of arguments" in error_msg or "42000" in error_msg:
-                # Use direct INSERT - this achieves the same result and triggers will still fire
-                # But first check if trigger needs fixing
-                try:
-                    cursor.execute("SHOW CREATE TRIGGER update_source_trust_after_check")
-                    trigger_def = cursor.fetchone()
-                    if trigger_def and len(trigger_def) > 2 and 'AI_Score' in trigger_def[2]:
-                        recreate_trigger_without_ai_score(cursor, conn)
-                except:
-                    pass  # Continue with INSERT even if trigger check fails
-                
-                cursor.execute(
-                    "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
-                    (article_id, fact_score, final_verdict, checked_by)
-                )
-            else:
-                # If error is about AI_Score in trigger, recreate trigger and retry
-                if "AI_Score" in error_msg:
-                    try:
-                        recreate_trigger_without_ai_score(cursor, conn)
-                        # Retry the INSERT after fixing trigger
-                        cursor.execute(
-                            "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
-                            (article_id, fact_score, final_verdict, checked_by)
-                        )
-                    except Exception as trigger_fix_error:
-                        traceback.print_exc()
-                        return jsonify({"error": f"Failed to fix trigger: {str(trigger_fix_error)}"}), 500
+        # (AI_Score column/trigger repairs run once at startup in init_schema)
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            trust_before = source_trust_for_article(cursor, article_id)
+
+            # Use the procedure only if the catalog says it has the 4-parameter
+            # signature; an old 5-parameter version falls back to direct INSERT
+            use_procedure = schema.routine_param_count("perform_credibility_check") == 4
+
+            try:
+                if not use_procedure:
+                    raise RuntimeError("Incorrect number of arguments for perform_credibility_check")
+                cursor.callproc("perform_credibility_check", (article_id, fact_score, final_verdict, checked_by))
+            except Exception as proc_call_error:
+                error_msg = str(proc_call_error)
+                # If error is about incorrect number of arguments, use direct INSERT instead
+                # This handles the case where the database still has the old procedure with 5 params
+                if "Incorrect number of arguments" in error_msg or "42000" in error_msg:
+                    # Use direct INSERT - this achieves the same result and triggers will still fire
+                    cursor.execute(
+                        "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
+                        (article_id, fact_score, final_verdict, checked_by)
+                    )
                 else:
-                    # Re-raise if it's a different error
-                    raise proc_call_error
-        
-        conn.commit()
+                    # If error is about AI_Score in trigger, recreate trigger and retry
+                    if "AI_Score" in error_msg:
+                        try:
+                            recreate_trigger_without_ai_score(cursor, conn)
+                            schema.refresh()
+                            # Retry the INSERT after fixing trigger
+                            cursor.execute(
+                                "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
+                                (article_id, fact_score, final_verdict, checked_by)
+                            )
+                        except Exception as trigger_fix_error:
+                            traceback.print_exc()
+                            cursor.close()
+                            return jsonify({"error": f"Failed to fix trigger: {str(trigger_fix_error)}"}), 500
+                    else:
+                        # Re-raise if it's a different error
+                        raise proc_call_error
+
+            conn.commit()
+            trust_after = source_trust_for_article(cursor, article_id)
+            cursor.close()
+            # update_source_trust_after_check also changes source.TrustRating
+            bump_versions(conn, "credibilitycheck", "source")
+        response_cache.invalidate("checks", "sources")
+        publish_verdict(article_id, final_verdict, fact_score, checked_by, trust_before, trust_after)
         return jsonify({"message": "Credibility check recorded"}), 201
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+
+
+@app.route("/api/perform_check/batch", methods=["POST"])
+def api_perform_credibility_check_batch():
+    """
+    Batch variant of /api/perform_check for fact-checking teams.
+    expects JSON:
+    {
+      "checked_by": int (optional; must be the signed-in user),
+      "checks": [{"article_id": int, "factcheck_score": float, "final_verdict": str}, ...]
+    }
+    All checks go in one transaction and source TrustRating is recomputed
+    once per affected source rather than once per check. They are recorded
+    as the user of the bearer token's session, authorized once for the batch.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        checked_by = int(data["checked_by"]) if data.get("checked_by") not in (None, "") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "checked_by must be a UserID"}), 400
+    checks = data.get("checks")
+    if not isinstance(checks, list) or not checks:
+        return jsonify({"error": "checks must be a non-empty array"}), 400
+    if len(checks) > BULK_MAX_ROWS:
+        return jsonify({"error": f"Too many checks ({len(checks)}); limit is {BULK_MAX_ROWS}"}), 400
+
+    try:
+        # Suppress the per-row trigger only if the installed one honours the flag
+        grouped_trust = (
+            schema.has_table("source_credibility_stats")
+            and schema.trigger_references("update_source_trust_after_check", "@skip_source_trust_trigger")
+        )
+        denied = checker_denied(checked_by)
+        if denied:
+            return denied
+        checked_by = g.user_id
+
+        with db_connection() as conn:
+            results, stats = ingest_checks(conn, checks, checked_by, grouped_trust=grouped_trust)
+        if stats["inserted"]:
+            response_cache.invalidate("checks", "sources")
+            # One event_log round trip for the whole batch
+            event_bus.publish_many([
+                ("verdict.created", {
+                    "article_id": result["article_id"],
+                    "final_verdict": checks[result["index"]]["final_verdict"],
+                    "factcheck_score": result["factcheck_score"],
+                    "checked_by": checked_by,
+                })
+                for result in results if result["status"] == "inserted"
+            ] + [
+                ("source.trust_changed", {"source_id": source_id, "trust_rating": rating})
+                for source_id, rating in stats["trust_ratings"].items()
+            ])
+        return jsonify({"results": results, "stats": stats}), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
 
 
 @app.route("/api/reports/<int:report_id>/review", methods=["POST"])
@@ -319,86 +743,121 @@ def api_mark_report_reviewed(report_id):
     """
     Calls stored procedure mark_report_reviewed(report_id)
     """
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.callproc("mark_report_reviewed", (report_id,))
-        conn.commit()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.callproc("mark_report_reviewed", (report_id,))
+            conn.commit()
+            cursor.close()
+            bump_versions(conn, "report")
+        response_cache.invalidate("reports")
+        event_bus.publish("report.reviewed", {"report_id": report_id})
         return jsonify({"message": f"Report {report_id} marked Reviewed"}), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
 @app.route("/api/sources/<int:source_id>/avg_credibility", methods=["GET"])
 def api_avg_credibility(source_id):
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT avg_credibility_for_source(%s)", (source_id,))
-        row = cursor.fetchone()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT avg_credibility_for_source(%s)", (source_id,))
+            row = cursor.fetchone()
+            cursor.close()
         score = float(row[0]) if row and row[0] is not None else 0.0
         return jsonify({"source_id": source_id, "avg_credibility": score}), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
 @app.route("/api/articles/<int:article_id>/report_count", methods=["GET"])
 def api_report_count(article_id):
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT report_count_for_article(%s)", (article_id,))
-        row = cursor.fetchone()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            if schema.has_column("article", "ReportCount"):
+                cursor.execute("SELECT ReportCount FROM article WHERE ArticleID = %s", (article_id,))
+            else:
+                cursor.execute("SELECT report_count_for_article(%s)", (article_id,))
+            row = cursor.fetchone()
+            cursor.close()
         count = int(row[0]) if row and row[0] is not None else 0
         return jsonify({"article_id": article_id, "report_count": count}), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
 
 
 # -----------------------
 # ANALYTICS & COMPLEX QUERIES
 # -----------------------
+# Dashboard queries, shared with the async handlers in asgi.py
+TOP_TRUSTED_SOURCES_SQL = """
+    SELECT SourceID, Name AS SourceName, Domain, TrustRating
+    FROM source
+    ORDER BY TrustRating DESC
+    LIMIT 5
+"""
+
+ACTIVE_REPORTERS_SQL = """
+    SELECT u.UserID, u.Name, u.Email, u.Role, COUNT(r.ReportID) AS TotalReports
+    FROM useraccount u
+    JOIN report r ON u.UserID = r.UserID
+    GROUP BY u.UserID, u.Name, u.Email, u.Role
+    HAVING COUNT(r.ReportID) > 2
+    ORDER BY TotalReports DESC
+"""
+
+
+def under_review_query():
+    """Query for the 'Under Review' articles, depending on installed columns"""
+    review_status_exists = schema.has_column("article", "ReviewStatus")
+    if review_status_exists and schema.has_column("article", "ReportCount"):
+        return """
+            SELECT a.ArticleID, a.Title, s.Name AS SourceName,
+                   a.ReportCount AS TotalReports, a.ReviewStatus
+            FROM article a
+            JOIN source s ON a.SourceID = s.SourceID
+            WHERE a.ReviewStatus = 'Under Review'
+            ORDER BY a.ReportCount DESC
+        """
+    if review_status_exists:
+        return """
+            SELECT a.ArticleID, a.Title, s.Name AS SourceName, 
+                   COUNT(r.ReportID) AS TotalReports, a.ReviewStatus
+            FROM article a
+            JOIN source s ON a.SourceID = s.SourceID
+            LEFT JOIN report r ON a.ArticleID = r.ArticleID
+            WHERE a.ReviewStatus = 'Under Review'
+            GROUP BY a.ArticleID, a.Title, s.Name, a.ReviewStatus
+            ORDER BY TotalReports DESC
+        """
+    # If column doesn't exist, return articles with 3+ reports
+    return """
+        SELECT a.ArticleID, a.Title, s.Name AS SourceName, 
+               COUNT(r.ReportID) AS TotalReports, 'Under Review' AS ReviewStatus
+        FROM article a
+        JOIN source s ON a.SourceID = s.SourceID
+        LEFT JOIN report r ON a.ArticleID = r.ArticleID
+        GROUP BY a.ArticleID, a.Title, s.Name
+        HAVING COUNT(r.ReportID) >= 3
+        ORDER BY TotalReports DESC
+    """
+
+
 @app.route("/api/analytics/top_trusted_sources", methods=["GET"])
+@cached(ttl=60, tags=("sources", "checks"))
 def get_top_trusted_sources():
     """Get top 5 most trusted sources"""
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT SourceID, Name AS SourceName, Domain, TrustRating
-            FROM source
-            ORDER BY TrustRating DESC
-            LIMIT 5
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(TOP_TRUSTED_SOURCES_SQL)
+            rows = cursor.fetchall()
+            cursor.close()
         return jsonify(rows), 200
     except Exception as e:
         traceback.print_exc()
@@ -406,50 +865,16 @@ def get_top_trusted_sources():
 
 
 @app.route("/api/analytics/under_review_articles", methods=["GET"])
+@cached(ttl=30, tags=("articles", "reports"))
 def get_under_review_articles():
     """Get articles marked 'Under Review' with their report count (trigger effect)"""
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check if ReviewStatus column exists
-        review_status_exists = False
-        try:
-            cursor.execute("SHOW COLUMNS FROM article LIKE 'ReviewStatus'")
-            review_status_exists = cursor.fetchone() is not None
-        except:
-            pass
-        
-        if review_status_exists:
-            query = """
-                SELECT a.ArticleID, a.Title, s.Name AS SourceName, 
-                       COUNT(r.ReportID) AS TotalReports, a.ReviewStatus
-                FROM article a
-                JOIN source s ON a.SourceID = s.SourceID
-                LEFT JOIN report r ON a.ArticleID = r.ArticleID
-                WHERE a.ReviewStatus = 'Under Review'
-                GROUP BY a.ArticleID, a.Title, s.Name, a.ReviewStatus
-                ORDER BY TotalReports DESC
-            """
-        else:
-            # If column doesn't exist, return empty or articles with 3+ reports
-            query = """
-                SELECT a.ArticleID, a.Title, s.Name AS SourceName, 
-                       COUNT(r.ReportID) AS TotalReports, 'Under Review' AS ReviewStatus
-                FROM article a
-                JOIN source s ON a.SourceID = s.SourceID
-                LEFT JOIN report r ON a.ArticleID = r.ArticleID
-                GROUP BY a.ArticleID, a.Title, s.Name
-                HAVING COUNT(r.ReportID) >= 3
-                ORDER BY TotalReports DESC
-            """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    try:
+        query = under_review_query()
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
         return jsonify(rows), 200
     except Exception as e:
         traceback.print_exc()
@@ -457,24 +882,15 @@ def get_under_review_articles():
 
 
 @app.route("/api/analytics/active_reporters", methods=["GET"])
+@cached(ttl=60, tags=("users", "reports"))
 def get_active_reporters():
     """Get users who submitted more than 2 reports"""
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT u.UserID, u.Name, u.Email, u.Role, COUNT(r.ReportID) AS TotalReports
-            FROM useraccount u
-            JOIN report r ON u.UserID = r.UserID
-            GROUP BY u.UserID, u.Name, u.Email, u.Role
-            HAVING COUNT(r.ReportID) > 2
-            ORDER BY TotalReports DESC
-        """)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(ACTIVE_REPORTERS_SQL)
+            rows = cursor.fetchall()
+            cursor.close()
         return jsonify(rows), 200
     except Exception as e:
         traceback.print_exc()
@@ -482,51 +898,133 @@ def get_active_reporters():
 
 
 @app.route("/api/analytics/articles_with_report_count", methods=["GET"])
+@cached(ttl=30, tags=("articles", "reports"))
 def get_articles_with_report_count():
-    """Get all articles with their report counts using the function"""
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check if ReviewStatus column exists
-        review_status_exists = False
-        try:
-            cursor.execute("SHOW COLUMNS FROM article LIKE 'ReviewStatus'")
-            review_status_exists = cursor.fetchone() is not None
-        except:
-            pass
-        
-        if review_status_exists:
-            query = """
-                SELECT a.ArticleID, a.Title, s.Name AS SourceName, 
-                       report_count_for_article(a.ArticleID) AS ReportCount,
-                       a.ReviewStatus
+    """
+    Get articles ranked by report count.
+    Reads the trigger-maintained article.ReportCount (indexed) when present,
+    otherwise falls back to the report_count_for_article function.
+    Query params (optional): limit (top-N page size), cursor (next_cursor).
+    Without limit/cursor the full list is returned as a plain array.
+    """
+    try:
+        paginated = "limit" in request.args or "cursor" in request.args
+        limit = parse_limit(request.args.get("limit")) if paginated else None
+        after = decode_cursor(request.args["cursor"], 2) if request.args.get("cursor") else None
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        review_status_exists = schema.has_column("article", "ReviewStatus")
+        review_status = "a.ReviewStatus" if review_status_exists else "'Normal'"
+
+        params = []
+        if schema.has_column("article", "ReportCount"):
+            # Index range scan on idx_article_report_count (ReportCount, ArticleID)
+            query = f"""
+                SELECT a.ArticleID, a.Title, s.Name AS SourceName,
+                       a.ReportCount AS ReportCount,
+                       {review_status} AS ReviewStatus
                 FROM article a
                 JOIN source s ON a.SourceID = s.SourceID
-                ORDER BY ReportCount DESC, a.Title
             """
+            if after:
+                query += " WHERE (a.ReportCount < %s OR (a.ReportCount = %s AND a.ArticleID < %s))"
+                params.extend([after[0], after[0], after[1]])
+            query += " ORDER BY a.ReportCount DESC, a.ArticleID DESC"
         else:
-            query = """
+            if after:
+                return jsonify({"error": "Pagination requires the ReportCount column (run migrate_add_report_count.py)"}), 400
+            query = f"""
                 SELECT a.ArticleID, a.Title, s.Name AS SourceName, 
                        report_count_for_article(a.ArticleID) AS ReportCount,
-                       'Normal' AS ReviewStatus
+                       {review_status} AS ReviewStatus
                 FROM article a
                 JOIN source s ON a.SourceID = s.SourceID
                 ORDER BY ReportCount DESC, a.Title
             """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return jsonify(rows), 200
+        if paginated:
+            query += " LIMIT %s"
+            params.append(limit + 1)
+
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            cursor.close()
+
+        if not paginated:
+            return jsonify(rows), 200
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["ReportCount"], rows[-1]["ArticleID"])
+        return jsonify({"items": rows, "next_cursor": next_cursor, "limit": limit}), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 
+def trend_response(compute, default="day"):
+    """
+    Shared handler for the /api/analytics/trends routes: parses
+    ?granularity=&from=&to= and runs compute(cursor, granularity, start, end)
+    against the rollup tables
+    """
+    try:
+        granularity, start, end = parse_trend_range(request.args, default=default)
+    except TrendQueryError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if not schema.has_table("check_rollup_daily"):
+            return jsonify({"error": "Run migrate_add_trend_rollups.py and rollup_trends.py first"}), 503
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            buckets = compute(cursor, granularity, start, end)
+            cursor.close()
+        return jsonify({
+            "granularity": granularity,
+            "from": start.isoformat(),
+            "to": (end - timedelta(days=1)).isoformat(),
+            "buckets": buckets,
+        }), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/analytics/trends/reports", methods=["GET"])
+@cached(ttl=60, tags=("trends",))
+def get_report_trend():
+    """Reports per hour / day / week, from the rollup tables"""
+    return trend_response(report_trend)
+
+
+@app.route("/api/analytics/trends/verdicts", methods=["GET"])
+@cached(ttl=60, tags=("trends",))
+def get_verdict_trend():
+    """Verdict mix per hour / day / week; optional ?source_id= for one source"""
+    source_id = request.args.get("source_id")
+    if source_id is not None and not source_id.isdigit():
+        return jsonify({"error": "source_id must be an integer"}), 400
+    source_id = int(source_id) if source_id is not None else None
+    return trend_response(
+        lambda cursor, granularity, start, end: verdict_trend(cursor, granularity, start, end, source_id),
+        default="week",
+    )
+
+
+@app.route("/api/analytics/trends/sources/<int:source_id>/trust", methods=["GET"])
+@cached(ttl=60, tags=("trends",))
+def get_source_trust_trend(source_id):
+    """Checks, average score and running TrustRating of one source over time"""
+    return trend_response(
+        lambda cursor, granularity, start, end: source_trust_trend(cursor, source_id, granularity, start, end)
+    )
+
+
 # -----------------------
 # USER ROUTES
 # -----------------------
@@ -536,21 +1034,25 @@ def add_user():
     try:
         name = data.get("name")
         email = data.get("email")
-        role = data.get("role", "user")
+        role = data.get("role") or "user"
         password = data.get("password")
         if not name or not email or not password:
             return jsonify({"error": "Missing required fields (name, email, password)"}), 400
-
-        conn = get_connection()
-        cursor = conn.cursor()
-        # store password as-is for now — replace with bcrypt in production
-        cursor.execute(
-            "INSERT INTO useraccount (Name, Email, Role, PasswordHash) VALUES (%s, %s, %s, %s)",
-            (name, email, role, password),
-        )
-        conn.commit()
-        cursor.close()
-        conn.close()
+        denied = role_grant_denied(role)
+        if denied:
+            return denied
+
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            # store password as-is for now — replace with bcrypt in production
+            cursor.execute(
+                "INSERT INTO useraccount (Name, Email, Role, PasswordHash) VALUES (%s, %s, %s, %s)",
+                (name, email, role, password),
+            )
+            conn.commit()
+            cursor.close()
+            bump_versions(conn, "useraccount")
+        response_cache.invalidate("users")
         return jsonify({"message": "User added successfully"}), 201
     except Exception as e:
         traceback.print_exc()
@@ -559,15 +1061,16 @@ def add_user():
 
 @app.route("/api/users", methods=["GET"])
 def get_users():
-    conn = None
-    cursor = None
+    query = "SELECT UserID, Name, Role FROM useraccount ORDER BY Name"
+    fmt = request.args.get("format", "json")
+    if fmt in STREAM_FORMATS:
+        return stream_query(query, fmt=fmt, filename="users")
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT UserID, Name, Role FROM useraccount ORDER BY Name")
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
         return jsonify(rows), 200
     except Exception as e:
         traceback.print_exc()
@@ -580,8 +1083,6 @@ def get_users():
 @app.route("/api/sources", methods=["POST"])
 def add_source():
     data = request.json or {}
-    conn = None
-    cursor = None
     try:
         name = data.get("name")
         domain = data.get("domain")
@@ -594,35 +1095,79 @@ def add_source():
         if not name or not domain:
             return jsonify({"error": "Missing required fields: name and domain"}), 400
 
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO source (Name, Domain, TrustRating) VALUES (%s, %s, %s)",
-            (name, domain, trust),
-        )
-        conn.commit()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO source (Name, Domain, TrustRating) VALUES (%s, %s, %s)",
+                (name, domain, trust),
+            )
+            conn.commit()
+            cursor.close()
+            bump_versions(conn, "source")
+        response_cache.invalidate("sources")
         return jsonify({"message": "Source added successfully"}), 201
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+
+
+# Tables whose versions make up the list ETags (also used by asgi.py)
+SOURCES_TABLES = ("source", "article", "credibilitycheck")
+REPORTS_TABLES = ("report", "useraccount", "article")
+CREDIBILITY_CHECKS_TABLES = ("credibilitycheck", "article", "useraccount")
+
+
+def sources_query(include):
+    """Query for GET /api/sources, depending on ?include= and installed tables"""
+    if "avg_credibility" not in include:
+        return "SELECT SourceID, Name, Domain, TrustRating, CreatedAt FROM source ORDER BY Name"
+    if schema.has_table("source_credibility_stats"):
+        return """
+            SELECT s.SourceID, s.Name, s.Domain, s.TrustRating, s.CreatedAt,
+                   COALESCE(ROUND(st.ScoreSum / NULLIF(st.CheckCount, 0) * 100, 2), 0.00) AS AvgCredibility
+            FROM source s
+            LEFT JOIN source_credibility_stats st ON st.SourceID = s.SourceID
+            ORDER BY s.Name
+        """
+    # Aggregate table not migrated yet - one GROUP BY over all checks
+    return """
+        SELECT s.SourceID, s.Name, s.Domain, s.TrustRating, s.CreatedAt,
+               COALESCE(ag.AvgCredibility, 0.00) AS AvgCredibility
+        FROM source s
+        LEFT JOIN (
+            SELECT a.SourceID, ROUND(AVG(COALESCE(c.FactCheckScore, 0)) * 100, 2) AS AvgCredibility
+            FROM credibilitycheck c
+            JOIN article a ON c.ArticleID = a.ArticleID
+            GROUP BY a.SourceID
+        ) ag ON ag.SourceID = s.SourceID
+        ORDER BY s.Name
+    """
 
 
 @app.route("/api/sources", methods=["GET"])
+@conditional(*SOURCES_TABLES)
 def get_sources():
-    conn = None
-    cursor = None
+    """
+    List sources.
+    ?include=avg_credibility adds each source's AvgCredibility (0-100) from one
+    grouped query, replacing a per-source /avg_credibility call.
+    """
+    include = {p.strip() for p in request.args.get("include", "").split(",") if p.strip()}
     try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("SELECT SourceID, Name, Domain, TrustRating, CreatedAt FROM source ORDER BY Name")
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        query = sources_query(include)
+
+        fmt = request.args.get("format", "json")
+        if fmt in STREAM_FORMATS:
+            return stream_query(query, fmt=fmt, filename="sources")
+
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            rows = cursor.fetchall()
+            cursor.close()
+        for row in rows:
+            if "AvgCredibility" in row:
+                row["AvgCredibility"] = float(row["AvgCredibility"])
         return jsonify(rows), 200
     except Exception as e:
         traceback.print_exc()
@@ -639,89 +1184,239 @@ def add_article():
     if not all(k in data for k in required):
         return jsonify({"error": "Missing required article fields"}), 400
 
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO article (Title, Content, URL, SourceID, PublishDate) VALUES (%s, %s, %s, %s, %s)",
-            (data["title"], data["content"], data["url"], int(data["source_id"]), data["publish_date"]),
-        )
-        conn.commit()
-        return jsonify({"message": "Article added successfully"}), 201
+        index_duplicates = schema.has_table("article_minhash")
+        near_duplicates = []
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO article (Title, Content, URL, SourceID, PublishDate) VALUES (%s, %s, %s, %s, %s)",
+                (data["title"], data["content"], data["url"], int(data["source_id"]), data["publish_date"]),
+            )
+            article_id = cursor.lastrowid
+            if index_duplicates:
+                # Same transaction, so an article is never stored unindexed
+                near_duplicates = index_and_match(cursor, [(article_id, data["content"])]).get(article_id, [])
+            conn.commit()
+            cursor.close()
+            bump_versions(conn, "article")
+        response_cache.invalidate("articles")
+        return jsonify({
+            "message": "Article added successfully",
+            "article_id": article_id,
+            "near_duplicates": near_duplicates,
+        }), 201
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+
+
+@app.route("/api/articles/bulk", methods=["POST"])
+def add_articles_bulk():
+    """
+    Bulk ingest articles in one transaction.
+    Body: JSON array of article objects (same fields as POST /api/articles),
+    {"articles": [...]}, or NDJSON with Content-Type application/x-ndjson.
+    ?batch_size= sets rows per savepoint (default BULK_BATCH_SIZE); a failing
+    batch is reported as errors without losing the others.
+    Existing URLs are reported as duplicates rather than errors; inserted
+    rows whose Content closely matches a stored article list it (with its
+    latest verdict) under near_duplicates.
+    """
+    try:
+        rows = parse_payload(request)
+        batch_size = int(request.args["batch_size"]) if request.args.get("batch_size") else None
+    except BulkPayloadError as e:
+        return jsonify({"error": str(e)}), 400
+    except ValueError:
+        return jsonify({"error": "batch_size must be an integer"}), 400
+
+    try:
+        index_duplicates = schema.has_table("article_minhash")
+        with db_connection() as conn:
+            results, stats = ingest_articles(conn, rows, batch_size=batch_size, near_duplicates=index_duplicates)
+        if stats["inserted"]:
+            response_cache.invalidate("articles")
+        return jsonify({"results": results, "stats": stats}), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+def latest_check(column):
+    """Correlated lookup of the article's latest check (idx_check_article_date)"""
+    return f"""(SELECT c.{column} FROM credibilitycheck c WHERE c.ArticleID = a.ArticleID
+        ORDER BY c.CheckDate DESC, c.CheckID DESC LIMIT 1)"""
+
+
+# Fields GET /api/articles can project with ?fields=
+ARTICLE_FIELDS = {
+    "ArticleID": "a.ArticleID",
+    "Title": "a.Title",
+    "Content": "a.Content",
+    "URL": "a.URL",
+    "SourceID": "a.SourceID",
+    "PublishDate": "a.PublishDate",
+    "CreatedAt": "a.CreatedAt",
+    "ReviewStatus": "a.ReviewStatus",
+    "SourceName": "s.Name",
+    # Latest check, from the article_latest_check projection (primary key
+    # join); LATEST_CHECK_FALLBACK is used until it is migrated
+    "CredibilityVerdict": "COALESCE(lc.FinalVerdict, 'Unverified')",
+    "FactCheckScore": "lc.FactCheckScore",
+    "CheckedByUserID": "lc.CheckedBy",
+    "CheckDate": "lc.CheckDate",
+    # Filled by the verdict propagation job for unchecked near-duplicates
+    "SuggestedVerdict": "(SELECT sv.SuggestedVerdict FROM suggested_verdict sv WHERE sv.ArticleID = a.ArticleID)",
+    "SuggestionConfidence": "(SELECT sv.Confidence FROM suggested_verdict sv WHERE sv.ArticleID = a.ArticleID)",
+}
+LATEST_CHECK_FALLBACK = {
+    "CredibilityVerdict": f"COALESCE({latest_check('FinalVerdict')}, 'Unverified')",
+    "FactCheckScore": latest_check("FactCheckScore"),
+    "CheckedByUserID": latest_check("CheckedBy"),
+    "CheckDate": latest_check("CheckDate"),
+}
+ARTICLE_DEFAULT_FIELDS = ("ArticleID", "Title", "URL", "PublishDate", "ReviewStatus", "SourceName", "CredibilityVerdict")
 
 
 @app.route("/api/articles", methods=["GET"])
 def get_articles():
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        
-        # Check if ReviewStatus column exists, if not add it
-        review_status_exists = False
-        try:
-            cursor.execute("SHOW COLUMNS FROM article LIKE 'ReviewStatus'")
-            review_status_exists = cursor.fetchone() is not None
-        except:
-            pass
-        
-        if not review_status_exists:
-            try:
-                cursor.execute("""
-                    ALTER TABLE article 
-                    ADD COLUMN ReviewStatus ENUM('Normal','Under Review') DEFAULT 'Normal'
-                """)
-                conn.commit()
-                review_status_exists = True
-                print("ReviewStatus column added to article table")
-            except Exception as alter_error:
-                # Column might already exist or there's a permission issue
-                print(f"Could not add ReviewStatus column: {alter_error}")
-                review_status_exists = False
-        
-        # Build query based on whether ReviewStatus exists
-        if review_status_exists:
-            query = """
-                SELECT a.ArticleID, a.Title, a.URL, a.PublishDate, 
-                       a.ReviewStatus,
-                       s.Name AS SourceName,
-                       COALESCE(MAX(c.FinalVerdict), 'Unverified') AS CredibilityVerdict
-                FROM article a
-                JOIN source s ON a.SourceID = s.SourceID
-                LEFT JOIN credibilitycheck c ON a.ArticleID = c.ArticleID
-                GROUP BY a.ArticleID, a.Title, a.URL, a.PublishDate, a.ReviewStatus, s.Name
-                ORDER BY a.CreatedAt DESC
-            """
-        else:
-            # Fallback query without ReviewStatus
-            query = """
-                SELECT a.ArticleID, a.Title, a.URL, a.PublishDate, 
-                       'Normal' AS ReviewStatus,
-                       s.Name AS SourceName,
-                       COALESCE(MAX(c.FinalVerdict), 'Unverified') AS CredibilityVerdict
-                FROM article a
-                JOIN source s ON a.SourceID = s.SourceID
-                LEFT JOIN credibilitycheck c ON a.ArticleID = c.ArticleID
-                GROUP BY a.ArticleID, a.Title, a.URL, a.PublishDate, s.Name
-                ORDER BY a.CreatedAt DESC
-            """
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
-        return jsonify(rows), 200
+    """
+    List articles newest first.
+    Query params (all optional):
+      limit  - page size; enables keyset pagination ({"items", "next_cursor"})
+      cursor - next_cursor from the previous page
+      fields - comma separated projection, e.g. fields=ArticleID,Title
+    Without limit/cursor the full list is returned as a plain array.
+    """
+    try:
+        paginated = "limit" in request.args or "cursor" in request.args
+        limit = parse_limit(request.args.get("limit")) if paginated else None
+        fields = parse_fields(request.args.get("fields"), ARTICLE_FIELDS, ARTICLE_DEFAULT_FIELDS)
+        after = decode_cursor(request.args["cursor"], 2) if request.args.get("cursor") else None
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        review_status_exists = schema.has_column("article", "ReviewStatus")
+        suggestions_exist = schema.has_table("suggested_verdict")
+        projection_exists = schema.has_table("article_latest_check")
+
+        select = []
+        for name in fields:
+            expr = ARTICLE_FIELDS[name]
+            if name == "ReviewStatus" and not review_status_exists:
+                expr = "'Normal'"
+            elif name in ("SuggestedVerdict", "SuggestionConfidence") and not suggestions_exist:
+                expr = "NULL"
+            elif name in LATEST_CHECK_FALLBACK and not projection_exists:
+                expr = LATEST_CHECK_FALLBACK[name]
+            select.append(f"{expr} AS {name}")
+        # Sort key is always selected so the cursor can be built
+        select.append("a.CreatedAt AS _CreatedAt")
+        select.append("a.ArticleID AS _ArticleID")
+
+        query = f"SELECT {', '.join(select)} FROM article a"
+        if "SourceName" in fields:
+            query += " JOIN source s ON a.SourceID = s.SourceID"
+        if projection_exists and any(name in LATEST_CHECK_FALLBACK for name in fields):
+            query += " LEFT JOIN article_latest_check lc ON lc.ArticleID = a.ArticleID"
+
+        params = []
+        if after:
+            # Range scan on idx_article_created (CreatedAt, ArticleID)
+            query += " WHERE (a.CreatedAt < %s OR (a.CreatedAt = %s AND a.ArticleID < %s))"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY a.CreatedAt DESC, a.ArticleID DESC"
+        if paginated:
+            # Fetch one extra row to know whether another page exists
+            query += " LIMIT %s"
+            params.append(limit + 1)
+
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            cursor.close()
+
+        next_cursor = None
+        if paginated and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["_CreatedAt"], rows[-1]["_ArticleID"])
+        for row in rows:
+            row.pop("_CreatedAt")
+            row.pop("_ArticleID")
+
+        if not paginated:
+            return jsonify(rows), 200
+        return jsonify({"items": rows, "next_cursor": next_cursor, "limit": limit}), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route("/api/articles/search", methods=["GET"])
+@cached(30, tags=("articles",))
+def search_articles():
+    """
+    Full-text search over article Title and Content, best match first.
+    Query params:
+      q      - search text; "quoted phrases" are matched as phrases
+      match  - all (default, every term required) or any
+      limit  - page size (default 50)
+      cursor - next_cursor from the previous page
+    Each item carries Score, a highlighted TitleHighlight and a Snippet of
+    Content around the first match (HTML-escaped, matches wrapped in <mark>).
+    """
+    try:
+        expression, terms = parse_query(request.args.get("q"), request.args.get("match", "all") != "any")
+        limit = parse_limit(request.args.get("limit"))
+        after = decode_cursor(request.args["cursor"], 2) if request.args.get("cursor") else None
+    except (SearchQueryError, PaginationError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if not schema.has_index("article", FULLTEXT_INDEX):
+            return jsonify({
+                "error": "Full-text index missing; run migrate_add_fulltext_index.py",
+            }), 503
+
+        review_status = "a.ReviewStatus" if schema.has_column("article", "ReviewStatus") else "'Normal'"
+        match = "MATCH(a.Title, a.Content) AGAINST (%s IN BOOLEAN MODE)"
+        query = f"""
+            SELECT a.ArticleID, a.Title, a.Content, a.URL, a.PublishDate,
+                   {review_status} AS ReviewStatus, s.Name AS SourceName,
+                   {match} AS Score
+            FROM article a
+            JOIN source s ON a.SourceID = s.SourceID
+            WHERE {match}
+        """
+        params = [expression, expression]
+        if after:
+            query += f" AND ({match} < %s OR ({match} = %s AND a.ArticleID < %s))"
+            params.extend([expression, after[0], expression, after[0], after[1]])
+        # Only the matching doc ids from the inverted index are ranked, so
+        # cost follows the number of matches rather than the table size
+        query += " ORDER BY Score DESC, a.ArticleID DESC LIMIT %s"
+        params.append(limit + 1)
+
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, tuple(params))
+            rows = cursor.fetchall()
+            cursor.close()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(float(rows[-1]["Score"]), rows[-1]["ArticleID"])
+        for row in rows:
+            content = row.pop("Content")
+            row["Score"] = round(float(row["Score"]), 4)
+            row["TitleHighlight"] = highlight(row["Title"], terms)
+            row["Snippet"] = snippet(content, terms)
+
+        return jsonify({"query": expression, "items": rows, "next_cursor": next_cursor, "limit": limit}), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
@@ -736,45 +1431,70 @@ def add_report():
     if not all(k in data for k in ("user_id", "article_id")):
         return jsonify({"error": "Missing required fields user_id and article_id"}), 400
 
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO report (UserID, ArticleID, Reason) VALUES (%s, %s, %s)",
-            (int(data["user_id"]), int(data["article_id"]), data.get("reason")),
-        )
-        conn.commit()
+        user_id = int(data["user_id"])
+        article_id = int(data["article_id"])
+        track_status = schema.has_column("article", "ReviewStatus")
+        status_before = status_after = None
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            if track_status:
+                cursor.execute("SELECT ReviewStatus FROM article WHERE ArticleID = %s", (article_id,))
+                row = cursor.fetchone()
+                status_before = row[0] if row else None
+            cursor.execute(
+                "INSERT INTO report (UserID, ArticleID, Reason) VALUES (%s, %s, %s)",
+                (user_id, article_id, data.get("reason")),
+            )
+            report_id = cursor.lastrowid
+            conn.commit()
+            if track_status:
+                # flag_article_after_report may have flipped the article
+                cursor.execute("SELECT ReviewStatus FROM article WHERE ArticleID = %s", (article_id,))
+                row = cursor.fetchone()
+                status_after = row[0] if row else None
+            cursor.close()
+            # flag_article_after_report also changes the article row
+            bump_versions(conn, "report", "article")
+        # flag_article_after_report also changes article ReportCount/ReviewStatus
+        response_cache.invalidate("reports", "articles")
+        event_bus.publish("report.created", {
+            "report_id": report_id,
+            "article_id": article_id,
+            "user_id": user_id,
+            "reason": data.get("reason"),
+        })
+        if status_after == "Under Review" and status_before != "Under Review":
+            event_bus.publish("article.under_review", {"article_id": article_id})
         return jsonify({"message": "Report submitted successfully"}), 201
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+
+
+REPORTS_SQL = """
+    SELECT r.ReportID, u.Name AS Reporter, a.Title AS ArticleTitle,
+           r.Reason, r.Status, r.ReportDate
+    FROM report r
+    JOIN useraccount u ON r.UserID = u.UserID
+    JOIN article a ON r.ArticleID = a.ArticleID
+    ORDER BY r.ReportID ASC
+"""
 
 
 @app.route("/api/reports", methods=["GET"])
+@conditional(*REPORTS_TABLES)
 def get_reports():
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT r.ReportID, u.Name AS Reporter, a.Title AS ArticleTitle,
-                   r.Reason, r.Status, r.ReportDate
-            FROM report r
-            JOIN useraccount u ON r.UserID = u.UserID
-            JOIN article a ON r.ArticleID = a.ArticleID
-            ORDER BY r.ReportID ASC
-        """)
-        results = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    query = REPORTS_SQL
+    fmt = request.args.get("format", "json")
+    if fmt in STREAM_FORMATS:
+        return stream_query(query, fmt=fmt, filename="reports")
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            results = cursor.fetchall()
+            cursor.close()
         return jsonify(results), 200
     except Exception as e:
         traceback.print_exc()
@@ -795,77 +1515,122 @@ def add_credibility_check():
     if not all(k in data for k in required):
         return jsonify({"error": "Missing required fields"}), 400
 
-    # Check if checked_by is provided and validate role
-    checked_by = data.get("checked_by")
-    if checked_by:
-        conn = None
-        cursor = None
-        try:
-            conn = get_connection()
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute("SELECT Role FROM useraccount WHERE UserID = %s", (int(checked_by),))
-            user = cursor.fetchone()
-            
-            if user and user["Role"] not in ("fact-checker", "admin"):
-                return jsonify({
-                    "error": "Unauthorized: Only fact-checkers and admins can perform credibility checks",
-                    "user_role": user["Role"]
-                }), 403
-        except:
-            pass
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+    # Same session-based authorization as /api/perform_check
+    try:
+        checked_by = int(data["checked_by"]) if data.get("checked_by") not in (None, "") else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "checked_by must be a UserID"}), 400
+    denied = checker_denied(checked_by)
+    if denied:
+        return denied
 
-    conn = None
-    cursor = None
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
-            (int(data["article_id"]), (None if data.get("factcheck_score") in (None, "") else float(data["factcheck_score"])), data["final_verdict"], (None if checked_by in (None, "") else int(checked_by))),
-        )
-        conn.commit()
+        article_id = int(data["article_id"])
+        fact_score = None if data.get("factcheck_score") in (None, "") else float(data["factcheck_score"])
+        checker_id = g.user_id
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            trust_before = source_trust_for_article(cursor, article_id)
+            cursor.execute(
+                "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
+                (article_id, fact_score, data["final_verdict"], checker_id),
+            )
+            conn.commit()
+            trust_after = source_trust_for_article(cursor, article_id)
+            cursor.close()
+            # update_source_trust_after_check also changes source.TrustRating
+            bump_versions(conn, "credibilitycheck", "source")
+        response_cache.invalidate("checks", "sources")
+        publish_verdict(article_id, data["final_verdict"], fact_score, checker_id, trust_before, trust_after)
         return jsonify({"message": "Credibility check added successfully"}), 201
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+
+
+CREDIBILITY_CHECKS_SQL = """
+    SELECT c.CheckID, a.Title AS ArticleTitle, c.FactCheckScore,
+           c.FinalVerdict, u.Name AS CheckedBy, c.CheckDate
+    FROM credibilitycheck c
+    JOIN article a ON c.ArticleID = a.ArticleID
+    LEFT JOIN useraccount u ON c.CheckedBy = u.UserID
+    ORDER BY c.CheckID ASC
+"""
 
 
 @app.route("/api/credibility", methods=["GET"])
+@conditional(*CREDIBILITY_CHECKS_TABLES)
 def get_credibility_checks():
-    conn = None
-    cursor = None
-    try:
-        conn = get_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute("""
-            SELECT c.CheckID, a.Title AS ArticleTitle, c.FactCheckScore,
-                   c.FinalVerdict, u.Name AS CheckedBy, c.CheckDate
-            FROM credibilitycheck c
-            JOIN article a ON c.ArticleID = a.ArticleID
-            LEFT JOIN useraccount u ON c.CheckedBy = u.UserID
-            ORDER BY c.CheckID ASC
-        """)
-        results = cursor.fetchall()
-        cursor.close()
-        conn.close()
+    query = CREDIBILITY_CHECKS_SQL
+    fmt = request.args.get("format", "json")
+    if fmt in STREAM_FORMATS:
+        return stream_query(query, fmt=fmt, filename="credibility_checks")
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            results = cursor.fetchall()
+            cursor.close()
         return jsonify(results), 200
     except Exception as e:
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
 
+@app.route("/api/credibility/queue", methods=["GET"])
+@cached(ttl=30, tags=("articles", "reports", "checks"))
+def get_check_queue():
+    """
+    Unchecked articles for fact-checkers, highest impact first.
+    Impact = near-duplicate cluster size * report count, so one check on a
+    widely copied, heavily reported story comes before isolated ones.
+    Items carry the propagated SuggestedVerdict / SuggestionConfidence.
+    Query params: limit (default 50)
+    """
+    try:
+        limit = parse_limit(request.args.get("limit"))
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        if not schema.has_table("article_cluster_size"):
+            return jsonify({"error": "Run migrate_add_verdict_propagation.py first"}), 503
+        if schema.has_column("article", "ReportCount"):
+            report_count = "a.ReportCount"
+        else:
+            report_count = "(SELECT COUNT(*) FROM report r WHERE r.ArticleID = a.ArticleID)"
+
+        query = f"""
+            SELECT a.ArticleID, a.Title, a.URL,
+                   {report_count} AS ReportCount,
+                   ac.ClusterID,
+                   COALESCE(cs.Size, 1) AS ClusterSize,
+                   COALESCE(cs.Size, 1) * {report_count} AS Impact,
+                   sv.SuggestedVerdict, sv.Confidence AS SuggestionConfidence,
+                   sv.BasedOnArticleID
+            FROM article a
+            LEFT JOIN article_cluster ac ON ac.ArticleID = a.ArticleID
+            LEFT JOIN article_cluster_size cs ON cs.ClusterID = ac.ClusterID
+            LEFT JOIN suggested_verdict sv ON sv.ArticleID = a.ArticleID
+            WHERE NOT EXISTS (SELECT 1 FROM credibilitycheck c WHERE c.ArticleID = a.ArticleID)
+            ORDER BY Impact DESC, ClusterSize DESC, a.ArticleID ASC
+            LIMIT %s
+        """
+        with db_connection() as conn:
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query, (limit,))
+            rows = cursor.fetchall()
+            cursor.close()
+        return jsonify(rows), 200
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
 # -----------------------
 # MAIN
 # -----------------------
+# Development server only - production runs serve.py (gunicorn) or asgi.py
 if __name__ == "__main__":
+    install_schema_refresh_signal()
     app.run(host="0.0.0.0", port=5000, debug=True)
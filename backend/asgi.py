@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+ASGI entry point
+Serves the same API as app.py. Handled natively with asyncio and the
+aiomysql pool (async_db.py), so thousands of clients wait on MySQL or on
+new events without holding a thread each:
+- the dashboard analytics routes (GET /api/analytics/dashboard runs the
+  three dashboard queries concurrently)
+- the polled lists GET /api/sources, /api/reports and /api/credibility
+  (JSON only, with the same ETag / If-None-Match handling as the Flask views)
+- the Server-Sent Events feed GET /api/events
+Native routes are recorded in /metrics like the Flask ones. They are public
+reads, so they skip the session hook (the bearer token is not looked at).
+Every other route - writes, auth, ?format= exports - is passed through to
+the Flask app (WsgiToAsgi, run in a bounded thread pool).
+
+SSE events and response-cache invalidations reach every worker through
+event_log (broadcast.py) once migrate_add_event_log.py has run; before
+that they are per process, so run a single worker until then.
+
+Run with:  uvicorn asgi:application --host 0.0.0.0 --port 5000
+     or:   python asgi.py
+"""
+
+import asyncio
+import os
+import time
+import traceback
+from urllib.parse import parse_qs
+
+from asgiref.wsgi import WsgiToAsgi
+from werkzeug.http import parse_etags, quote_etag
+
+from app import (
+    ACTIVE_REPORTERS_SQL,
+    CREDIBILITY_CHECKS_SQL,
+    CREDIBILITY_CHECKS_TABLES,
+    REPORTS_SQL,
+    REPORTS_TABLES,
+    SOURCES_TABLES,
+    TOP_TRUSTED_SOURCES_SQL,
+    app,
+    install_schema_refresh_signal,
+    sources_query,
+    under_review_query,
+)
+from async_db import async_pool_stats, close_async_pool, fetch_all, init_async_pool, request_sql
+from broadcast import broadcaster
+from events import event_bus, parse_last_event_id
+from metrics import METRICS_ENABLED, metrics
+from response_cache import CACHE_ENABLED, response_cache
+from schema_registry import schema
+from streaming import STREAM_FORMATS
+from table_versions import make_etag
+
+wsgi_fallback = WsgiToAsgi(app)
+CORS_HEADER = (b"access-control-allow-origin", b"*")  # same policy as flask_cors in app.py
+
+
+async def _cached_rows(name, path, ttl, tags, compute):
+    """
+    Async counterpart of response_cache.cached: same cache instance and key
+    format, so writes handled by the Flask routes invalidate these entries.
+    """
+    if not CACHE_ENABLED:
+        return app.json.dumps(await compute()).encode("utf-8"), "BYPASS"
+    key = f"{name}:{path}"
+    payload = response_cache.get(key, endpoint=name)
+    if payload is not None:
+        return payload[0], "HIT"
+    generations = response_cache.generations(tags)
+    body = app.json.dumps(await compute()).encode("utf-8")
+    response_cache.set(key, (body, "application/json"), ttl, tags, generations)
+    return body, "MISS"
+
+
+async def top_trusted_sources():
+    return await fetch_all(TOP_TRUSTED_SOURCES_SQL)
+
+
+async def under_review_articles():
+    # Schema capabilities are cached, so this is normally an in-memory check
+    query = await asyncio.to_thread(under_review_query)
+    return await fetch_all(query)
+
+
+async def active_reporters():
+    return await fetch_all(ACTIVE_REPORTERS_SQL)
+
+
+async def dashboard():
+    """All dashboard panels in one round trip, queried concurrently"""
+    sources, under_review, reporters = await asyncio.gather(
+        top_trusted_sources(), under_review_articles(), active_reporters()
+    )
+    return {
+        "top_trusted_sources": sources,
+        "under_review_articles": under_review,
+        "active_reporters": reporters,
+    }
+
+
+async def sources_list(params):
+    include = {p.strip() for p in params.get("include", [""])[0].split(",") if p.strip()}
+    query = await asyncio.to_thread(sources_query, include)
+    rows = await fetch_all(query)
+    for row in rows:
+        if "AvgCredibility" in row:
+            row["AvgCredibility"] = float(row["AvgCredibility"])
+    return rows
+
+
+async def reports_list(params):
+    return await fetch_all(REPORTS_SQL)
+
+
+async def credibility_list(params):
+    return await fetch_all(CREDIBILITY_CHECKS_SQL)
+
+
+async def list_etag(tables, path):
+    """Async counterpart of table_versions.conditional's ETag; None if unavailable"""
+    try:
+        if not await asyncio.to_thread(schema.has_table, "table_versions"):
+            return None
+        placeholders = ", ".join(["%s"] * len(tables))
+        rows = await fetch_all(
+            f"SELECT TableName, Version FROM table_versions WHERE TableName IN ({placeholders})",
+            tuple(tables),
+        )
+    except Exception:
+        # Version lookup failing must never break the read itself
+        return None
+    versions = {row["TableName"]: int(row["Version"]) for row in rows}
+    return make_etag({table: versions.get(table, 0) for table in tables}, path)
+
+
+# path -> (cache name, ttl, tags, handler); names match the Flask views
+ASYNC_ROUTES = {
+    "/api/analytics/top_trusted_sources": ("get_top_trusted_sources", 60, ("sources", "checks"), top_trusted_sources),
+    "/api/analytics/under_review_articles": ("get_under_review_articles", 30, ("articles", "reports"), under_review_articles),
+    "/api/analytics/active_reporters": ("get_active_reporters", 60, ("users", "reports"), active_reporters),
+    "/api/analytics/dashboard": ("get_dashboard", 30, ("sources", "checks", "articles", "reports", "users"), dashboard),
+}
+
+# path -> (tables behind its ETag, handler(query params))
+LIST_ROUTES = {
+    "/api/sources": (SOURCES_TABLES, sources_list),
+    "/api/reports": (REPORTS_TABLES, reports_list),
+    "/api/credibility": (CREDIBILITY_CHECKS_TABLES, credibility_list),
+}
+
+
+async def _send_json(send, status, body, extra_headers=()):
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode()),
+        CORS_HEADER,
+        *extra_headers,
+    ]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _list_response(send, tables, handler, params, path, if_none_match):
+    etag = await list_etag(tables, path)
+    if etag is not None and parse_etags(if_none_match).contains(etag):
+        headers = [(b"etag", quote_etag(etag).encode()), CORS_HEADER]
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+    body = app.json.dumps(await handler(params)).encode("utf-8")
+    await _send_json(send, 200, body, [(b"etag", quote_etag(etag).encode())] if etag else [])
+
+
+async def _stream_events(receive, send, params, headers):
+    """GET /api/events: same frames and parameters as the Flask route"""
+    last_id = parse_last_event_id(
+        headers.get(b"last-event-id", b"").decode("latin-1") or params.get("last_event_id", [None])[0]
+    )
+    types = {t.strip() for t in params.get("types", [""])[0].split(",") if t.strip()} or None
+    await send({"type": "http.response.start", "status": 200, "headers": [
+        (b"content-type", b"text/event-stream; charset=utf-8"),
+        (b"cache-control", b"no-cache"),
+        (b"x-accel-buffering", b"no"),
+        CORS_HEADER,
+    ]})
+
+    async def pump():
+        async for frame in event_bus.astream(last_id, types):
+            await send({"type": "http.response.body", "body": frame.encode("utf-8"), "more_body": True})
+
+    async def disconnected():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    tasks = {asyncio.ensure_future(pump()), asyncio.ensure_future(disconnected())}
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _observed(route, method, send):
+    """
+    Wrap send so the route's status, time to first byte and SQL time are
+    recorded in /metrics, as the Flask after_request hook does
+    """
+    started = time.perf_counter()
+    totals = [0.0, 0]
+    request_sql.set(totals)
+
+    async def observed_send(message):
+        if message["type"] == "http.response.start" and METRICS_ENABLED:
+            metrics.observe_request(
+                route, method, message["status"], time.perf_counter() - started, totals[0], totals[1],
+            )
+        await send(message)
+    return observed_send
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await init_async_pool()
+                install_schema_refresh_signal()
+                broadcaster.start()
+                await send({"type": "lifespan.startup.complete"})
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_pool()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await _lifespan(receive, send)
+
+    is_get = scope["type"] == "http" and scope["method"] == "GET"
+    if not is_get:
+        return await wsgi_fallback(scope, receive, send)
+    query_string = scope.get("query_string", b"").decode("latin-1")
+    params = parse_qs(query_string)
+    path = scope["path"]
+    native = (
+        path in ("/api/health/async_pool", "/api/events")
+        or path in ASYNC_ROUTES
+        or (path in LIST_ROUTES and params.get("format", ["json"])[0] not in STREAM_FORMATS)
+    )
+    if not native:
+        return await wsgi_fallback(scope, receive, send)
+
+    send = _observed(path, "GET", send)
+    headers = dict(scope.get("headers", []))
+    # Same key shape as Flask's request.full_path ("/path?query")
+    full_path = f"{path}?{query_string}"
+    try:
+        if path == "/api/health/async_pool":
+            return await _send_json(send, 200, app.json.dumps(async_pool_stats()).encode("utf-8"))
+        if path == "/api/events":
+            return await _stream_events(receive, send, params, headers)
+        if path in LIST_ROUTES:
+            tables, handler = LIST_ROUTES[path]
+            return await _list_response(
+                send, tables, handler, params, full_path, headers.get(b"if-none-match", b"").decode("latin-1"),
+            )
+        name, ttl, tags, handler = ASYNC_ROUTES[path]
+        body, cache_status = await _cached_rows(name, full_path, ttl, tags, handler)
+        await _send_json(send, 200, body, [(b"x-cache", cache_status.encode())])
+    except Exception as e:
+        traceback.print_exc()
+        await _send_json(send, 500, app.json.dumps({"error": str(e)}).encode("utf-8"))
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "asgi:application",
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "5000")),
+        workers=int(os.environ.get("ASGI_WORKERS", "1")),
+        log_level="info",
+    )
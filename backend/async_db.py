@@ -0,0 +1,82 @@
+"""
+asyncio MySQL connection pool (aiomysql) for the ASGI entry point
+Uses the same DB_CONFIG / POOL_CONFIG settings as db_config.py. Connections
+run in autocommit mode: the async handlers only read, and a pooled
+connection must not keep serving an old REPEATABLE READ snapshot.
+Queries are reported to the db_config query observers (metrics, slow-query
+profiler) like the synchronous pool's, and added to request_sql when the
+caller set it, so asgi.py can attribute SQL time to the route.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+import aiomysql
+
+from db_config import DB_CONFIG, POOL_CONFIG, notify_query_observers
+
+ASYNC_POOL_MAXSIZE = int(os.environ.get("DB_ASYNC_POOL_MAXSIZE", str(POOL_CONFIG["size"] + POOL_CONFIG["overflow"])))
+
+_pool = None
+# [seconds, statements] of the current request, set by asgi.py
+request_sql = ContextVar("request_sql", default=None)
+
+
+async def init_async_pool():
+    """Create the process-wide pool; call once from the ASGI lifespan startup"""
+    global _pool
+    if _pool is None:
+        _pool = await aiomysql.create_pool(
+            host=DB_CONFIG["host"],
+            user=DB_CONFIG["user"],
+            password=DB_CONFIG["password"],
+            db=DB_CONFIG["database"],
+            minsize=min(POOL_CONFIG["size"], ASYNC_POOL_MAXSIZE),
+            maxsize=ASYNC_POOL_MAXSIZE,
+            pool_recycle=int(POOL_CONFIG["recycle"]),
+            autocommit=True,
+        )
+    return _pool
+
+
+async def close_async_pool():
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        await _pool.wait_closed()
+        _pool = None
+
+
+async def fetch_all(query, params=()):
+    """Run a read query on a pooled connection and return rows as dicts"""
+    pool = _pool or await init_async_pool()
+    async with pool.acquire() as conn:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            started = time.perf_counter()
+            error = None
+            try:
+                await cursor.execute(query, params or None)
+                return await cursor.fetchall()
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                notify_query_observers(query, params, seconds, error)
+                totals = request_sql.get()
+                if totals is not None:
+                    totals[0] += seconds
+                    totals[1] += 1
+
+
+def async_pool_stats():
+    if _pool is None:
+        return {"initialized": False}
+    return {
+        "initialized": True,
+        "size": _pool.size,
+        "free": _pool.freesize,
+        "minsize": _pool.minsize,
+        "maxsize": _pool.maxsize,
+    }
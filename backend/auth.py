@@ -0,0 +1,155 @@
+"""
+Password hashing off the request thread
+Hashing and verification run in a small process pool so a login burst
+cannot pin every request thread on CPU. Admission is bounded: when
+AUTH_HASH_QUEUE jobs are already queued or running, callers get AuthBusy
+right away (routes answer 503 + Retry-After) instead of queueing without
+limit; a job whose caller timed out keeps its slot until it finishes.
+AUTH_HASH_METHOD sets the cost policy; a hash made with an older policy is
+upgraded transparently on the next successful login.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import lru_cache
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+AUTH_HASH_METHOD = os.environ.get("AUTH_HASH_METHOD", "scrypt:32768:8:1")
+AUTH_HASH_WORKERS = int(os.environ.get("AUTH_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+AUTH_HASH_QUEUE = int(os.environ.get("AUTH_HASH_QUEUE", str(AUTH_HASH_WORKERS * 4)))
+AUTH_HASH_TIMEOUT = float(os.environ.get("AUTH_HASH_TIMEOUT", "5"))
+AUTH_RETRY_AFTER = 1
+# forkserver is POSIX only; spawn is the safe choice elsewhere
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+class AuthBusy(RuntimeError):
+    """The hashing queue is full (or a hash timed out); retry later"""
+
+
+@lru_cache(maxsize=None)
+def _hash_prefix(method):
+    """
+    The method prefix werkzeug stores for `method`, with its defaults filled
+    in ("scrypt" -> "scrypt:32768:8:1", "pbkdf2" -> "pbkdf2:sha256:<iterations>")
+    """
+    return generate_password_hash("", method=method).split("$", 1)[0]
+
+
+def needs_rehash(pwhash, method=AUTH_HASH_METHOD):
+    """True if pwhash was not produced with the current cost policy"""
+    return not pwhash or pwhash.split("$", 1)[0] != _hash_prefix(method)
+
+
+# Run inside the worker processes
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(pwhash, password, method):
+    if not check_password_hash(pwhash, password):
+        return False, None
+    return True, (generate_password_hash(password, method=method) if needs_rehash(pwhash, method) else None)
+
+
+class PasswordHasher:
+    def __init__(self, workers=AUTH_HASH_WORKERS, queue=AUTH_HASH_QUEUE, method=AUTH_HASH_METHOD):
+        self.workers = workers
+        self.queue = queue
+        self.method = method
+        self._slots = threading.BoundedSemaphore(queue)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._stats = {"hashes": 0, "verifies": 0, "rehashes": 0, "rejected": 0, "timeouts": 0, "in_flight": 0}
+        self._total_ms = 0.0
+
+    def _pool(self):
+        with self._lock:
+            # A pool inherited across fork() is unusable - start a fresh one.
+            # Workers come from a forkserver, not fork(): forking a threaded
+            # web worker can copy a lock some other thread holds (pool,
+            # logging) into the child, which then deadlocks on it
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(WORKER_START_METHOD),
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def _bump(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            self._bump("rejected")
+            raise AuthBusy("Authentication is busy, retry shortly")
+        self._bump("in_flight")
+        started = time.perf_counter()
+        try:
+            future = self._pool().submit(fn, *args)
+        except Exception:
+            self._finished(started)
+            raise
+        # The slot belongs to the job, not the caller: a caller that gave up
+        # must not let another job in while its own still occupies the pool
+        future.add_done_callback(lambda _: self._finished(started))
+        try:
+            return future.result(timeout=AUTH_HASH_TIMEOUT)
+        except FutureTimeout:
+            self._bump("timeouts")
+            # Drops it if still queued; a running hash keeps its slot until done
+            future.cancel()
+            raise AuthBusy("Password hashing timed out")
+
+    def _finished(self, started):
+        self._bump("in_flight", -1)
+        with self._lock:
+            self._total_ms += (time.perf_counter() - started) * 1000
+        self._slots.release()
+
+    def hash(self, password):
+        self._bump("hashes")
+        return self._run(_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        """
+        Returns (ok, new_hash). new_hash is set when the password matched but
+        the stored hash uses an outdated policy and should be replaced.
+        """
+        if not pwhash:
+            return False, None
+        self._bump("verifies")
+        ok, new_hash = self._run(_verify, pwhash, password, self.method)
+        if new_hash:
+            self._bump("rehashes")
+        return ok, new_hash
+
+    def stats(self):
+        with self._lock:
+            done = self._stats["hashes"] + self._stats["verifies"] - self._stats["rejected"]
+            return {
+                **self._stats,
+                "method": self.method,
+                "workers": self.workers,
+                "queue_limit": self.queue,
+                "avg_ms": round(self._total_ms / done, 2) if done > 0 else 0.0,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+hasher = PasswordHasher()
+atexit.register(hasher.shutdown)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Benchmark the API routes at fixed concurrency
+Each scenario is driven by --concurrency threads (one keep-alive HTTP
+connection each) for --duration seconds after a short warm-up. Results are
+printed / written as JSON with throughput and p50/p95/p99 latency so runs
+from different commits can be compared (--compare baseline.json).
+
+Seed data first with seed_synthetic_data.py, then start the API (app.py,
+serve.py or asgi.py) against the same local MySQL/MariaDB instance.
+perform_check runs as the fact-checker or admin given by --email (seeded
+users have the password "bench-password").
+
+Usage:
+  python benchmark.py [--url http://localhost:5000] [--concurrency 16]
+      [--duration 10] [--only articles_page,perform_check]
+      [--email checker@example.com] [--password bench-password]
+      [--output run.json] [--compare baseline.json]
+"""
+
+import argparse
+import http.client
+import json
+import random
+import subprocess
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+# name -> (method, path). Paths may contain {article_id} / {source_id};
+# POST bodies are built in _body()
+SCENARIOS = {
+    "ping": ("GET", "/ping"),
+    "articles_page": ("GET", "/api/articles?limit=50"),
+    "articles_full": ("GET", "/api/articles"),
+    "articles_search": ("GET", "/api/articles/search?q=vaccine+election&limit=20"),
+    "sources": ("GET", "/api/sources"),
+    "sources_with_avg": ("GET", "/api/sources?include=avg_credibility"),
+    "reports": ("GET", "/api/reports"),
+    "credibility": ("GET", "/api/credibility"),
+    "source_avg_credibility": ("GET", "/api/sources/{source_id}/avg_credibility"),
+    "article_report_count": ("GET", "/api/articles/{article_id}/report_count"),
+    "top_trusted_sources": ("GET", "/api/analytics/top_trusted_sources"),
+    "under_review_articles": ("GET", "/api/analytics/under_review_articles"),
+    "active_reporters": ("GET", "/api/analytics/active_reporters"),
+    "articles_with_report_count": ("GET", "/api/analytics/articles_with_report_count?limit=50"),
+    "check_queue": ("GET", "/api/credibility/queue"),
+    "report_trend": ("GET", "/api/analytics/trends/reports?granularity=day"),
+    "verdict_trend": ("GET", "/api/analytics/trends/verdicts?granularity=week"),
+    "source_trust_trend": ("GET", "/api/analytics/trends/sources/{source_id}/trust"),
+    "perform_check": ("POST", "/api/perform_check"),
+}
+# Not run unless named in --only: they write data
+WRITE_SCENARIOS = {"perform_check"}
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class Fixtures:
+    """IDs discovered from the API so parameterised routes hit real rows"""
+
+    def __init__(self, base_url, email=None, password=None):
+        self.article_ids = [a["ArticleID"] for a in _get_json(base_url, "/api/articles?limit=500&fields=ArticleID")["items"]]
+        self.source_ids = [s["SourceID"] for s in _get_json(base_url, "/api/sources")]
+        # Write scenarios are authorized by the session, not a body field
+        self.token = None
+        if email:
+            login = _get_json(base_url, "/api/auth/login", {"email": email, "password": password})
+            if not login or "token" not in login:
+                raise SystemExit(f"❌ Login as {email} failed: {login}")
+            self.token = login["token"]
+
+
+def _get_json(base_url, path, body=None):
+    parts = urlsplit(base_url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+    try:
+        if body is None:
+            conn.request("GET", path)
+        else:
+            conn.request("POST", path, body=json.dumps(body), headers={"Content-Type": "application/json"})
+        response = conn.getresponse()
+        return json.loads(response.read() or b"null")
+    finally:
+        conn.close()
+
+
+def _path(template, fixtures, rng):
+    if "{article_id}" in template:
+        template = template.replace("{article_id}", str(rng.choice(fixtures.article_ids)))
+    if "{source_id}" in template:
+        template = template.replace("{source_id}", str(rng.choice(fixtures.source_ids)))
+    return template
+
+
+def _body(name, fixtures, rng):
+    if name == "perform_check":
+        return json.dumps({
+            "article_id": rng.choice(fixtures.article_ids),
+            "factcheck_score": round(rng.random(), 2),
+            "final_verdict": rng.choice(("Real", "Fake", "Unverified")),
+        })
+    return None
+
+
+def run_scenario(base_url, name, fixtures, concurrency, duration, warmup):
+    method, template = SCENARIOS[name]
+    parts = urlsplit(base_url)
+    latencies = []
+    statuses = {}
+    errors = []
+    lock = threading.Lock()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+
+    def worker(seed):
+        rng = random.Random(seed)
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        local_lat, local_status = [], {}
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= stop_at:
+                    break
+                body = _body(name, fixtures, rng)
+                headers = {"Content-Type": "application/json"} if body else {}
+                if fixtures.token:
+                    headers["Authorization"] = f"Bearer {fixtures.token}"
+                started = time.perf_counter()
+                try:
+                    conn.request(method, _path(template, fixtures, rng), body=body, headers=headers)
+                    response = conn.getresponse()
+                    response.read()
+                    status = response.status
+                except Exception as e:
+                    conn.close()
+                    conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+                    with lock:
+                        errors.append(str(e))
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if now >= start_at:  # discard warm-up samples
+                    local_lat.append(elapsed_ms)
+                    local_status[status] = local_status.get(status, 0) + 1
+        finally:
+            conn.close()
+        with lock:
+            latencies.extend(local_lat)
+            for status, count in local_status.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    ok = sum(count for status, count in statuses.items() if 200 <= status < 400)
+    return {
+        "method": method,
+        "path": template,
+        "requests": len(latencies),
+        "ok": ok,
+        "non_2xx": len(latencies) - ok,
+        "errors": len(errors),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "throughput_rps": round(len(latencies) / duration, 1),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "p50": round(percentile(latencies, 50), 2) if latencies else None,
+            "p95": round(percentile(latencies, 95), 2) if latencies else None,
+            "p99": round(percentile(latencies, 99), 2) if latencies else None,
+            "max": round(latencies[-1], 2) if latencies else None,
+        },
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+def compare(current, baseline):
+    """Print throughput / p99 change per scenario against a previous run"""
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('started_at')}):")
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or not before["throughput_rps"] or not before["latency_ms"]["p99"] or not result["requests"]:
+            continue
+        rps = (result["throughput_rps"] - before["throughput_rps"]) / before["throughput_rps"] * 100
+        p99 = (result["latency_ms"]["p99"] - before["latency_ms"]["p99"]) / before["latency_ms"]["p99"] * 100
+        marker = "⚠️ " if rps < -10 or p99 > 10 else "  "
+        print(f"{marker}{name:30s} rps {rps:+6.1f}%   p99 {p99:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the News Integrity API")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--only", default="", help="comma separated scenario names (default: all read routes)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="previous JSON report to compare against")
+    parser.add_argument("--email", help="fact-checker or admin to sign in as (needed by perform_check)")
+    parser.add_argument("--password", default="bench-password")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or [n for n in SCENARIOS if n not in WRITE_SCENARIOS]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+
+    if "perform_check" in names and not args.email:
+        parser.error("perform_check needs --email of a fact-checker or admin")
+
+    fixtures = Fixtures(args.url, args.email, args.password)
+    report = {
+        "commit": _git_commit(),
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "url": args.url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "dataset": {"articles_sampled": len(fixtures.article_ids), "sources": len(fixtures.source_ids)},
+        "scenarios": {},
+    }
+    for name in names:
+        result = run_scenario(args.url, name, fixtures, args.concurrency, args.duration, args.warmup)
+        report["scenarios"][name] = result
+        lat = result["latency_ms"]
+        print(
+            f"✅ {name:30s} {result['throughput_rps']:8.1f} req/s  "
+            f"p50 {lat['p50']} ms  p95 {lat['p95']} ms  p99 {lat['p99']} ms  "
+            f"non-2xx {result['non_2xx']}  errors {result['errors']}"
+        )
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+        print(f"📄 Report written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Cross-process fan-out through MySQL
+Each server process (gunicorn worker, uvicorn) keeps its own SSE buffer,
+response cache and schema snapshot. Publishers append rows to event_log; a
+poller thread in every process reads the new rows every
+BROADCAST_POLL_SECONDS and hands them to the subscribers of their channel:
+  event       events.py - SSE events, same ids in every process
+  invalidate  response_cache.py - cache tags invalidated by a write
+  schema      schema refresh requested through one worker
+
+Ids come from the one-row event_log_seq counter, bumped in the same short
+transaction as the insert. Its row lock makes publishers commit in id
+order, so once id n is visible every smaller id is too and the poller can
+simply read past its cursor without missing a late commit. Rows older than
+BROADCAST_RETENTION seconds are trimmed by the pollers.
+
+Until migrate_add_event_log.py has run, available() is False and callers
+stay process-local.
+"""
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+
+from db_config import db_connection
+from schema_registry import schema
+
+BROADCAST_POLL_SECONDS = float(os.environ.get("BROADCAST_POLL_SECONDS", "0.5"))
+BROADCAST_RETENTION = int(os.environ.get("BROADCAST_RETENTION", "3600"))
+BROADCAST_BATCH = 500
+TRIM_EVERY = 60
+
+EVENT_LOG_SQL = """
+    CREATE TABLE IF NOT EXISTS event_log (
+        EventID BIGINT UNSIGNED PRIMARY KEY,
+        Channel VARCHAR(16) NOT NULL,
+        Kind VARCHAR(64) NOT NULL,
+        Payload TEXT NOT NULL,
+        Origin CHAR(32) NOT NULL,
+        PublishedAt DOUBLE NOT NULL,
+        INDEX idx_event_log_published (PublishedAt)
+    )
+"""
+
+EVENT_LOG_SEQ_SQL = """
+    CREATE TABLE IF NOT EXISTS event_log_seq (
+        ID TINYINT PRIMARY KEY,
+        LastID BIGINT UNSIGNED NOT NULL
+    )
+"""
+
+
+class Broadcaster:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # channel -> [callback]
+        self._replay = {}       # channel -> rows replayed when a poller starts
+        self._pid = None
+        self._origin = None
+        self._cursor = None
+        self._wake = threading.Event()
+        self._trimmed_at = 0.0
+
+    def available(self):
+        try:
+            return schema.has_table("event_log")
+        except Exception:
+            return False
+
+    def subscribe(self, channel, callback, replay=0):
+        """
+        callback(event_id, kind, data, published_at, own) for every row on
+        `channel`, in id order; own is True for rows this process published.
+        `replay` newest existing rows are delivered when the poller starts.
+        """
+        with self._lock:
+            self._subscribers.setdefault(channel, []).append(callback)
+            self._replay[channel] = max(self._replay.get(channel, 0), replay)
+
+    def start(self):
+        """Start this process's poller; cheap to call on every request"""
+        # Threads do not survive fork; start one per worker process
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._origin = uuid.uuid4().hex
+            self._cursor = None
+            self._wake = threading.Event()
+            threading.Thread(target=self._poll_loop, name="broadcast-poll", daemon=True).start()
+
+    def publish(self, channel, entries):
+        """
+        Append (kind, data) entries in one transaction and return their ids,
+        or None when event_log is not migrated. Call after the write commits.
+        """
+        if not entries or not self.available():
+            return None
+        self.start()
+        published_at = time.time()
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "UPDATE event_log_seq SET LastID = LAST_INSERT_ID(LastID + %s) WHERE ID = 1",
+                (len(entries),),
+            )
+            cursor.execute("SELECT LAST_INSERT_ID()")
+            last_id = int(cursor.fetchone()[0])
+            ids = list(range(last_id - len(entries) + 1, last_id + 1))
+            cursor.executemany(
+                "INSERT INTO event_log (EventID, Channel, Kind, Payload, Origin, PublishedAt) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [
+                    (event_id, channel, kind, json.dumps(data, default=str), self._origin, published_at)
+                    for event_id, (kind, data) in zip(ids, entries)
+                ],
+            )
+            conn.commit()
+            cursor.close()
+        # Deliver to this process now rather than at the next tick
+        self._wake.set()
+        return ids
+
+    def _poll_loop(self):
+        wake = self._wake
+        while True:
+            wake.wait(BROADCAST_POLL_SECONDS)
+            wake.clear()
+            if not self.available():
+                continue
+            try:
+                self._poll()
+            except Exception:
+                traceback.print_exc()
+                time.sleep(BROADCAST_POLL_SECONDS)
+
+    def _poll(self):
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            if self._cursor is None:
+                self._cursor = self._start_cursor(cursor)
+            while True:
+                cursor.execute("""
+                    SELECT EventID, Channel, Kind, Payload, Origin, PublishedAt
+                    FROM event_log WHERE EventID > %s
+                    ORDER BY EventID LIMIT %s
+                """, (self._cursor, BROADCAST_BATCH))
+                rows = cursor.fetchall()
+                self._deliver(rows)
+                if rows:
+                    self._cursor = rows[-1][0]
+                if len(rows) < BROADCAST_BATCH:
+                    break
+            if time.monotonic() - self._trimmed_at > TRIM_EVERY:
+                self._trimmed_at = time.monotonic()
+                cursor.execute(
+                    "DELETE FROM event_log WHERE PublishedAt < %s LIMIT 10000",
+                    (time.time() - BROADCAST_RETENTION,),
+                )
+            # Ends the read snapshot so the next poll sees new commits
+            conn.commit()
+            cursor.close()
+
+    def _start_cursor(self, cursor):
+        """Newest id at startup, after replaying recent rows to subscribers that asked"""
+        cursor.execute("SELECT COALESCE(MAX(EventID), 0) FROM event_log")
+        start = int(cursor.fetchone()[0])
+        for channel, count in list(self._replay.items()):
+            if not count:
+                continue
+            cursor.execute("""
+                SELECT EventID, Channel, Kind, Payload, Origin, PublishedAt
+                FROM event_log WHERE Channel = %s AND EventID <= %s
+                ORDER BY EventID DESC LIMIT %s
+            """, (channel, start, count))
+            self._deliver(reversed(cursor.fetchall()))
+        return start
+
+    def _deliver(self, rows):
+        for event_id, channel, kind, payload, origin, published_at in rows:
+            for callback in self._subscribers.get(channel, ()):
+                try:
+                    callback(int(event_id), kind, json.loads(payload), float(published_at), origin == self._origin)
+                except Exception:
+                    traceback.print_exc()
+
+    def stats(self):
+        return {
+            "available": self.available(),
+            "running": self._pid == os.getpid(),
+            "cursor": self._cursor,
+            "poll_seconds": BROADCAST_POLL_SECONDS,
+        }
+
+
+broadcaster = Broadcaster()
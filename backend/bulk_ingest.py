@@ -0,0 +1,370 @@
+"""
+Bulk ingestion for articles and credibility checks
+Validates a batch of rows and inserts them inside one transaction: checks
+with multi-row executemany() statements, articles one row at a time so
+each row's own outcome (new id, or duplicate URL) is what gets reported.
+Each batch runs under a savepoint so a bad batch is reported as errors
+without discarding the batches that succeeded.
+"""
+
+import json
+import os
+import time
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+from mysql.connector import errorcode
+from mysql.connector.errors import IntegrityError
+
+from near_duplicates import index_and_match
+from table_versions import bump_versions
+
+BULK_BATCH_SIZE = int(os.environ.get("BULK_BATCH_SIZE", "500"))
+BULK_MAX_BATCH_SIZE = 5000
+BULK_MAX_ROWS = int(os.environ.get("BULK_MAX_ROWS", "50000"))
+
+ARTICLE_INSERT_SQL = """
+    INSERT INTO article (Title, Content, URL, SourceID, PublishDate)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+CHECK_INSERT_SQL = """
+    INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy)
+    VALUES (%s, %s, %s, %s)
+"""
+
+SOURCE_STATS_UPSERT_SQL = """
+    INSERT INTO source_credibility_stats (SourceID, ScoreSum, CheckCount)
+    VALUES (%s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        ScoreSum = ScoreSum + VALUES(ScoreSum),
+        CheckCount = CheckCount + VALUES(CheckCount)
+"""
+
+VERDICTS = ("Real", "Fake", "Unverified")
+
+
+class BulkPayloadError(ValueError):
+    """The request body could not be parsed into a list of rows"""
+
+
+def parse_payload(req, key="articles"):
+    """Read a JSON array (or {key: [...]}) or an NDJSON body into a list of dicts"""
+    if req.mimetype in ("application/x-ndjson", "application/ndjson"):
+        rows = []
+        for line_no, line in enumerate(req.get_data(as_text=True).splitlines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                raise BulkPayloadError(f"Invalid JSON on line {line_no}")
+    else:
+        body = req.get_json(silent=True)
+        if isinstance(body, dict):
+            body = body.get(key)
+        if not isinstance(body, list):
+            raise BulkPayloadError(f"Body must be a JSON array of {key} or NDJSON")
+        rows = body
+
+    if not rows:
+        raise BulkPayloadError("No rows supplied")
+    if len(rows) > BULK_MAX_ROWS:
+        raise BulkPayloadError(f"Too many rows ({len(rows)}); limit is {BULK_MAX_ROWS}")
+    return rows
+
+
+def validate_article(row):
+    """Return (values tuple, None) for a valid row or (None, error message)"""
+    if not isinstance(row, dict):
+        return None, "Row must be a JSON object"
+    missing = [k for k in ("title", "content", "url", "source_id", "publish_date") if row.get(k) in (None, "")]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+
+    title = str(row["title"]).strip()
+    url = str(row["url"]).strip()
+    if len(title) > 300:
+        return None, "title longer than 300 characters"
+    if len(url) > 500:
+        return None, "url longer than 500 characters"
+    try:
+        source_id = int(row["source_id"])
+    except (TypeError, ValueError):
+        return None, "source_id must be an integer"
+    try:
+        publish_date = date.fromisoformat(str(row["publish_date"])[:10])
+    except ValueError:
+        return None, "publish_date must be YYYY-MM-DD"
+
+    return (title, str(row["content"]), url, source_id, publish_date), None
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _lookup_urls(cursor, urls):
+    found = {}
+    for chunk in _chunks(urls, 1000):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"SELECT URL, ArticleID FROM article WHERE URL IN ({placeholders})", tuple(chunk))
+        found.update({url: article_id for url, article_id in cursor.fetchall()})
+    return found
+
+
+def _insert_article(cursor, values):
+    """
+    Insert one article; (article_id, True) if it was inserted, or
+    (existing article_id or None, False) if its URL is already stored -
+    e.g. by a concurrent writer, or as a collation variant of this URL.
+    Only the failed statement is rolled back, not the transaction.
+    """
+    try:
+        cursor.execute(ARTICLE_INSERT_SQL, values)
+    except IntegrityError as e:
+        if e.errno != errorcode.ER_DUP_ENTRY:
+            raise
+        cursor.execute("SELECT ArticleID FROM article WHERE URL = %s", (values[2],))
+        row = cursor.fetchone()
+        return (row[0] if row else None), False
+    return cursor.lastrowid, True
+
+
+def ingest_articles(conn, rows, batch_size=None, near_duplicates=False):
+    """
+    Insert `rows` (list of dicts) and return (results, stats).
+    results[i] describes rows[i]: status is inserted / duplicate / error.
+    With near_duplicates, inserted rows are added to the MinHash index in
+    the same transaction and carry their likely duplicates.
+    """
+    started = time.perf_counter()
+    batch_size = max(1, min(batch_size or BULK_BATCH_SIZE, BULK_MAX_BATCH_SIZE))
+    results = [None] * len(rows)
+
+    # 1. Validate every row and collapse repeated URLs within the payload
+    pending = []       # (index, values)
+    first_by_url = {}  # url -> index of first occurrence
+    for i, row in enumerate(rows):
+        values, error = validate_article(row)
+        if error:
+            results[i] = {"index": i, "status": "error", "error": error}
+            continue
+        url = values[2]
+        if url in first_by_url:
+            results[i] = {"index": i, "status": "duplicate", "duplicate_of_index": first_by_url[url]}
+            continue
+        first_by_url[url] = i
+        pending.append((i, values))
+
+    cursor = conn.cursor()
+    batches = 0
+    try:
+        # 2. Reject unknown sources up front so they can't fail a whole batch
+        source_ids = sorted({values[3] for _, values in pending})
+        known_sources = set()
+        for chunk in _chunks(source_ids, 1000):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"SELECT SourceID FROM source WHERE SourceID IN ({placeholders})", tuple(chunk))
+            known_sources.update(r[0] for r in cursor.fetchall())
+
+        # 3. Dedupe against URLs already stored
+        existing = _lookup_urls(cursor, [values[2] for _, values in pending])
+
+        to_insert = []
+        for i, values in pending:
+            if values[3] not in known_sources:
+                results[i] = {"index": i, "status": "error", "error": f"Unknown source_id {values[3]}"}
+            elif values[2] in existing:
+                results[i] = {"index": i, "status": "duplicate", "article_id": existing[values[2]]}
+            else:
+                to_insert.append((i, values))
+
+        # 4. Row-by-row inserts, one savepoint per batch; step 3 is only a
+        # fast path, the insert itself decides inserted vs duplicate
+        for batch in _chunks(to_insert, batch_size):
+            batches += 1
+            cursor.execute("SAVEPOINT bulk_batch")
+            try:
+                outcomes = [_insert_article(cursor, values) for _, values in batch]
+                cursor.execute("RELEASE SAVEPOINT bulk_batch")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+                for i, _ in batch:
+                    results[i] = {"index": i, "status": "error", "error": str(e)}
+                continue
+            for (i, _), (article_id, inserted) in zip(batch, outcomes):
+                status = "inserted" if inserted and article_id else "duplicate"
+                results[i] = {"index": i, "status": status, "article_id": article_id}
+
+        # 5. Index the new rows and match them against everything indexed
+        if near_duplicates:
+            content_by_id = {results[i]["article_id"]: values[1] for i, values in to_insert
+                             if results[i]["status"] == "inserted"}
+            matches = index_and_match(cursor, list(content_by_id.items()))
+            for result in results:
+                if result["status"] == "inserted" and result["article_id"] in matches:
+                    result["near_duplicates"] = matches[result["article_id"]]
+
+        conn.commit()
+    finally:
+        cursor.close()
+    # Once for the whole ingest, after commit, not once per row
+    bump_versions(conn, "article")
+
+    # In-payload duplicates point at whatever their first occurrence became
+    for result in results:
+        if "duplicate_of_index" in result:
+            result["article_id"] = results[result["duplicate_of_index"]].get("article_id")
+
+    elapsed = time.perf_counter() - started
+    inserted = sum(1 for r in results if r["status"] == "inserted")
+    stats = {
+        "received": len(rows),
+        "inserted": inserted,
+        "duplicates": sum(1 for r in results if r["status"] == "duplicate"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+        "near_duplicates": sum(1 for r in results if r.get("near_duplicates")),
+        "batches": batches,
+        "batch_size": batch_size,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "rows_per_sec": round(len(rows) / elapsed, 1) if elapsed > 0 else None,
+    }
+    return results, stats
+
+
+def validate_check(row):
+    """
+    Return (article_id, score, verdict) for a valid check row or (None, error message).
+    The score is rounded to 2 places as a Decimal, exactly as DECIMAL(3,2)
+    stores it, so the inserted value and the source stats delta agree.
+    """
+    if not isinstance(row, dict):
+        return None, "Row must be a JSON object"
+    missing = [k for k in ("article_id", "factcheck_score", "final_verdict") if row.get(k) in (None, "")]
+    if missing:
+        return None, f"Missing required fields: {', '.join(missing)}"
+    try:
+        article_id = int(row["article_id"])
+        fact_score = float(row["factcheck_score"])
+    except (TypeError, ValueError):
+        return None, "Invalid numeric values"
+    if not (0.0 <= fact_score <= 1.0):
+        return None, "Fact-check score must be between 0 and 1"
+    fact_score = Decimal(str(fact_score)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    verdict = str(row["final_verdict"])
+    if verdict not in VERDICTS:
+        return None, "Invalid final_verdict"
+    return (article_id, fact_score, verdict), None
+
+
+def ingest_checks(conn, rows, checked_by, grouped_trust=True, batch_size=None):
+    """
+    Insert credibility checks submitted by one (already authorized) checker
+    and return (results, stats).
+
+    With grouped_trust the per-row trust trigger is suppressed through
+    @skip_source_trust_trigger and source_credibility_stats / TrustRating
+    are updated once per affected source at the end. Only pass it when the
+    installed trigger honours that variable, otherwise checks are counted twice.
+    """
+    started = time.perf_counter()
+    batch_size = max(1, min(batch_size or BULK_BATCH_SIZE, BULK_MAX_BATCH_SIZE))
+    results = [None] * len(rows)
+
+    pending = []
+    for i, row in enumerate(rows):
+        values, error = validate_check(row)
+        if error:
+            results[i] = {"index": i, "status": "error", "error": error}
+        else:
+            pending.append((i, values))
+
+    cursor = conn.cursor()
+    batches = 0
+    deltas = {}  # SourceID -> [score sum, check count]
+    trust_ratings = {}
+    try:
+        # Map every referenced article to its source in a few IN() lookups
+        article_ids = sorted({values[0] for _, values in pending})
+        source_of = {}
+        for chunk in _chunks(article_ids, 1000):
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(f"SELECT ArticleID, SourceID FROM article WHERE ArticleID IN ({placeholders})", tuple(chunk))
+            source_of.update(dict(cursor.fetchall()))
+
+        to_insert = []
+        for i, values in pending:
+            if values[0] not in source_of:
+                results[i] = {"index": i, "status": "error", "error": f"Unknown article_id {values[0]}"}
+            else:
+                to_insert.append((i, values))
+
+        if grouped_trust:
+            cursor.execute("SET @skip_source_trust_trigger = 1")
+
+        for batch in _chunks(to_insert, batch_size):
+            batches += 1
+            cursor.execute("SAVEPOINT bulk_batch")
+            try:
+                cursor.executemany(
+                    CHECK_INSERT_SQL,
+                    [(article_id, score, verdict, checked_by) for _, (article_id, score, verdict) in batch],
+                )
+                cursor.execute("RELEASE SAVEPOINT bulk_batch")
+            except Exception as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT bulk_batch")
+                for i, _ in batch:
+                    results[i] = {"index": i, "status": "error", "error": str(e)}
+                continue
+            for i, (article_id, score, verdict) in batch:
+                results[i] = {"index": i, "status": "inserted", "article_id": article_id, "factcheck_score": float(score)}
+                delta = deltas.setdefault(source_of[article_id], [Decimal("0"), 0])
+                delta[0] += score
+                delta[1] += 1
+
+        if deltas:
+            source_ids = sorted(deltas)
+            placeholders = ", ".join(["%s"] * len(source_ids))
+            if grouped_trust:
+                # One aggregate upsert and one TrustRating update per source
+                cursor.executemany(
+                    SOURCE_STATS_UPSERT_SQL,
+                    [(source_id, deltas[source_id][0], deltas[source_id][1]) for source_id in source_ids],
+                )
+                cursor.execute(f"""
+                    UPDATE source s
+                    JOIN source_credibility_stats st ON st.SourceID = s.SourceID
+                    SET s.TrustRating = ROUND(st.ScoreSum / st.CheckCount * 100, 2)
+                    WHERE s.SourceID IN ({placeholders}) AND st.CheckCount > 0
+                """, tuple(source_ids))
+            cursor.execute(f"SELECT SourceID, TrustRating FROM source WHERE SourceID IN ({placeholders})", tuple(source_ids))
+            trust_ratings = {source_id: float(rating) for source_id, rating in cursor.fetchall()}
+
+        conn.commit()
+    finally:
+        if grouped_trust:
+            # Session variables outlive the request on a pooled connection
+            try:
+                cursor.execute("SET @skip_source_trust_trigger = NULL")
+            except Exception:
+                pass
+        cursor.close()
+    if deltas:
+        bump_versions(conn, "credibilitycheck", "source")
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "received": len(rows),
+        "inserted": sum(1 for r in results if r["status"] == "inserted"),
+        "errors": sum(1 for r in results if r["status"] == "error"),
+        "batches": batches,
+        "batch_size": batch_size,
+        "sources_updated": len(deltas),
+        "trust_ratings": trust_ratings,
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "rows_per_sec": round(len(rows) / elapsed, 1) if elapsed > 0 else None,
+    }
+    return results, stats
@@ -1,10 +1,382 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
 
 # Database connection configuration
+DB_CONFIG = {
+    "host": os.environ.get("DB_HOST", "localhost"),
+    "user": os.environ.get("DB_USER", "root"),
+    "password": os.environ.get("DB_PASSWORD", "mysql1729"),  # change this
+    "database": os.environ.get("DB_NAME", "fakenewsdb"),
+}
+
+# Connection pool configuration
+# POOL_SIZE      - connections kept open and reused between requests
+# POOL_OVERFLOW  - extra connections allowed under load (closed when returned)
+# POOL_TIMEOUT   - seconds to wait for a free connection before giving up
+# POOL_RECYCLE   - seconds a connection may sit idle before it is reopened
+# POOL_PRE_PING  - ping a connection on checkout and replace it if dead
+POOL_CONFIG = {
+    "size": int(os.environ.get("DB_POOL_SIZE", "10")),
+    "overflow": int(os.environ.get("DB_POOL_OVERFLOW", "10")),
+    "timeout": float(os.environ.get("DB_POOL_TIMEOUT", "30")),
+    "recycle": float(os.environ.get("DB_POOL_RECYCLE", "1800")),
+    "pre_ping": os.environ.get("DB_POOL_PRE_PING", "1") not in ("0", "false", "False"),
+}
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes free within POOL_TIMEOUT seconds"""
+
+
+# Callables fn(statement, params, seconds, error) notified after every
+# statement run through a pooled connection's cursor, or through the
+# aiomysql pool in async_db.py (see metrics.py)
+_query_observers = []
+
+
+def add_query_observer(fn):
+    if fn not in _query_observers:
+        _query_observers.append(fn)
+
+
+def notify_query_observers(statement, params, seconds, error):
+    for fn in _query_observers:
+        try:
+            fn(statement, params, seconds, error)
+        except Exception:
+            # Instrumentation must never break the query path
+            pass
+
+
+class TimedCursor:
+    """Cursor proxy that times execute / executemany / callproc"""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._raw.close()
+
+    def _timed(self, statement, params, call):
+        started = time.perf_counter()
+        error = None
+        try:
+            return call()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            notify_query_observers(statement, params, time.perf_counter() - started, error)
+
+    def execute(self, operation, params=(), *args, **kwargs):
+        return self._timed(operation, params, lambda: self._raw.execute(operation, params, *args, **kwargs))
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        return self._timed(operation, None, lambda: self._raw.executemany(operation, seq_params, *args, **kwargs))
+
+    def callproc(self, procname, args=()):
+        return self._timed(f"CALL {procname}", args, lambda: self._raw.callproc(procname, args))
+
+
+class PooledConnection:
+    """
+    Wrapper around a mysql.connector connection borrowed from the pool.
+    Behaves like the raw connection, but close() hands it back to the pool
+    instead of tearing down the TCP session.
+    """
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._last_used = time.monotonic()
+        self._checked_out = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def cursor(self, *args, **kwargs):
+        raw = self._raw.cursor(*args, **kwargs)
+        # Only pay for the proxy when something is listening
+        return TimedCursor(raw) if _query_observers else raw
+
+    def close(self):
+        if self._checked_out:
+            self._pool.release(self)
+
+    def discard(self):
+        """
+        Close the connection instead of returning it, e.g. part-way through an
+        unbuffered result: release() would first read every remaining row
+        """
+        if self._checked_out:
+            self._pool.discard(self)
+
+    def _really_close(self):
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Thread-safe MySQL connection pool with overflow, pre-ping and idle recycling"""
+
+    def __init__(self, db_config, size=10, overflow=10, timeout=30.0, recycle=1800.0, pre_ping=True):
+        self.db_config = dict(db_config)
+        self.size = size
+        self.overflow = overflow
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._open = 0
+
+        self._stats = {
+            "checkouts": 0,
+            "hits": 0,
+            "misses": 0,
+            "waits": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "timeouts": 0,
+            "recycled": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+        }
+
+    # -----------------------
+    # Internal helpers
+    # -----------------------
+    def _bump(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _connect(self):
+        raw = mysql.connector.connect(**self.db_config)
+        return PooledConnection(self, raw, time.monotonic())
+
+    def _reserve_slot(self):
+        with self._lock:
+            if self._open < self.size + self.overflow:
+                self._open += 1
+                return True
+            return False
+
+    def _drop(self, conn):
+        conn._really_close()
+        with self._lock:
+            self._open -= 1
+
+    def _is_usable(self, conn):
+        if self.recycle and time.monotonic() - conn._last_used > self.recycle:
+            self._bump("recycled")
+            return False
+        if self.pre_ping:
+            try:
+                if not conn._raw.is_connected():
+                    self._bump("ping_failures")
+                    return False
+            except Exception:
+                self._bump("ping_failures")
+                return False
+        return True
+
+    def _take_idle(self, block, timeout=None):
+        """Pop an idle connection, discarding any that fail the health check"""
+        try:
+            conn = self._idle.get(block=block, timeout=timeout)
+        except queue.Empty:
+            return None
+        if self._is_usable(conn):
+            return conn
+        # Dropping it frees a slot, so the caller can open a fresh connection
+        self._drop(conn)
+        return None
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def acquire(self):
+        self._bump("checkouts")
+
+        conn = self._take_idle(block=False)
+        if conn is not None:
+            self._bump("hits")
+        else:
+            self._bump("misses")
+            if self._reserve_slot():
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                    raise
+            else:
+                # Pool and overflow exhausted - wait for someone to give one back
+                self._bump("waits")
+                started = time.monotonic()
+                deadline = started + self.timeout
+                while conn is None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._bump("timeouts")
+                        raise PoolTimeout(
+                            f"No database connection available within {self.timeout}s "
+                            f"(size={self.size}, overflow={self.overflow})"
+                        )
+                    conn = self._take_idle(block=True, timeout=remaining)
+                    if conn is None and self._reserve_slot():
+                        try:
+                            conn = self._connect()
+                        except Exception:
+                            with self._lock:
+                                self._open -= 1
+                            raise
+                waited = time.monotonic() - started
+                with self._lock:
+                    self._stats["wait_time_total"] += waited
+                    self._stats["wait_time_max"] = max(self._stats["wait_time_max"], waited)
+
+        conn._checked_out = True
+        return conn
+
+    def release(self, conn):
+        conn._checked_out = False
+        conn._last_used = time.monotonic()
+        try:
+            # Never hand the next borrower a half-finished transaction
+            if conn._raw.in_transaction:
+                conn._raw.rollback()
+        except Exception:
+            self._bump("discarded")
+            self._drop(conn)
+            return
+
+        with self._lock:
+            keep = self._idle.qsize() < self.size
+        if keep:
+            self._idle.put(conn)
+        else:
+            self._drop(conn)
+
+    def discard(self, conn):
+        conn._checked_out = False
+        self._bump("discarded")
+        try:
+            # shutdown() drops the socket without reading pending results
+            shutdown = getattr(conn._raw, "shutdown", None)
+            (shutdown or conn._raw.close)()
+        except Exception:
+            pass
+        with self._lock:
+            self._open -= 1
+
+    def dispose(self):
+        """Close every idle connection (checked-out ones close when returned)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._drop(conn)
+
+    def stats(self):
+        with self._lock:
+            open_count = self._open
+            counters = dict(self._stats)
+        checkouts = counters["checkouts"]
+        return {
+            **counters,
+            "size": self.size,
+            "overflow": self.overflow,
+            "open": open_count,
+            "idle": self._idle.qsize(),
+            "in_use": open_count - self._idle.qsize(),
+            "hit_rate": round(counters["hits"] / checkouts, 4) if checkouts else 0.0,
+            "wait_time_avg": (
+                round(counters["wait_time_total"] / counters["waits"], 6)
+                if counters["waits"] else 0.0
+            ),
+        }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide pool, creating it on first use"""
+    global _pool, _pool_pid
+    # A pool inherited through fork() shares its sockets with the parent,
+    # so a forked worker always builds its own
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(DB_CONFIG, **POOL_CONFIG)
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def dispose_pool():
+    """Close this process's idle connections (e.g. in a server master before forking)"""
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.dispose()
+
+
+def reset_pool():
+    """
+    Forget an inherited pool without closing its connections - closing them
+    from a forked child would tear down sockets the parent may still use.
+    """
+    global _pool, _pool_pid, _pool_lock
+    # The lock may have been held by another thread at fork time
+    _pool_lock = threading.Lock()
+    _pool = None
+    _pool_pid = None
+
+
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="mysql1729",  # change this
-        database="fakenewsdb"
-    )
+    """Borrow a connection from the pool; conn.close() returns it"""
+    return get_pool().acquire()
+
+
+@contextmanager
+def db_connection():
+    """
+    Borrow a pooled connection for the duration of a with-block.
+    Uncommitted work is rolled back and the connection is returned
+    to the pool on exit, even if the block raises.
+    """
+    conn = get_connection()
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        conn.close()
+
+
+def pool_stats():
+    return get_pool().stats()
@@ -0,0 +1,244 @@
+"""
+Event bus and Server-Sent Events stream
+Write routes publish small delta events (new reports, verdicts, articles
+flagged 'Under Review', TrustRating changes). /api/events streams them to
+clients, which resume after a reconnect with the Last-Event-ID header.
+Each process streams from a bounded ring buffer. Once event_log exists,
+events go through it (broadcast.py): every worker buffers the same events
+under the same ids, so a client may reconnect to any of them. Before that
+the buffer holds this process's events only.
+Ids are "<epoch>-<n>": "log" for event_log ids, else a random epoch per
+process, so an id from before a restart or from another worker is
+recognised and answered with a reset.
+stream() blocks a thread per client (Flask / WSGI); astream() is the
+asyncio variant used by asgi.py, which holds no thread while idle.
+"""
+
+import asyncio
+import json
+import os
+import secrets
+import threading
+import time
+import traceback
+from collections import deque
+
+from broadcast import broadcaster
+
+EVENT_HISTORY = int(os.environ.get("EVENT_HISTORY", "1000"))
+EVENT_HEARTBEAT = float(os.environ.get("EVENT_HEARTBEAT", "15"))
+SHARED_EPOCH = "log"
+
+
+class EventBus:
+    def __init__(self, history=EVENT_HISTORY):
+        self._events = deque(maxlen=history)  # (id, type, data, timestamp)
+        self._cond = threading.Condition()
+        self._last_id = 0
+        self._evicted = 0  # newest id no longer buffered
+        self._local_epoch = secrets.token_hex(4)
+        self._epoch = self._local_epoch
+        self._async_waiters = set()  # (event loop, asyncio.Event)
+
+    def _after_fork(self):
+        # A forked worker (gunicorn preload) numbers its own events; a fresh
+        # epoch keeps ids handed out by the parent or a sibling from matching.
+        # Shared events are replayed from event_log by this worker's poller
+        self._events.clear()
+        self._cond = threading.Condition()
+        self._last_id = 0
+        self._evicted = 0  # newest id no longer buffered
+        self._local_epoch = secrets.token_hex(4)
+        self._epoch = self._local_epoch
+        self._async_waiters = set()
+
+    def publish(self, event_type, data):
+        """Publish one event; returns its id (None if event_log refused it)"""
+        ids = self.publish_many([(event_type, data)])
+        return ids[0] if ids else None
+
+    def publish_many(self, entries):
+        """
+        Publish (event type, data) pairs, through event_log in one round trip
+        when it exists. The events reach this process's buffer via the poller.
+        """
+        if broadcaster.available():
+            try:
+                return broadcaster.publish("event", entries)
+            except Exception:
+                # The write itself succeeded; a lost event only costs clients
+                # a refetch, so never fail the request over it
+                traceback.print_exc()
+                return None
+        published_at = time.time()
+        return [self._append(self._local_epoch, None, event_type, data, published_at) for event_type, data in entries]
+
+    def _receive(self, event_id, event_type, data, published_at, own):
+        """broadcast subscriber for the "event" channel"""
+        self._append(SHARED_EPOCH, event_id, event_type, data, published_at)
+
+    def _append(self, epoch, event_id, event_type, data, published_at):
+        with self._cond:
+            if epoch != self._epoch:
+                # Switching between local and event_log ids (event_log was
+                # migrated, or is gone); open streams get a reset
+                self._events.clear()
+                self._epoch = epoch
+                self._last_id = 0
+            if event_id is None:
+                event_id = self._last_id + 1
+            elif event_id <= self._last_id:
+                return event_id  # already buffered
+            if self._last_id == 0:
+                # Anything before the first event (e.g. older than the
+                # replayed event_log rows) is unknown here
+                self._evicted = event_id - 1
+            elif len(self._events) == self._events.maxlen:
+                self._evicted = self._events[0][0]
+            self._last_id = event_id
+            self._events.append((event_id, event_type, data, published_at))
+            self._cond.notify_all()
+            waiters = list(self._async_waiters)
+        # Publishers run on request threads; wake each loop from its own thread
+        for loop, ready in waiters:
+            try:
+                loop.call_soon_threadsafe(ready.set)
+            except RuntimeError:
+                pass  # loop already closed
+        return event_id
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def since(self, last_id):
+        """Buffered events newer than `last_id`"""
+        with self._cond:
+            return [e for e in self._events if e[0] > last_id]
+
+    def resume_point(self, last_id):
+        """
+        Where a client sending `last_id` (from parse_last_event_id) resumes.
+        Returns (cursor, reset reason or None); after a reset the client
+        refetches its state and continues from the newest event.
+        """
+        with self._cond:
+            if last_id is None:
+                return self._last_id, None
+            epoch, seen = last_id
+            if epoch != self._epoch or seen > self._last_id or (not self._events and seen != self._last_id):
+                # Restarted process, another worker's id, or a forged one
+                return self._last_id, "unknown event id"
+            if seen < self._evicted:
+                # event_log ids skip other channels, so compare with the
+                # evicted id rather than the oldest buffered one
+                return self._last_id, "history exhausted"
+            return seen, None
+
+    def wait(self, last_id, timeout):
+        """Block until an event newer than last_id exists or timeout elapses"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._last_id > last_id, timeout=timeout)
+
+    async def wait_async(self, last_id, timeout):
+        """wait() for asyncio: suspends the task, not a thread"""
+        ready = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), ready)
+        with self._cond:
+            if self._last_id > last_id:
+                return
+            self._async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                self._async_waiters.discard(waiter)
+
+    def _opening(self, last_id):
+        """(starting cursor, epoch, opening frames)"""
+        with self._cond:
+            cursor, reason = self.resume_point(last_id)
+            epoch = self._epoch
+        frames = []
+        if reason:
+            # The client missed events we cannot replay - tell it to refetch
+            frames.append(_reset(reason, epoch, cursor))
+        frames.append("retry: 3000\n\n")
+        return cursor, epoch, frames
+
+    def _frames(self, cursor, epoch, types):
+        """(frames for events after cursor, new cursor, epoch, any events)"""
+        with self._cond:
+            if self._epoch != epoch:
+                return [_reset("event ids changed", self._epoch, self._last_id)], self._last_id, self._epoch, True
+            events = self.since(cursor)
+        frames = []
+        for event_id, event_type, data, ts in events:
+            cursor = event_id
+            if types and event_type not in types:
+                continue
+            frames.append(_frame(f"{epoch}-{event_id}", event_type, {**data, "ts": ts}))
+        return frames, cursor, epoch, bool(events)
+
+    def stream(self, last_id=None, types=None):
+        """Generator of SSE frames, starting after last_id (or from now)"""
+        cursor, epoch, opening = self._opening(last_id)
+        yield from opening
+        while True:
+            frames, cursor, epoch, any_events = self._frames(cursor, epoch, types)
+            yield from frames
+            if not any_events:
+                self.wait(cursor, EVENT_HEARTBEAT)
+                if self._last_id <= cursor:
+                    # Comment line keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+
+    async def astream(self, last_id=None, types=None):
+        """Async generator with the same frames as stream()"""
+        cursor, epoch, opening = self._opening(last_id)
+        for frame in opening:
+            yield frame
+        while True:
+            frames, cursor, epoch, any_events = self._frames(cursor, epoch, types)
+            for frame in frames:
+                yield frame
+            if not any_events:
+                await self.wait_async(cursor, EVENT_HEARTBEAT)
+                if self._last_id <= cursor:
+                    yield ": keepalive\n\n"
+
+
+def _frame(event_id, event_type, data):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event_type}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _reset(reason, epoch, cursor):
+    return _frame(None, "reset", {"reason": reason, "last_event_id": f"{epoch}-{cursor}"})
+
+
+def parse_last_event_id(raw):
+    """
+    "<epoch>-<n>" -> (epoch, n); None when absent or malformed. A bare
+    number (ids before epochs were added) keeps epoch None, which never
+    matches, so that client gets a reset.
+    """
+    if raw in (None, ""):
+        return None
+    epoch, _, seen = raw.rpartition("-")
+    try:
+        return (epoch or None), int(seen)
+    except ValueError:
+        return None
+
+
+event_bus = EventBus()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=event_bus._after_fork)
+broadcaster.subscribe("event", event_bus._receive, replay=EVENT_HISTORY)
@@ -0,0 +1,210 @@
+"""
+Request and SQL instrumentation
+- per-route request counts, status codes and latency histograms
+  (recorded by the before/after_request hooks in app.py)
+- per-statement SQL timing, keyed on the normalised query text, via the
+  query observer hook in db_config (TimedCursor)
+- SQL time attributed to the route that issued it
+- pool and response cache counters, read at scrape time
+Exposed by GET /metrics in Prometheus text format, or as JSON.
+"""
+
+import os
+import re
+import threading
+from functools import lru_cache
+
+from flask import g, has_request_context
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") not in ("0", "false", "False")
+# Seconds; Prometheus-style cumulative buckets
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Distinct statements tracked; anything beyond is folded into "other"
+MAX_STATEMENTS = int(os.environ.get("METRICS_MAX_STATEMENTS", "500"))
+
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(statement):
+    """Query shape: literals -> ?, placeholder lists collapsed, whitespace folded"""
+    text = statement.decode("utf-8", "replace") if isinstance(statement, bytes) else str(statement)
+    text = _STRING_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("(...)", text)
+    return _SPACE_RE.sub(" ", text).strip()[:300]
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self):
+        running = 0
+        for bound, n in zip(LATENCY_BUCKETS, self.counts):
+            running += n
+            yield bound, running
+
+    def quantile(self, q):
+        """Upper bucket bound holding the q-th observation (histogram estimate)"""
+        if not self.count:
+            return None
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 2),
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "p50_ms_le": None if not self.count else round(self.quantile(0.5) * 1000, 2),
+            "p95_ms_le": None if not self.count else round(self.quantile(0.95) * 1000, 2),
+            "p99_ms_le": None if not self.count else round(self.quantile(0.99) * 1000, 2),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = {}   # (route, method) -> Histogram
+        self._statuses = {}   # (route, method, status) -> count
+        self._route_sql = {}  # (route, method) -> [seconds, statements]
+        self._sql = {}        # statement shape -> Histogram
+        self._sql_errors = {}
+
+    def observe_request(self, route, method, status, seconds, sql_seconds=0.0, sql_count=0):
+        key = (route, method)
+        with self._lock:
+            self._requests.setdefault(key, Histogram()).observe(seconds)
+            skey = (route, method, status)
+            self._statuses[skey] = self._statuses.get(skey, 0) + 1
+            per = self._route_sql.setdefault(key, [0.0, 0])
+            per[0] += sql_seconds
+            per[1] += sql_count
+
+    def observe_query(self, statement, params, seconds, error):
+        shape = normalize_sql(statement)
+        with self._lock:
+            if shape not in self._sql and len(self._sql) >= MAX_STATEMENTS:
+                shape = "other"
+            self._sql.setdefault(shape, Histogram()).observe(seconds)
+            if error is not None:
+                self._sql_errors[shape] = self._sql_errors.get(shape, 0) + 1
+        if has_request_context():
+            # Attributed to the route in observe_request
+            g._sql_seconds = g.get("_sql_seconds", 0.0) + seconds
+            g._sql_count = g.get("_sql_count", 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            routes = {}
+            for (route, method), hist in self._requests.items():
+                sql_seconds, sql_count = self._route_sql.get((route, method), (0.0, 0))
+                routes[f"{method} {route}"] = {
+                    **hist.summary(),
+                    "statuses": {
+                        str(status): n for (r, m, status), n in self._statuses.items() if (r, m) == (route, method)
+                    },
+                    "sql_total_ms": round(sql_seconds * 1000, 2),
+                    "sql_statements": sql_count,
+                    "sql_share": round(sql_seconds / hist.total, 3) if hist.total else 0.0,
+                }
+            statements = sorted(
+                ({"statement": shape, **hist.summary(), "errors": self._sql_errors.get(shape, 0)}
+                 for shape, hist in self._sql.items()),
+                key=lambda s: s["total_ms"],
+                reverse=True,
+            )
+        return {"routes": routes, "sql": statements}
+
+    def prometheus(self, pool, cache):
+        """Prometheus text exposition (version 0.0.4)"""
+        lines = []
+
+        def metric(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name, items):
+            for labels, hist in items:
+                for bound, running in hist.cumulative():
+                    lines.append(f"{name}_bucket{{{labels},le=\"{bound}\"}} {running}")
+                lines.append(f"{name}_bucket{{{labels},le=\"+Inf\"}} {hist.count}")
+                lines.append(f"{name}_sum{{{labels}}} {hist.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        with self._lock:
+            metric("http_requests_total", "counter", "HTTP requests by route, method and status")
+            for (route, method, status), n in sorted(self._statuses.items()):
+                lines.append(f"http_requests_total{{route=\"{_esc(route)}\",method=\"{method}\",status=\"{status}\"}} {n}")
+
+            metric("http_request_duration_seconds", "histogram", "HTTP request latency by route")
+            histogram("http_request_duration_seconds", (
+                (f"route=\"{_esc(route)}\",method=\"{method}\"", hist)
+                for (route, method), hist in sorted(self._requests.items())
+            ))
+
+            metric("http_request_sql_seconds_total", "counter", "Time spent in SQL while serving a route")
+            for (route, method), (seconds, _) in sorted(self._route_sql.items()):
+                lines.append(f"http_request_sql_seconds_total{{route=\"{_esc(route)}\",method=\"{method}\"}} {seconds:.6f}")
+
+            metric("db_query_duration_seconds", "histogram", "SQL statement latency by normalised statement")
+            histogram("db_query_duration_seconds", (
+                (f"statement=\"{_esc(shape)}\"", hist) for shape, hist in sorted(self._sql.items())
+            ))
+
+            metric("db_query_errors_total", "counter", "Failed SQL statements by normalised statement")
+            for shape, n in sorted(self._sql_errors.items()):
+                lines.append(f"db_query_errors_total{{statement=\"{_esc(shape)}\"}} {n}")
+
+        metric("db_pool_checkouts_total", "counter", "Connection pool checkouts")
+        lines.append(f"db_pool_checkouts_total {pool['checkouts']}")
+        metric("db_pool_waits_total", "counter", "Checkouts that had to wait for a free connection")
+        lines.append(f"db_pool_waits_total {pool['waits']}")
+        metric("db_pool_wait_seconds_total", "counter", "Total time spent waiting for a connection")
+        lines.append(f"db_pool_wait_seconds_total {pool['wait_time_total']:.6f}")
+        metric("db_pool_wait_seconds_max", "gauge", "Longest wait for a connection")
+        lines.append(f"db_pool_wait_seconds_max {pool['wait_time_max']:.6f}")
+        metric("db_pool_timeouts_total", "counter", "Checkouts that timed out")
+        lines.append(f"db_pool_timeouts_total {pool['timeouts']}")
+        metric("db_pool_connections", "gauge", "Pool connections by state")
+        lines.append(f"db_pool_connections{{state=\"idle\"}} {pool['idle']}")
+        lines.append(f"db_pool_connections{{state=\"in_use\"}} {pool['in_use']}")
+
+        metric("response_cache_requests_total", "counter", "Response cache lookups by endpoint and result")
+        for endpoint, per in sorted(cache["endpoints"].items()):
+            for result, key in (("hit", "hits"), ("miss", "misses")):
+                lines.append(f"response_cache_requests_total{{endpoint=\"{_esc(endpoint)}\",result=\"{result}\"}} {per[key]}")
+        metric("response_cache_hit_ratio", "gauge", "Response cache hit ratio")
+        lines.append(f"response_cache_hit_ratio {cache['hit_rate']}")
+        metric("response_cache_entries", "gauge", "Entries currently cached")
+        lines.append(f"response_cache_entries {cache['entries']}")
+        return "\n".join(lines) + "\n"
+
+
+def _esc(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Migration script for the shared event log
+- Creates event_log and its id counter event_log_seq (see broadcast.py)
+Once it exists, SSE events, response-cache invalidations and schema
+refreshes reach every API worker process, so serve.py can run one worker
+per core.
+"""
+
+from broadcast import EVENT_LOG_SEQ_SQL, EVENT_LOG_SQL
+from db_config import db_connection
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            print("Creating event_log...")
+            cursor.execute(EVENT_LOG_SQL)
+            cursor.execute(EVENT_LOG_SEQ_SQL)
+            cursor.execute("INSERT IGNORE INTO event_log_seq (ID, LastID) VALUES (1, 0)")
+            conn.commit()
+            print("✅ event_log ready")
+
+            print("   Restart the API (or: kill -HUP <gunicorn master pid>) so every worker picks it up")
+
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
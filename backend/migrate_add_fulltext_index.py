@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the FULLTEXT index used by /api/articles/search
+- Adds ft_article_title_content on article (Title, Content)
+- Builds it in place (ALGORITHM=INPLACE) so reads keep being served
+- Refreshes the optimizer statistics afterwards
+Run this script if /api/articles/search answers 503
+"""
+
+import time
+
+from db_config import db_connection
+from search import FULLTEXT_INDEX
+
+# InnoDB builds FULLTEXT indexes in place but does not allow concurrent
+# writes while doing so, so LOCK=SHARED is the least restrictive level
+FULLTEXT_INDEX_SQL = f"""
+    ALTER TABLE article
+    ADD FULLTEXT INDEX {FULLTEXT_INDEX} (Title, Content),
+    ALGORITHM=INPLACE, LOCK=SHARED
+"""
+
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SHOW INDEX FROM article WHERE Key_name = %s", (FULLTEXT_INDEX,))
+            if cursor.fetchall():
+                print(f"✅ {FULLTEXT_INDEX} already exists")
+                cursor.close()
+                return
+
+            cursor.execute("SELECT COUNT(*) FROM article")
+            total = cursor.fetchone()[0]
+            print(f"Building {FULLTEXT_INDEX} over {total} articles (reads stay online, writes wait)...")
+            started = time.monotonic()
+            cursor.execute(FULLTEXT_INDEX_SQL)
+            print(f"✅ Index built in {time.monotonic() - started:.1f}s")
+
+            cursor.execute("ANALYZE TABLE article")
+            cursor.fetchall()
+            print("✅ Table statistics refreshed")
+            print("ℹ️  POST /api/admin/schema/refresh (or SIGHUP) so a running server picks it up")
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Migration script for the article_latest_check projection
+- Creates article_latest_check: latest credibility check per article
+  (by CheckDate, then CheckID) with its verdict, score, checker and date
+- Adds latest_check_after_insert / latest_check_after_delete to maintain it
+- Backfills it from credibilitycheck
+- Drops idx_check_article_verdict, which only served the MAX(FinalVerdict)
+  lookup this replaces (kept until idx_check_article_date exists, since the
+  ArticleID foreign key needs one of them)
+GET /api/articles reads CredibilityVerdict from it with a primary key join
+once it exists, instead of looking through the article's checks
+"""
+
+from db_config import db_connection
+
+LATEST_CHECK_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS article_latest_check (
+        ArticleID INT PRIMARY KEY,
+        CheckID INT NOT NULL,
+        FinalVerdict ENUM('Fake','Real','Unverified') DEFAULT 'Unverified',
+        FactCheckScore DECIMAL(3,2) DEFAULT NULL,
+        CheckedBy INT DEFAULT NULL,
+        CheckDate TIMESTAMP NULL,
+        FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+LATEST_CHECK_INSERT_TRIGGER_SQL = """
+    CREATE TRIGGER latest_check_after_insert
+    AFTER INSERT ON credibilitycheck
+    FOR EACH ROW
+    BEGIN
+        -- The newer (CheckDate, CheckID) wins. SET assignments run left to
+        -- right, so CheckID and CheckDate go last and every condition
+        -- still compares against the stored row
+        INSERT INTO article_latest_check
+            (ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate)
+        VALUES
+            (NEW.ArticleID, NEW.CheckID, NEW.FinalVerdict, NEW.FactCheckScore, NEW.CheckedBy, NEW.CheckDate)
+        ON DUPLICATE KEY UPDATE
+            FinalVerdict = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.FinalVerdict, FinalVerdict),
+            FactCheckScore = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.FactCheckScore, FactCheckScore),
+            CheckedBy = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.CheckedBy, CheckedBy),
+            CheckID = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.CheckID, CheckID),
+            CheckDate = IF((CheckDate, CheckID) < (NEW.CheckDate, NEW.CheckID), NEW.CheckDate, CheckDate);
+    END
+"""
+
+LATEST_CHECK_DELETE_TRIGGER_SQL = """
+    CREATE TRIGGER latest_check_after_delete
+    AFTER DELETE ON credibilitycheck
+    FOR EACH ROW
+    BEGIN
+        -- Only deleting the latest check changes the projection; fall back to
+        -- the next one (idx_check_article_date makes this a single seek)
+        IF EXISTS (SELECT 1 FROM article_latest_check
+                   WHERE ArticleID = OLD.ArticleID AND CheckID = OLD.CheckID) THEN
+            DELETE FROM article_latest_check WHERE ArticleID = OLD.ArticleID;
+            INSERT INTO article_latest_check
+                (ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate)
+            SELECT ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate
+            FROM credibilitycheck
+            WHERE ArticleID = OLD.ArticleID
+            ORDER BY CheckDate DESC, CheckID DESC
+            LIMIT 1;
+        END IF;
+    END
+"""
+
+# Same newer-wins rule as the trigger, so a check inserted while this runs
+# is not overwritten by an older one. Columns of the target table are
+# qualified because the SELECT reads credibilitycheck columns of the same name
+LATEST_CHECK_BACKFILL_SQL = """
+    INSERT INTO article_latest_check
+        (ArticleID, CheckID, FinalVerdict, FactCheckScore, CheckedBy, CheckDate)
+    SELECT c.ArticleID, c.CheckID, c.FinalVerdict, c.FactCheckScore, c.CheckedBy, c.CheckDate
+    FROM credibilitycheck c
+    WHERE c.CheckID = (
+        SELECT c2.CheckID FROM credibilitycheck c2
+        WHERE c2.ArticleID = c.ArticleID
+        ORDER BY c2.CheckDate DESC, c2.CheckID DESC
+        LIMIT 1
+    )
+    ON DUPLICATE KEY UPDATE
+        FinalVerdict = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+                 VALUES(FinalVerdict), article_latest_check.FinalVerdict),
+        FactCheckScore = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+                 VALUES(FactCheckScore), article_latest_check.FactCheckScore),
+        CheckedBy = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+                 VALUES(CheckedBy), article_latest_check.CheckedBy),
+        CheckID = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+                 VALUES(CheckID), article_latest_check.CheckID),
+        CheckDate = IF((article_latest_check.CheckDate, article_latest_check.CheckID) < (VALUES(CheckDate), VALUES(CheckID)),
+                 VALUES(CheckDate), article_latest_check.CheckDate)
+"""
+
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(LATEST_CHECK_TABLE_SQL)
+            print("✅ article_latest_check ready")
+
+            print("Recreating credibilitycheck projection triggers...")
+            cursor.execute("DROP TRIGGER IF EXISTS latest_check_after_insert")
+            cursor.execute(LATEST_CHECK_INSERT_TRIGGER_SQL)
+            cursor.execute("DROP TRIGGER IF EXISTS latest_check_after_delete")
+            cursor.execute(LATEST_CHECK_DELETE_TRIGGER_SQL)
+            conn.commit()
+            print("✅ Triggers in place")
+
+            # Backfill after the triggers are in place so no check is missed
+            cursor.execute(LATEST_CHECK_BACKFILL_SQL)
+            conn.commit()
+            cursor.execute("SELECT COUNT(*) FROM article_latest_check")
+            print(f"✅ article_latest_check backfilled ({cursor.fetchone()[0]} article(s) with a check)")
+
+            cursor.execute(
+                "SHOW INDEX FROM credibilitycheck WHERE Key_name IN "
+                "('idx_check_article_verdict', 'idx_check_article_date')"
+            )
+            indexes = {row[2] for row in cursor.fetchall()}
+            if indexes == {"idx_check_article_verdict", "idx_check_article_date"}:
+                cursor.execute(
+                    "ALTER TABLE credibilitycheck DROP INDEX idx_check_article_verdict, ALGORITHM=INPLACE, LOCK=NONE"
+                )
+                print("✅ Dropped idx_check_article_verdict (no longer read)")
+            elif "idx_check_article_verdict" in indexes:
+                print("ℹ️  idx_check_article_verdict kept: run migrate_add_query_indexes.py, then re-run this")
+            print("   Reload the API schema cache: POST /api/admin/schema/refresh (or SIGHUP)")
+
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Migration script to build the near-duplicate (MinHash/LSH) index
+- Creates article_minhash and article_lsh_band
+- Backfills signatures for articles that have none, computing them in a
+  process pool while the main process streams rows and writes results
+Usage: python migrate_add_near_duplicate_index.py [--workers N] [--batch-size N] [--rebuild]
+POST /api/articles and /api/articles/bulk report near_duplicates once the
+tables exist
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from db_config import db_connection
+from near_duplicates import LSH_BAND_TABLE_SQL, MINHASH_TABLE_SQL, signature_bytes, store_signatures
+
+
+def backfill(workers, batch_size, rebuild=False):
+    """Index every article lacking a signature; returns the number indexed"""
+    indexed = 0
+    last_id = 0
+    started = time.monotonic()
+    with db_connection() as conn, ProcessPoolExecutor(max_workers=workers) as pool:
+        cursor = conn.cursor()
+        if rebuild:
+            cursor.execute("DELETE FROM article_lsh_band")
+            cursor.execute("DELETE FROM article_minhash")
+            conn.commit()
+
+        while True:
+            # Keyset walk over the primary key; skips already indexed rows
+            cursor.execute("""
+                SELECT a.ArticleID, a.Content
+                FROM article a
+                LEFT JOIN article_minhash m ON m.ArticleID = a.ArticleID
+                WHERE a.ArticleID > %s AND m.ArticleID IS NULL
+                ORDER BY a.ArticleID
+                LIMIT %s
+            """, (last_id, batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            chunksize = max(1, len(rows) // (workers * 4))
+            sigs = pool.map(signature_bytes, [content for _, content in rows], chunksize=chunksize)
+            items = [(article_id, sig, count) for (article_id, _), (sig, count) in zip(rows, sigs)]
+            indexed += store_signatures(cursor, items)
+            conn.commit()
+
+            elapsed = time.monotonic() - started
+            print(f"   ... {indexed} articles indexed ({indexed / elapsed:.0f}/s), last ArticleID {last_id}")
+        cursor.close()
+    return indexed
+
+
+def migrate(workers=None, batch_size=1000, rebuild=False):
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            print("Creating article_minhash and article_lsh_band...")
+            cursor.execute(MINHASH_TABLE_SQL)
+            cursor.execute(LSH_BAND_TABLE_SQL)
+            conn.commit()
+            cursor.close()
+            print("✅ Tables ready")
+
+        workers = workers or os.cpu_count() or 1
+        print(f"Backfilling signatures with {workers} worker processes...")
+        indexed = backfill(workers, batch_size, rebuild)
+        print(f"✅ {indexed} articles indexed")
+        print("   Reload the API schema cache: POST /api/admin/schema/refresh (or SIGHUP)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=None, help="processes computing signatures (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="articles per read/write batch")
+    parser.add_argument("--rebuild", action="store_true", help="drop existing signatures and index everything again")
+    args = parser.parse_args()
+    migrate(args.workers, args.batch_size, args.rebuild)
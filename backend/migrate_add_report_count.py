@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the denormalized ReportCount column to article
+- Adds article.ReportCount and index idx_article_report_count
+- Backfills it from the report table in one grouped UPDATE
+- Recreates flag_article_after_report to maintain it on INSERT
+- Adds report_count_after_delete to maintain it on DELETE
+- Recreates report_count_for_article to read the column
+Run this script if /api/analytics/articles_with_report_count is slow
+"""
+
+from db_config import db_connection
+
+FLAG_ARTICLE_TRIGGER_SQL = """
+    CREATE TRIGGER flag_article_after_report
+    AFTER INSERT ON report
+    FOR EACH ROW
+    BEGIN
+        -- MySQL evaluates SET assignments left to right, so ReviewStatus
+        -- sees the incremented ReportCount
+        UPDATE article
+        SET ReportCount = ReportCount + 1,
+            ReviewStatus = IF(ReportCount >= 3, 'Under Review', ReviewStatus)
+        WHERE ArticleID = NEW.ArticleID;
+    END
+"""
+
+REPORT_COUNT_DELETE_TRIGGER_SQL = """
+    CREATE TRIGGER report_count_after_delete
+    AFTER DELETE ON report
+    FOR EACH ROW
+    BEGIN
+        UPDATE article
+        SET ReportCount = ReportCount - 1
+        WHERE ArticleID = OLD.ArticleID AND ReportCount > 0;
+    END
+"""
+
+REPORT_COUNT_FUNCTION_SQL = """
+    CREATE FUNCTION report_count_for_article(art_id INT)
+    RETURNS INT
+    READS SQL DATA
+    BEGIN
+        DECLARE rep_count INT;
+        SELECT ReportCount INTO rep_count FROM article WHERE ArticleID = art_id;
+        RETURN IFNULL(rep_count, 0);
+    END
+"""
+
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            # Check if column exists
+            cursor.execute("SHOW COLUMNS FROM article LIKE 'ReportCount'")
+            if cursor.fetchone() is None:
+                print("Adding ReportCount column to article table...")
+                cursor.execute("""
+                    ALTER TABLE article
+                    ADD COLUMN ReportCount INT NOT NULL DEFAULT 0
+                """)
+                conn.commit()
+                print("✅ ReportCount column added successfully!")
+            else:
+                print("✅ ReportCount column already exists")
+
+            cursor.execute("SHOW INDEX FROM article WHERE Key_name = 'idx_article_report_count'")
+            if not cursor.fetchall():
+                print("Adding idx_article_report_count index...")
+                cursor.execute("CREATE INDEX idx_article_report_count ON article (ReportCount, ArticleID)")
+                conn.commit()
+                print("✅ Index added")
+            else:
+                print("✅ idx_article_report_count already exists")
+
+            print("Recreating report triggers and report_count_for_article...")
+            cursor.execute("DROP TRIGGER IF EXISTS flag_article_after_report")
+            cursor.execute(FLAG_ARTICLE_TRIGGER_SQL)
+            cursor.execute("DROP TRIGGER IF EXISTS report_count_after_delete")
+            cursor.execute(REPORT_COUNT_DELETE_TRIGGER_SQL)
+            cursor.execute("DROP FUNCTION IF EXISTS report_count_for_article")
+            cursor.execute(REPORT_COUNT_FUNCTION_SQL)
+            conn.commit()
+            print("✅ Triggers and function now use article.ReportCount")
+
+            # Backfill after the triggers are in place so no report is missed
+            cursor.execute("""
+                UPDATE article a
+                LEFT JOIN (
+                    SELECT ArticleID, COUNT(*) AS cnt
+                    FROM report
+                    GROUP BY ArticleID
+                ) r ON r.ArticleID = a.ArticleID
+                SET a.ReportCount = COALESCE(r.cnt, 0)
+            """)
+            conn.commit()
+            print(f"✅ ReportCount backfilled ({cursor.rowcount} article(s) changed)")
+            print("   Reload the API schema cache: POST /api/admin/schema/refresh (or SIGHUP)")
+
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
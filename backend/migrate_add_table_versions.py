@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Migration script to add per-table change versions
+- Creates table_versions and seeds a row per versioned table
+- Drops the per-row version triggers of earlier versions; the API bumps
+  the versions itself once per write (table_versions.bump_versions)
+GET /api/sources, /api/reports and /api/credibility use these versions
+for ETag / If-None-Match (304) responses
+"""
+
+from db_config import db_connection
+from table_versions import LEGACY_TRIGGERS, TABLE_VERSIONS_SQL, VERSIONED_TABLES
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            print("Creating table_versions...")
+            cursor.execute(TABLE_VERSIONS_SQL)
+            cursor.executemany(
+                "INSERT IGNORE INTO table_versions (TableName, Version) VALUES (%s, 0)",
+                [(table,) for table in VERSIONED_TABLES],
+            )
+            conn.commit()
+            print("✅ table_versions ready")
+
+            # They serialized every writer of a table on its table_versions row
+            for trigger in LEGACY_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.commit()
+            print("✅ Per-row version triggers removed (versions are bumped by the API)")
+
+            print("   Reload the API schema cache: POST /api/admin/schema/refresh (or SIGHUP)")
+
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Migration script for the trend rollups
+- Creates report_rollup_hourly / report_rollup_daily and
+  check_rollup_hourly / check_rollup_daily (plus job_watermark, job_pending)
+- Adds the AFTER INSERT triggers on report and credibilitycheck that queue
+  new rows in job_pending, and queues the existing rows (only those past the
+  job_watermark ids when upgrading from the watermark-based job)
+The tables start empty; run rollup_trends.py to fold in the queued reports and
+checks, then keep it running with --loop or from cron.
+GET /api/analytics/trends/* answer 503 until then.
+When upgrading, rows the watermark skipped are recovered with
+rollup_trends.py --rebuild FROM TO.
+"""
+
+from db_config import db_connection
+from trend_rollups import (
+    CHECK_ROLLUP_DAILY_SQL,
+    CHECK_ROLLUP_HOURLY_SQL,
+    PENDING_SOURCES,
+    REPORT_ROLLUP_DAILY_SQL,
+    REPORT_ROLLUP_HOURLY_SQL,
+)
+from verdict_propagation import JOB_PENDING_SQL, JOB_WATERMARK_SQL, install_pending
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            for name, sql in (
+                ("job_watermark", JOB_WATERMARK_SQL),
+                ("job_pending", JOB_PENDING_SQL),
+                ("report_rollup_hourly", REPORT_ROLLUP_HOURLY_SQL),
+                ("report_rollup_daily", REPORT_ROLLUP_DAILY_SQL),
+                ("check_rollup_hourly", CHECK_ROLLUP_HOURLY_SQL),
+                ("check_rollup_daily", CHECK_ROLLUP_DAILY_SQL),
+            ):
+                cursor.execute(sql)
+                print(f"✅ {name} ready")
+            conn.commit()
+
+            for job, (table, id_column) in PENDING_SOURCES.items():
+                queued = install_pending(cursor, conn, job, table, id_column)
+                if queued is None:
+                    print(f"✅ {job}: queueing trigger on {table} already in place")
+                else:
+                    print(f"✅ {job}: queueing trigger on {table} created, {queued} row(s) queued")
+
+            print("ℹ️  Backfill with: python rollup_trends.py")
+            print("   Reload the API schema cache: POST /api/admin/schema/refresh (or SIGHUP)")
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
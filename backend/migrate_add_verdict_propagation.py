@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Migration script for verdict propagation
+- Creates job_watermark, job_pending, article_cluster, article_cluster_size
+  and suggested_verdict
+- Adds the AFTER INSERT triggers on article_minhash and credibilitycheck
+  that queue new rows in job_pending, and queues the rows not processed yet
+  (past the job_watermark ids used by earlier versions)
+Requires the near-duplicate index (migrate_add_near_duplicate_index.py).
+Then run propagate_verdicts.py (once, from cron, or with --loop).
+"""
+
+from db_config import db_connection
+from verdict_propagation import (
+    ARTICLE_CLUSTER_SQL,
+    CLUSTER_SIZE_SQL,
+    JOB_PENDING_SQL,
+    JOB_WATERMARK_SQL,
+    PENDING_SOURCES,
+    SUGGESTED_VERDICT_SQL,
+    install_pending,
+)
+
+def migrate():
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("SHOW TABLES LIKE 'article_minhash'")
+            if cursor.fetchone() is None:
+                print("❌ article_minhash missing - run migrate_add_near_duplicate_index.py first")
+                cursor.close()
+                return
+
+            for name, sql in (
+                ("job_watermark", JOB_WATERMARK_SQL),
+                ("job_pending", JOB_PENDING_SQL),
+                ("article_cluster", ARTICLE_CLUSTER_SQL),
+                ("article_cluster_size", CLUSTER_SIZE_SQL),
+                ("suggested_verdict", SUGGESTED_VERDICT_SQL),
+            ):
+                cursor.execute(sql)
+                print(f"✅ {name} ready")
+            conn.commit()
+
+            for job, (table, id_column) in PENDING_SOURCES.items():
+                queued = install_pending(cursor, conn, job, table, id_column)
+                if queued is None:
+                    print(f"✅ {job}: queueing trigger on {table} already in place")
+                else:
+                    print(f"✅ {job}: queueing trigger on {table} created, {queued} row(s) queued")
+
+            print("   Reload the API schema cache: POST /api/admin/schema/refresh (or SIGHUP)")
+            cursor.close()
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
+
+if __name__ == "__main__":
+    migrate()
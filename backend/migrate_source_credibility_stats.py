@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Migration script for the materialized per-source credibility aggregate
+- Creates source_credibility_stats (running ScoreSum / CheckCount per source)
+- Recreates update_source_trust_after_check to update it in O(1) per check
+- Adds update_source_stats_after_check_delete to keep it right on DELETE
+- Recreates avg_credibility_for_source to read the aggregate
+- Backfills the aggregate and TrustRating from existing credibility checks
+- Verifies the aggregate against a live AVG() and reports any drift
+  (rows removed by ON DELETE CASCADE do not fire triggers - use --repair)
+
+Usage:
+    python migrate_source_credibility_stats.py           # migrate + backfill + check
+    python migrate_source_credibility_stats.py --check   # consistency check only
+    python migrate_source_credibility_stats.py --repair  # re-backfill if drift found
+"""
+
+import sys
+
+from db_config import db_connection
+from table_versions import bump_versions
+
+SOURCE_STATS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS source_credibility_stats (
+        SourceID INT PRIMARY KEY,
+        ScoreSum DECIMAL(14,4) NOT NULL DEFAULT 0,
+        CheckCount INT NOT NULL DEFAULT 0,
+        UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        FOREIGN KEY (SourceID) REFERENCES source(SourceID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+TRUST_TRIGGER_SQL = """
+    CREATE TRIGGER update_source_trust_after_check
+    AFTER INSERT ON credibilitycheck
+    FOR EACH ROW
+    BEGIN
+        DECLARE src_id INT;
+        DECLARE new_sum DECIMAL(14,4);
+        DECLARE new_count INT;
+
+        -- Batch loads (POST /api/perform_check/batch) set @skip_source_trust_trigger
+        -- and apply one grouped update per source afterwards
+        IF @skip_source_trust_trigger IS NULL THEN
+            SELECT SourceID INTO src_id FROM article WHERE ArticleID = NEW.ArticleID;
+
+            INSERT INTO source_credibility_stats (SourceID, ScoreSum, CheckCount)
+            VALUES (src_id, COALESCE(NEW.FactCheckScore, 0), 1)
+            ON DUPLICATE KEY UPDATE
+                ScoreSum = ScoreSum + COALESCE(NEW.FactCheckScore, 0),
+                CheckCount = CheckCount + 1;
+
+            SELECT ScoreSum, CheckCount INTO new_sum, new_count
+            FROM source_credibility_stats
+            WHERE SourceID = src_id;
+
+            UPDATE source
+            SET TrustRating = ROUND(new_sum / new_count * 100, 2)
+            WHERE SourceID = src_id;
+        END IF;
+    END
+"""
+
+TRUST_DELETE_TRIGGER_SQL = """
+    CREATE TRIGGER update_source_stats_after_check_delete
+    AFTER DELETE ON credibilitycheck
+    FOR EACH ROW
+    BEGIN
+        DECLARE src_id INT;
+        DECLARE new_sum DECIMAL(14,4);
+        DECLARE new_count INT;
+
+        SELECT SourceID INTO src_id FROM article WHERE ArticleID = OLD.ArticleID;
+
+        UPDATE source_credibility_stats
+        SET ScoreSum = ScoreSum - COALESCE(OLD.FactCheckScore, 0),
+            CheckCount = CheckCount - 1
+        WHERE SourceID = src_id AND CheckCount > 0;
+
+        SELECT ScoreSum, CheckCount INTO new_sum, new_count
+        FROM source_credibility_stats
+        WHERE SourceID = src_id;
+
+        IF new_count > 0 THEN
+            UPDATE source
+            SET TrustRating = ROUND(new_sum / new_count * 100, 2)
+            WHERE SourceID = src_id;
+        END IF;
+    END
+"""
+
+AVG_CREDIBILITY_FUNCTION_SQL = """
+    CREATE FUNCTION avg_credibility_for_source(src_id INT)
+    RETURNS DECIMAL(5,2)
+    READS SQL DATA
+    BEGIN
+        DECLARE avg_score DECIMAL(5,2);
+
+        SELECT ROUND(ScoreSum / CheckCount * 100, 2)
+        INTO avg_score
+        FROM source_credibility_stats
+        WHERE SourceID = src_id AND CheckCount > 0;
+
+        RETURN IFNULL(avg_score, 0.00);
+    END
+"""
+
+
+def install(cursor, conn):
+    """Create the aggregate table and (re)create the trigger/function that use it"""
+    cursor.execute(SOURCE_STATS_TABLE_SQL)
+    cursor.execute("DROP TRIGGER IF EXISTS update_source_trust_after_check")
+    cursor.execute(TRUST_TRIGGER_SQL)
+    cursor.execute("DROP TRIGGER IF EXISTS update_source_stats_after_check_delete")
+    cursor.execute(TRUST_DELETE_TRIGGER_SQL)
+    cursor.execute("DROP FUNCTION IF EXISTS avg_credibility_for_source")
+    cursor.execute(AVG_CREDIBILITY_FUNCTION_SQL)
+    conn.commit()
+
+
+def backfill(cursor, conn):
+    """Rebuild every source's running sum/count from credibilitycheck in one pass"""
+    cursor.execute("DELETE FROM source_credibility_stats")
+    cursor.execute("""
+        INSERT INTO source_credibility_stats (SourceID, ScoreSum, CheckCount)
+        SELECT * FROM (
+            SELECT a.SourceID, SUM(COALESCE(c.FactCheckScore, 0)) AS ScoreSum, COUNT(*) AS CheckCount
+            FROM credibilitycheck c
+            JOIN article a ON c.ArticleID = a.ArticleID
+            GROUP BY a.SourceID
+        ) live
+        ON DUPLICATE KEY UPDATE ScoreSum = live.ScoreSum, CheckCount = live.CheckCount
+    """)
+    rows = cursor.rowcount
+    cursor.execute("""
+        UPDATE source s
+        JOIN source_credibility_stats st ON st.SourceID = s.SourceID
+        SET s.TrustRating = ROUND(st.ScoreSum / st.CheckCount * 100, 2)
+        WHERE st.CheckCount > 0
+    """)
+    conn.commit()
+    bump_versions(conn, "source")
+    return rows
+
+
+def check_consistency(cursor):
+    """Return sources whose stored aggregate differs from a live recompute"""
+    cursor.execute("""
+        SELECT s.SourceID,
+               COALESCE(st.ScoreSum, 0) AS StoredSum,
+               COALESCE(st.CheckCount, 0) AS StoredCount,
+               COALESCE(live.ScoreSum, 0) AS LiveSum,
+               COALESCE(live.CheckCount, 0) AS LiveCount
+        FROM source s
+        LEFT JOIN source_credibility_stats st ON st.SourceID = s.SourceID
+        LEFT JOIN (
+            SELECT a.SourceID, SUM(COALESCE(c.FactCheckScore, 0)) AS ScoreSum, COUNT(*) AS CheckCount
+            FROM credibilitycheck c
+            JOIN article a ON c.ArticleID = a.ArticleID
+            GROUP BY a.SourceID
+        ) live ON live.SourceID = s.SourceID
+        WHERE COALESCE(st.ScoreSum, 0) <> COALESCE(live.ScoreSum, 0)
+           OR COALESCE(st.CheckCount, 0) <> COALESCE(live.CheckCount, 0)
+    """)
+    return cursor.fetchall()
+
+
+def migrate(check_only=False, repair=False):
+    try:
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            print("=" * 60)
+            print("Materialized source credibility aggregate")
+            print("=" * 60)
+
+            if not check_only:
+                print("\n1. Installing source_credibility_stats, triggers and function...")
+                install(cursor, conn)
+                print("   ✅ Table, incremental triggers and function installed")
+
+                print("\n2. Backfilling aggregate from existing credibility checks...")
+                rows = backfill(cursor, conn)
+                print(f"   ✅ Aggregate rebuilt for {rows} source(s), TrustRating refreshed")
+
+            print("\n3. Checking aggregate against live AVG()...")
+            drift = check_consistency(cursor)
+            if not drift:
+                print("   ✅ Aggregate is consistent with credibilitycheck")
+            else:
+                print(f"   ⚠️  {len(drift)} source(s) out of sync:")
+                for source_id, stored_sum, stored_count, live_sum, live_count in drift:
+                    print(f"      SourceID {source_id}: stored {stored_sum}/{stored_count}, live {live_sum}/{live_count}")
+                if repair:
+                    print("   Repairing by re-running the backfill...")
+                    backfill(cursor, conn)
+                    print("   ✅ Aggregate repaired")
+
+            print("\n" + "=" * 60)
+
+            cursor.close()
+
+        return len(drift)
+
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        raise
+
+
+if __name__ == "__main__":
+    drift_count = migrate(check_only="--check" in sys.argv, repair="--repair" in sys.argv)
+    sys.exit(1 if drift_count and "--repair" not in sys.argv else 0)
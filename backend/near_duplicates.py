@@ -0,0 +1,239 @@
+"""
+Near-duplicate article detection with MinHash + LSH banding
+Each article's Content is normalised, split into word shingles and reduced
+to a fixed-size MinHash signature (NumPy, one vectorised pass over all hash
+permutations). The signature is cut into bands; every band is hashed into
+article_lsh_band, so candidate duplicates are found with a handful of
+primary key lookups instead of comparing against every stored article.
+Candidates are then scored by estimated Jaccard similarity.
+"""
+
+import hashlib
+import os
+import re
+
+import numpy as np
+
+from schema_registry import schema
+
+NUM_PERM = 128
+# 32 bands x 4 rows: P(candidate) = 1 - (1 - J^4)^32, ~87% at J=0.5 and
+# ~99% at the default 0.6 threshold; the S-curve's threshold
+# (1/32)^(1/4) is ~0.42 (P = 50% at J~0.38)
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SHINGLE_WORDS = int(os.environ.get("NEAR_DUP_SHINGLE_WORDS", "3"))
+NEAR_DUP_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", "0.6"))
+NEAR_DUP_MAX_RESULTS = 10
+# Candidate lookups per query; keeps the IN (...) list bounded for bulk loads
+LOOKUP_CHUNK = 100
+
+_PRIME = np.uint64(4294967311)      # smallest prime above 2**32
+# Fixed seed: signatures must be identical across processes and restarts
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+MINHASH_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS article_minhash (
+        ArticleID INT PRIMARY KEY,
+        Signature VARBINARY(512) NOT NULL,
+        ShingleCount INT NOT NULL,
+        FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+LSH_BAND_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS article_lsh_band (
+        Band TINYINT UNSIGNED NOT NULL,
+        BucketHash BIGINT NOT NULL,
+        ArticleID INT NOT NULL,
+        PRIMARY KEY (Band, BucketHash, ArticleID),
+        INDEX idx_lsh_article (ArticleID),
+        FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+
+def shingles(text):
+    """Set of 32-bit hashes of overlapping SHINGLE_WORDS-word windows"""
+    words = _WORD_RE.findall((text or "").lower())
+    if len(words) < SHINGLE_WORDS:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return {int.from_bytes(hashlib.blake2b(g.encode("utf-8"), digest_size=4).digest(), "little") for g in grams}
+
+
+def signature(text):
+    """
+    (MinHash signature, shingle count) of `text`. The signature is a uint32
+    array of NUM_PERM values, or None when the text has no words.
+    """
+    hashed = shingles(text)
+    if not hashed:
+        return None, 0
+    x = np.fromiter(hashed, dtype=np.uint64, count=len(hashed))
+    # (a*x + b) mod p for every permutation at once: NUM_PERM x shingles;
+    # a, b, x < 2**32 so the product cannot overflow uint64
+    values = (np.outer(_A, x) + _B[:, None]) % _PRIME
+    return values.min(axis=1).astype(np.uint32), len(hashed)
+
+
+def signature_bytes(text):
+    """(signature bytes, shingle count) - picklable helper for process pools"""
+    sig, count = signature(text)
+    return (None if sig is None else sig.tobytes()), count
+
+
+def band_hashes(sig):
+    """One signed 64-bit bucket key per band"""
+    bands = sig.reshape(LSH_BANDS, LSH_ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), "little", signed=True)
+        for band in bands
+    ]
+
+
+def similarity(sig, others):
+    """Estimated Jaccard similarity of `sig` against each row of `others`"""
+    return (others == sig).mean(axis=1)
+
+
+def store_signatures(cursor, items):
+    """
+    Write signatures and band rows for [(article_id, sig_bytes, shingle_count)].
+    Rows with no signature are skipped. Replaces any previous entries.
+    """
+    items = [item for item in items if item[1] is not None]
+    if not items:
+        return 0
+    ids = [item[0] for item in items]
+    placeholders = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"DELETE FROM article_lsh_band WHERE ArticleID IN ({placeholders})", tuple(ids))
+    cursor.executemany(
+        "REPLACE INTO article_minhash (ArticleID, Signature, ShingleCount) VALUES (%s, %s, %s)",
+        items,
+    )
+    band_rows = []
+    for article_id, sig_bytes, _ in items:
+        sig = np.frombuffer(sig_bytes, dtype=np.uint32)
+        band_rows.extend((band, bucket, article_id) for band, bucket in enumerate(band_hashes(sig)))
+    cursor.executemany(
+        "INSERT IGNORE INTO article_lsh_band (Band, BucketHash, ArticleID) VALUES (%s, %s, %s)",
+        band_rows,
+    )
+    return len(items)
+
+
+def find_near_duplicates(cursor, items, threshold=NEAR_DUP_THRESHOLD, limit=NEAR_DUP_MAX_RESULTS):
+    """
+    Look up likely duplicates for [(article_id, sig_bytes)] (article_id may be
+    None for text that is not stored). Returns {article_id: [match, ...]}
+    where each match has ArticleID, Title, URL, Similarity and the latest
+    verdict of that article. `cursor` must be a tuple cursor.
+    """
+    found = {}
+    items = [item for item in items if item[1] is not None]
+    for start in range(0, len(items), LOOKUP_CHUNK):
+        chunk = items[start:start + LOOKUP_CHUNK]
+        sigs = {article_id: np.frombuffer(sig_bytes, dtype=np.uint32) for article_id, sig_bytes in chunk}
+
+        # Candidate generation: primary key lookups on (Band, BucketHash)
+        wanted = {}
+        for article_id, sig in sigs.items():
+            for band, bucket in enumerate(band_hashes(sig)):
+                wanted.setdefault((band, bucket), []).append(article_id)
+        keys = list(wanted)
+        pairs = ", ".join(["(%s, %s)"] * len(keys))
+        cursor.execute(
+            f"SELECT Band, BucketHash, ArticleID FROM article_lsh_band WHERE (Band, BucketHash) IN ({pairs})",
+            tuple(v for key in keys for v in key),
+        )
+        candidates = {}
+        for band, bucket, candidate_id in cursor.fetchall():
+            for article_id in wanted.get((band, bucket), ()):
+                if candidate_id != article_id:
+                    candidates.setdefault(article_id, set()).add(candidate_id)
+        all_ids = sorted(set().union(*candidates.values())) if candidates else []
+        if not all_ids:
+            continue
+
+        # Scoring: compare full signatures of the candidates only
+        placeholders = ", ".join(["%s"] * len(all_ids))
+        cursor.execute(
+            f"SELECT ArticleID, Signature FROM article_minhash WHERE ArticleID IN ({placeholders})",
+            tuple(all_ids),
+        )
+        stored = {cid: np.frombuffer(raw, dtype=np.uint32) for cid, raw in cursor.fetchall()}
+        for article_id, cand_ids in candidates.items():
+            cand_ids = [cid for cid in cand_ids if cid in stored]
+            if not cand_ids:
+                continue
+            scores = similarity(sigs[article_id], np.vstack([stored[cid] for cid in cand_ids]))
+            ranked = sorted(
+                ((float(score), cid) for score, cid in zip(scores, cand_ids) if score >= threshold),
+                reverse=True,
+            )[:limit]
+            if ranked:
+                found[article_id] = ranked
+
+    if not found:
+        return {}
+    details = _describe(cursor, sorted({cid for ranked in found.values() for _, cid in ranked}))
+    return {
+        article_id: [{**details[cid], "Similarity": round(score, 3)} for score, cid in ranked if cid in details]
+        for article_id, ranked in found.items()
+    }
+
+
+def _describe(cursor, article_ids):
+    """Title, URL and latest verdict for each matched article"""
+    placeholders = ", ".join(["%s"] * len(article_ids))
+    if schema.has_table("article_latest_check"):
+        query = f"""
+            SELECT a.ArticleID, a.Title, a.URL, lc.FinalVerdict, lc.FactCheckScore
+            FROM article a
+            LEFT JOIN article_latest_check lc ON lc.ArticleID = a.ArticleID
+            WHERE a.ArticleID IN ({placeholders})
+        """
+    else:
+        query = f"""
+            SELECT a.ArticleID, a.Title, a.URL,
+                   (SELECT c.FinalVerdict FROM credibilitycheck c
+                    WHERE c.ArticleID = a.ArticleID
+                    ORDER BY c.CheckDate DESC, c.CheckID DESC LIMIT 1) AS FinalVerdict,
+                   (SELECT c.FactCheckScore FROM credibilitycheck c
+                    WHERE c.ArticleID = a.ArticleID
+                    ORDER BY c.CheckDate DESC, c.CheckID DESC LIMIT 1) AS FactCheckScore
+            FROM article a
+            WHERE a.ArticleID IN ({placeholders})
+        """
+    cursor.execute(query, tuple(article_ids))
+    return {
+        row[0]: {
+            "ArticleID": row[0],
+            "Title": row[1],
+            "URL": row[2],
+            "FinalVerdict": row[3] or "Unverified",
+            "FactCheckScore": None if row[4] is None else float(row[4]),
+        }
+        for row in cursor.fetchall()
+    }
+
+
+def index_and_match(cursor, articles):
+    """
+    Store signatures for [(article_id, content)] and return their likely
+    duplicates among all indexed articles (including each other).
+    """
+    items = []
+    for article_id, content in articles:
+        sig_bytes, count = signature_bytes(content)
+        items.append((article_id, sig_bytes, count))
+    store_signatures(cursor, items)
+    return find_near_duplicates(cursor, [(article_id, sig_bytes) for article_id, sig_bytes, _ in items])
@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination helpers
+Cursors are opaque URL-safe tokens wrapping the sort key of the last row on
+a page, so the next page is a range scan from that key instead of an OFFSET.
+"""
+
+import base64
+import json
+from datetime import date, datetime
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    """Bad limit / cursor / fields parameter supplied by the client"""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(*key):
+    """Pack the sort key of the last row into an opaque cursor string"""
+    raw = json.dumps([_encode_value(v) for v in key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, size):
+    """Unpack a cursor produced by encode_cursor into a tuple of `size` values"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        if not isinstance(key, list) or len(key) != size:
+            raise ValueError("wrong key size")
+        return tuple(_decode_value(v) for v in key)
+    except Exception:
+        raise PaginationError("Invalid cursor")
+
+
+def parse_limit(raw, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    if raw in (None, ""):
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be at least 1")
+    return min(limit, maximum)
+
+
+def parse_fields(raw, allowed, default):
+    """
+    Parse a comma separated `fields=` projection against the allowed field
+    names. Returns the default list when the parameter is absent.
+    """
+    if raw in (None, ""):
+        return list(default)
+    fields = []
+    for name in raw.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in allowed:
+            raise PaginationError(f"Unknown field '{name}'. Allowed: {', '.join(allowed)}")
+        if name not in fields:
+            fields.append(name)
+    if not fields:
+        raise PaginationError("fields must name at least one field")
+    return fields
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Background job: cluster new articles and propagate verdicts to unchecked
+near-duplicates (see verdict_propagation.py).
+Usage: python propagate_verdicts.py [--loop SECONDS] [--batch-size N]
+Without --loop it drains the backlog once and exits (cron friendly).
+"""
+
+import argparse
+import time
+
+from verdict_propagation import PROPAGATION_BATCH_SIZE, run_once
+
+
+def drain(batch_size):
+    """Run batches until no new articles or checks are left"""
+    while True:
+        stats = run_once(batch_size)
+        if stats.get("skipped"):
+            print(f"⏭️  Skipped: {stats['skipped']}")
+            return
+        if stats["articles"] or stats["checks"]:
+            print(
+                f"✅ {stats['articles']} articles, {stats['checks']} checks, "
+                f"{stats['clusters_touched']} clusters, {stats['suggestions']} suggestions "
+                f"({stats['elapsed_ms']} ms)"
+            )
+        if stats["articles"] < batch_size and stats["checks"] < batch_size:
+            return
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Propagate verdicts to near-duplicate articles")
+    parser.add_argument("--loop", type=float, default=None, help="keep running, polling every SECONDS")
+    parser.add_argument("--batch-size", type=int, default=PROPAGATION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    drain(args.batch_size)
+    while args.loop:
+        time.sleep(args.loop)
+        try:
+            drain(args.batch_size)
+        except Exception as e:
+            # Keep the loop alive across transient DB errors
+            print(f"❌ Error: {e}")
@@ -0,0 +1,146 @@
+"""
+In-process response cache for read-heavy endpoints
+Entries have a per-endpoint TTL, the cache is bounded with LRU eviction,
+and write routes invalidate entries by tag (e.g. "reports", "checks").
+Invalidations reach the other worker processes through event_log
+(broadcast.py) within BROADCAST_POLL_SECONDS; before it is migrated they
+only clear this process's entries.
+"""
+
+import os
+import threading
+import traceback
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, current_app, request
+
+from broadcast import broadcaster
+
+CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", "256"))
+CACHE_ENABLED = os.environ.get("CACHE_ENABLED", "1") not in ("0", "false", "False")
+
+
+class ResponseCache:
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, tags, payload)
+        self._generations = {}         # tag -> bumped on every invalidation
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+        self._endpoint_stats = {}
+
+    def _count(self, endpoint, outcome):
+        self._stats[outcome] += 1
+        if endpoint:
+            per = self._endpoint_stats.setdefault(endpoint, {"hits": 0, "misses": 0})
+            per[outcome] += 1
+
+    def get(self, key, endpoint=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self._stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._count(endpoint, "misses")
+                return None
+            self._entries.move_to_end(key)
+            self._count(endpoint, "hits")
+            return entry[2]
+
+    def generations(self, tags):
+        with self._lock:
+            return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def set(self, key, payload, ttl, tags=(), generations=None):
+        """
+        Store `payload`. If `generations` (from generations() taken before the
+        value was computed) no longer match, a write happened meanwhile and the
+        possibly stale value is dropped.
+        """
+        with self._lock:
+            if generations is not None and generations != tuple(self._generations.get(tag, 0) for tag in tags):
+                return False
+            self._entries[key] = (time.monotonic() + ttl, tuple(tags), payload)
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+            return True
+
+    def invalidate(self, *tags):
+        """Invalidate `tags` here and in every other worker process"""
+        self.invalidate_local(*tags)
+        if broadcaster.available():
+            try:
+                broadcaster.publish("invalidate", [("tags", list(tags))])
+            except Exception:
+                # Other workers fall back to the entries' TTL
+                traceback.print_exc()
+
+    def invalidate_local(self, *tags):
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+            stale = [key for key, entry in self._entries.items() if set(entry[1]) & set(tags)]
+            for key in stale:
+                del self._entries[key]
+            self._stats["invalidations"] += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "endpoints": {name: dict(per) for name, per in self._endpoint_stats.items()},
+            }
+
+
+response_cache = ResponseCache()
+
+
+def _apply_invalidation(event_id, kind, tags, published_at, own):
+    """broadcast subscriber for the "invalidate" channel"""
+    if not own:
+        response_cache.invalidate_local(*tags)
+
+
+broadcaster.subscribe("invalidate", _apply_invalidation)
+
+
+def cached(ttl, tags=()):
+    """
+    Cache a view's successful (200) response for `ttl` seconds, keyed on the
+    full request path including the query string. Place it below @app.route.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED:
+                return view(*args, **kwargs)
+
+            key = f"{view.__name__}:{request.full_path}"
+            payload = response_cache.get(key, endpoint=view.__name__)
+            if payload is not None:
+                data, mimetype = payload
+                return Response(data, status=200, mimetype=mimetype, headers={"X-Cache": "HIT"})
+
+            generations = response_cache.generations(tags)
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                response_cache.set(key, (response.get_data(), response.mimetype), ttl, tags, generations)
+            response.headers["X-Cache"] = "MISS"
+            return response
+        return wrapper
+    return decorator
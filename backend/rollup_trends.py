@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Background job: fold new reports and credibility checks into the hourly and
+daily trend rollups (see trend_rollups.py).
+Usage: python rollup_trends.py [--loop SECONDS] [--batch-size N]
+       python rollup_trends.py --rebuild 2025-01-01 2025-02-01
+Without --loop it drains the backlog once and exits (cron friendly).
+--rebuild recomputes the buckets in [FROM, TO) from the base tables, e.g.
+after reports or checks were deleted (deletes are not folded incrementally).
+"""
+
+import argparse
+import time
+from datetime import date
+
+from trend_rollups import ROLLUP_BATCH_SIZE, rebuild, run_once
+
+
+def drain(batch_size):
+    """Run batches until no queued reports or checks are left"""
+    while True:
+        stats = run_once(batch_size)
+        if stats.get("skipped"):
+            print(f"⏭️  Skipped: {stats['skipped']}")
+            return
+        if stats["reports"] or stats["checks"]:
+            print(f"✅ {stats['reports']} reports, {stats['checks']} checks ({stats['elapsed_ms']} ms)")
+        if stats["reports"] < batch_size and stats["checks"] < batch_size:
+            return
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the trend rollup tables")
+    parser.add_argument("--loop", type=float, default=None, help="keep running, polling every SECONDS")
+    parser.add_argument("--batch-size", type=int, default=ROLLUP_BATCH_SIZE)
+    parser.add_argument("--rebuild", nargs=2, metavar=("FROM", "TO"), type=date.fromisoformat,
+                        help="recompute buckets from FROM (inclusive) to TO (exclusive) and exit")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        stats = rebuild(*args.rebuild)
+        if stats.get("skipped"):
+            print(f"⏭️  Skipped: {stats['skipped']}")
+        else:
+            print(f"✅ Rebuilt {args.rebuild[0]} .. {args.rebuild[1]} ({stats['elapsed_ms']} ms)")
+        raise SystemExit(0)
+
+    drain(args.batch_size)
+    while args.loop:
+        time.sleep(args.loop)
+        try:
+            drain(args.batch_size)
+        except Exception as e:
+            # Keep the loop alive across transient DB errors
+            print(f"❌ Error: {e}")
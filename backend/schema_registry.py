@@ -0,0 +1,126 @@
+"""
+Schema capability registry
+Probes information_schema once (at startup or on explicit refresh) and caches
+which tables, columns, indexes, triggers and routines exist, so request
+handlers can pick the right query variant without catalog round-trips.
+"""
+
+import threading
+
+from db_config import db_connection
+
+
+class SchemaRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    # -----------------------
+    # Probing
+    # -----------------------
+    def refresh(self):
+        """Re-read the catalog for the current database and swap in the new snapshot"""
+        snapshot = {
+            "tables": set(),
+            "columns": {},
+            "indexes": {},
+            "triggers": {},
+            "routines": {},
+        }
+        with db_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = DATABASE()
+            """)
+            for table, column in cursor.fetchall():
+                snapshot["tables"].add(table.lower())
+                snapshot["columns"].setdefault(table.lower(), set()).add(column.lower())
+
+            cursor.execute("""
+                SELECT DISTINCT TABLE_NAME, INDEX_NAME
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE()
+            """)
+            for table, index in cursor.fetchall():
+                snapshot["indexes"].setdefault(table.lower(), set()).add(index.lower())
+
+            cursor.execute("""
+                SELECT TRIGGER_NAME, EVENT_OBJECT_TABLE, ACTION_STATEMENT
+                FROM information_schema.TRIGGERS
+                WHERE TRIGGER_SCHEMA = DATABASE()
+            """)
+            for name, table, body in cursor.fetchall():
+                snapshot["triggers"][name.lower()] = {"table": table.lower(), "body": body or ""}
+
+            cursor.execute("""
+                SELECT r.ROUTINE_NAME, r.ROUTINE_TYPE, COUNT(p.PARAMETER_NAME)
+                FROM information_schema.ROUTINES r
+                LEFT JOIN information_schema.PARAMETERS p
+                  ON p.SPECIFIC_SCHEMA = r.ROUTINE_SCHEMA
+                 AND p.SPECIFIC_NAME = r.SPECIFIC_NAME
+                 AND p.ORDINAL_POSITION > 0
+                WHERE r.ROUTINE_SCHEMA = DATABASE()
+                GROUP BY r.ROUTINE_NAME, r.ROUTINE_TYPE
+            """)
+            for name, kind, param_count in cursor.fetchall():
+                snapshot["routines"][name.lower()] = {"type": kind, "params": int(param_count)}
+
+            cursor.close()
+
+        with self._lock:
+            self._snapshot = snapshot
+        return self.describe()
+
+    def _current(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            # Startup probe failed (e.g. DB was down) - try again on first use
+            self.refresh()
+            snapshot = self._snapshot
+        return snapshot
+
+    @property
+    def loaded(self):
+        return self._snapshot is not None
+
+    # -----------------------
+    # Capability lookups
+    # -----------------------
+    def has_table(self, table):
+        return table.lower() in self._current()["tables"]
+
+    def has_column(self, table, column):
+        return column.lower() in self._current()["columns"].get(table.lower(), ())
+
+    def has_index(self, table, index):
+        return index.lower() in self._current()["indexes"].get(table.lower(), ())
+
+    def has_trigger(self, name):
+        return name.lower() in self._current()["triggers"]
+
+    def trigger_references(self, name, text):
+        trigger = self._current()["triggers"].get(name.lower())
+        return bool(trigger) and text in trigger["body"]
+
+    def has_routine(self, name):
+        return name.lower() in self._current()["routines"]
+
+    def routine_param_count(self, name):
+        routine = self._current()["routines"].get(name.lower())
+        return routine["params"] if routine else None
+
+    def describe(self):
+        snapshot = self._current()
+        return {
+            "tables": sorted(snapshot["tables"]),
+            "columns": {t: sorted(c) for t, c in snapshot["columns"].items()},
+            "indexes": {t: sorted(i) for t, i in snapshot["indexes"].items()},
+            "triggers": {n: t["table"] for n, t in snapshot["triggers"].items()},
+            "routines": snapshot["routines"],
+        }
+
+
+schema = SchemaRegistry()
@@ -0,0 +1,99 @@
+"""
+Full-text article search helpers
+GET /api/articles/search runs MATCH ... AGAINST on the FULLTEXT index
+ft_article_title_content (see migrate_add_fulltext_index.py). User input is
+turned into a BOOLEAN MODE expression here so stray operators in the query
+string cannot produce syntax errors, and snippets are built in Python for
+the rows of one page only.
+"""
+
+import html
+import os
+import re
+
+FULLTEXT_INDEX = "ft_article_title_content"
+# Matches InnoDB's innodb_ft_min_token_size; shorter words are not indexed
+MIN_TERM_LENGTH = int(os.environ.get("FT_MIN_TOKEN_SIZE", "3"))
+MAX_TERMS = 16
+SNIPPET_CHARS = int(os.environ.get("SEARCH_SNIPPET_CHARS", "200"))
+
+_PHRASE_RE = re.compile(r'"([^"]+)"')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchQueryError(ValueError):
+    """The q parameter has no searchable terms"""
+
+
+def parse_query(raw, match_all=True):
+    """
+    Build a BOOLEAN MODE expression from free text.
+    "quoted phrases" stay phrases, other words become prefix terms (word*).
+    With match_all every term is required (+), otherwise any term matches.
+    Returns (expression, terms) where terms are used for highlighting.
+    """
+    raw = (raw or "").strip()
+    phrases = []
+    for phrase in _PHRASE_RE.findall(raw):
+        words = _WORD_RE.findall(phrase)
+        if words:
+            phrases.append(" ".join(words))
+    rest = _PHRASE_RE.sub(" ", raw)
+    words = []
+    for word in _WORD_RE.findall(rest):
+        if len(word) >= MIN_TERM_LENGTH and word.lower() not in (w.lower() for w in words):
+            words.append(word)
+
+    if not phrases and not words:
+        raise SearchQueryError(f"q must contain a word of at least {MIN_TERM_LENGTH} characters")
+
+    prefix = "+" if match_all else ""
+    parts = [f'{prefix}"{p}"' for p in phrases] + [f"{prefix}{w}*" for w in words]
+    parts = parts[:MAX_TERMS]
+    return " ".join(parts), phrases + words
+
+
+def _term_pattern(terms):
+    # Words were indexed as prefixes, phrases match as written
+    alternatives = []
+    for term in sorted(terms, key=len, reverse=True):
+        if " " in term:
+            alternatives.append(r"\s+".join(re.escape(w) for w in term.split()))
+        else:
+            alternatives.append(re.escape(term) + r"\w*")
+    return re.compile(r"\b(" + "|".join(alternatives) + r")", re.IGNORECASE | re.UNICODE)
+
+
+def highlight(text, terms):
+    """HTML-escape text and wrap every matched term in <mark>"""
+    if not text:
+        return ""
+    pattern = _term_pattern(terms)
+    out = []
+    pos = 0
+    for m in pattern.finditer(text):
+        out.append(html.escape(text[pos:m.start()]))
+        out.append("<mark>" + html.escape(m.group(0)) + "</mark>")
+        pos = m.end()
+    out.append(html.escape(text[pos:]))
+    return "".join(out)
+
+
+def snippet(text, terms, width=SNIPPET_CHARS):
+    """Window of roughly `width` characters around the first match, highlighted"""
+    if not text:
+        return ""
+    m = _term_pattern(terms).search(text)
+    start = 0 if m is None else max(0, m.start() - width // 3)
+    if start:
+        # Don't cut a word in half
+        space = text.find(" ", start)
+        if 0 <= space < (m.start() if m else start + width):
+            start = space + 1
+    end = min(len(text), start + width)
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        if space > start:
+            end = space
+    body = highlight(text[start:end], terms)
+    return ("…" if start else "") + body + ("…" if end < len(text) else "")
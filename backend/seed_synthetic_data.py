@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Seed the FakeNewsDB schema with synthetic data for benchmarks
+All rows are tagged (emails @bench.example, domains *.bench.example, URLs
+under https://bench.example/) so --reset removes them again without
+touching real data. Generation is deterministic for a given --seed.
+
+Usage:
+  python seed_synthetic_data.py --users 1000 --sources 200 --articles 100000 \\
+      --reports 300000 --checks 50000 [--seed 42] [--batch-size 1000]
+  python seed_synthetic_data.py --reset
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from db_config import db_connection
+from table_versions import VERSIONED_TABLES, bump_versions
+
+BENCH_DOMAIN = "bench.example"
+# Values of the useraccount.Role ENUM, weighted toward regular users
+ROLES = ("user", "user", "user", "user", "fact-checker", "admin")
+# Pre-computed werkzeug scrypt hash of "bench-password" (AUTH_HASH_METHOD
+# default), so seeding does not spend minutes hashing and bench users can log in
+BENCH_PASSWORD_HASH = (
+    "scrypt:32768:8:1$benchSeedSalt001$a42319034eede0f648cf9529a7b865e67739fc2ac0be80f1347b4a7f40"
+    "addbf752dc75cba1368991a0e13d2bc7fb957f3b564cf62315e97b38a202b27d47f083"
+)
+VERDICTS = ("Real", "Fake", "Unverified")
+WORDS = (
+    "government minister vaccine election climate study report claims secret "
+    "scientists leaked video viral shocking cure banned official sources confirm "
+    "deny market crash record flood outbreak celebrity hoax investigation fraud "
+    "police protest economy tax school health water energy data privacy"
+).split()
+
+
+def _chunks(rows, size):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def _insert(cursor, conn, sql, rows, batch_size, label):
+    started = time.monotonic()
+    for chunk in _chunks(rows, batch_size):
+        cursor.executemany(sql, chunk)
+        conn.commit()
+    elapsed = time.monotonic() - started
+    print(f"✅ {len(rows)} {label} in {elapsed:.1f}s ({len(rows) / elapsed if elapsed else 0:.0f} rows/s)")
+
+
+def _ids(cursor, query, params=()):
+    cursor.execute(query, params)
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed(users, sources, articles, reports, checks, seed_value=42, batch_size=1000):
+    rng = random.Random(seed_value)
+    run = f"{seed_value}-{int(time.time())}"
+    with db_connection() as conn:
+        cursor = conn.cursor()
+
+        _insert(cursor, conn,
+                "INSERT INTO useraccount (Name, Email, Role, PasswordHash) VALUES (%s, %s, %s, %s)",
+                [(f"Bench User {i}", f"user{i}.{run}@{BENCH_DOMAIN}", rng.choice(ROLES), BENCH_PASSWORD_HASH)
+                 for i in range(users)],
+                batch_size, "users")
+        _insert(cursor, conn,
+                "INSERT INTO source (Name, Domain, TrustRating) VALUES (%s, %s, %s)",
+                [(f"Bench Source {i}", f"s{i}-{run}.{BENCH_DOMAIN}", round(rng.uniform(10, 95), 2)) for i in range(sources)],
+                batch_size, "sources")
+
+        user_ids = _ids(cursor, "SELECT UserID FROM useraccount WHERE Email LIKE %s", (f"%@{BENCH_DOMAIN}",))
+        checker_ids = _ids(cursor, """
+            SELECT UserID FROM useraccount
+            WHERE Email LIKE %s AND Role IN ('fact-checker', 'admin')
+        """, (f"%@{BENCH_DOMAIN}",)) or user_ids
+        source_ids = _ids(cursor, "SELECT SourceID FROM source WHERE Domain LIKE %s", (f"%.{BENCH_DOMAIN}",))
+
+        today = date.today()
+        article_rows = []
+        for i in range(articles):
+            # Some stories are republished with small edits (near-duplicates)
+            if article_rows and rng.random() < 0.1:
+                words = rng.choice(article_rows)[1].split()
+                words[rng.randrange(len(words))] = rng.choice(WORDS)
+                body = " ".join(words)
+            else:
+                body = _sentence(rng, rng.randint(40, 200))
+            article_rows.append((
+                _sentence(rng, rng.randint(5, 12)).capitalize(),
+                body,
+                f"https://{BENCH_DOMAIN}/{run}/article/{i}",
+                rng.choice(source_ids),
+                today - timedelta(days=rng.randint(0, 730)),
+            ))
+        _insert(cursor, conn,
+                "INSERT INTO article (Title, Content, URL, SourceID, PublishDate) VALUES (%s, %s, %s, %s, %s)",
+                article_rows, batch_size, "articles")
+        article_ids = _ids(cursor, "SELECT ArticleID FROM article WHERE URL LIKE %s", (f"https://{BENCH_DOMAIN}/{run}/%",))
+
+        # Skewed toward a minority of articles, like real report traffic;
+        # (UserID, ArticleID) is unique so repeats are dropped by INSERT IGNORE
+        hot = article_ids[: max(1, len(article_ids) // 10)]
+        report_rows = {
+            (rng.choice(user_ids), rng.choice(hot) if rng.random() < 0.7 else rng.choice(article_ids))
+            for _ in range(reports)
+        }
+        _insert(cursor, conn,
+                "INSERT IGNORE INTO report (UserID, ArticleID, Reason) VALUES (%s, %s, %s)",
+                [(u, a, rng.choice(("misleading", "fabricated", "clickbait", None))) for u, a in report_rows],
+                batch_size, "reports")
+
+        _insert(cursor, conn,
+                "INSERT INTO credibilitycheck (ArticleID, FactCheckScore, FinalVerdict, CheckedBy) VALUES (%s, %s, %s, %s)",
+                [(rng.choice(article_ids), round(rng.random(), 2), rng.choice(VERDICTS), rng.choice(checker_ids))
+                 for _ in range(checks)],
+                batch_size, "credibility checks")
+        cursor.close()
+        bump_versions(conn, *VERSIONED_TABLES)
+
+
+def reset():
+    """Delete every synthetic row (reports/checks go with their articles and users)"""
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM article WHERE URL LIKE %s", (f"https://{BENCH_DOMAIN}/%",))
+        print(f"🗑️  {cursor.rowcount} articles removed")
+        cursor.execute("DELETE FROM source WHERE Domain LIKE %s", (f"%.{BENCH_DOMAIN}",))
+        print(f"🗑️  {cursor.rowcount} sources removed")
+        cursor.execute("DELETE FROM useraccount WHERE Email LIKE %s", (f"%@{BENCH_DOMAIN}",))
+        print(f"🗑️  {cursor.rowcount} users removed")
+        conn.commit()
+        cursor.close()
+        bump_versions(conn, *VERSIONED_TABLES)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark data")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--sources", type=int, default=100)
+    parser.add_argument("--articles", type=int, default=10000)
+    parser.add_argument("--reports", type=int, default=30000)
+    parser.add_argument("--checks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--reset", action="store_true", help="remove synthetic rows and exit")
+    args = parser.parse_args()
+
+    try:
+        if args.reset:
+            reset()
+        else:
+            seed(args.users, args.sources, args.articles, args.reports, args.checks, args.seed, args.batch_size)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        raise
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Production launcher: gunicorn with preloaded app and threaded workers
+The app (schema probe, one-time repairs) is imported once in the master and
+forked into WEB_WORKERS processes (one per core), each running WEB_THREADS
+request threads. Every worker opens its own MySQL connection pool and
+re-probes the schema after fork, and refreshes it again on its own SIGHUP.
+
+Workers share state through MySQL: ETags come from table_versions, and SSE
+events, response-cache invalidations and schema refreshes go through
+event_log (broadcast.py), which every worker polls. Run
+migrate_add_event_log.py before using more than one worker; until then
+those stay per process and the launcher warns. /metrics and the /api/health
+counters still describe the worker that answered the scrape.
+Each open SSE connection holds one request thread for its whole lifetime,
+so add the expected number of event-stream clients to WEB_THREADS.
+
+Settings (environment):
+  WEB_BIND              address to listen on            (0.0.0.0:5000)
+  WEB_WORKERS           worker processes                (CPU count)
+  WEB_THREADS           threads per worker              (DB_POOL_SIZE)
+  WEB_KEEPALIVE         keep-alive seconds              (5)
+  WEB_TIMEOUT           kill a silent worker after      (30)
+  WEB_GRACEFUL_TIMEOUT  drain time on restart/shutdown  (30)
+  WEB_MAX_REQUESTS      recycle a worker after N reqs   (0 = never)
+  WEB_BACKLOG           listen backlog                  (2048)
+
+Usage: python serve.py
+Graceful restart (also re-probes the schema in every worker):
+kill -HUP <master pid>; add/remove a worker: TTIN / TTOU
+"""
+
+import os
+
+from gunicorn.app.base import BaseApplication
+
+from db_config import POOL_CONFIG, dispose_pool, reset_pool
+from schema_registry import schema
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, str(default)))
+
+
+def gunicorn_settings():
+    """Pinned worker model; threads default to the per-worker pool size so a
+    request thread never waits for a database connection"""
+    max_requests = _env_int("WEB_MAX_REQUESTS", 0)
+    return {
+        "bind": os.environ.get("WEB_BIND", "0.0.0.0:5000"),
+        "workers": _env_int("WEB_WORKERS", os.cpu_count() or 1),
+        "worker_class": "gthread",
+        "threads": _env_int("WEB_THREADS", POOL_CONFIG["size"]),
+        "keepalive": _env_int("WEB_KEEPALIVE", 5),
+        "timeout": _env_int("WEB_TIMEOUT", 30),
+        "graceful_timeout": _env_int("WEB_GRACEFUL_TIMEOUT", 30),
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "backlog": _env_int("WEB_BACKLOG", 2048),
+        "preload_app": True,
+        "accesslog": os.environ.get("WEB_ACCESS_LOG", "-"),
+        "when_ready": when_ready,
+        "post_fork": post_fork,
+        "post_worker_init": post_worker_init,
+    }
+
+
+def when_ready(server):
+    if server.cfg.workers > 1 and not schema.has_table("event_log"):
+        server.log.warning(
+            "event_log is missing: SSE events and cache invalidation stay per worker "
+            "until migrate_add_event_log.py runs"
+        )
+    # The preloaded app used the DB in the master; close those connections
+    # so no socket is shared with the workers
+    dispose_pool()
+    server.log.info("App preloaded, master connections closed")
+
+
+def post_fork(server, worker):
+    reset_pool()
+    server.log.info(f"Worker {worker.pid} will open its own connection pool")
+
+
+def post_worker_init(worker):
+    # Runs after gunicorn installed the worker's signal handlers, which reset
+    # SIGHUP; the master's own HUP (graceful reload) is left untouched
+    from app import install_schema_refresh_signal
+    from broadcast import broadcaster
+
+    install_schema_refresh_signal()
+    try:
+        # The snapshot inherited from the master may predate a migration
+        schema.refresh()
+    except Exception as e:
+        worker.log.warning(f"Schema probe deferred: {e}")
+    broadcaster.start()
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        return app
+
+
+if __name__ == "__main__":
+    settings = gunicorn_settings()
+    print(
+        f"🚀 Serving on {settings['bind']} with {settings['workers']} workers "
+        f"x {settings['threads']} threads"
+    )
+    ProductionServer(settings).run()
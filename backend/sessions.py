@@ -0,0 +1,150 @@
+"""
+Session tokens issued at login / signup
+Tokens are random; only their SHA-256 is stored, in user_session with an
+expiry. Validation checks an in-process LRU first and falls back to one
+primary key lookup, so most authenticated requests cost no DB round trip.
+Cached entries are re-read from MySQL after SESSION_CACHE_TTL seconds, so
+a logout in another worker process, or a change of the user's role, takes
+effect within that window. The role is always read from useraccount;
+user_session.Role only records the role the session was issued with.
+"""
+
+import hashlib
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from db_config import db_connection
+
+SESSION_TTL = int(os.environ.get("SESSION_TTL", str(7 * 24 * 3600)))
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "10000"))
+SESSION_CACHE_TTL = float(os.environ.get("SESSION_CACHE_TTL", "60"))
+# Expired rows are purged on roughly one in PURGE_EVERY logins
+PURGE_EVERY = 100
+
+USER_SESSION_SQL = """
+    CREATE TABLE IF NOT EXISTS user_session (
+        TokenHash CHAR(64) PRIMARY KEY,
+        UserID INT NOT NULL,
+        Role VARCHAR(32) NOT NULL,
+        CreatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ExpiresAt DATETIME NOT NULL,
+        INDEX idx_session_expires (ExpiresAt),
+        INDEX idx_session_user (UserID),
+        FOREIGN KEY (UserID) REFERENCES useraccount(UserID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+
+def _digest(token):
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class SessionStore:
+    def __init__(self, ttl=SESSION_TTL, cache_size=SESSION_CACHE_SIZE, cache_ttl=SESSION_CACHE_TTL):
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()  # token hash -> (session dict, expires_at, cached_until)
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._stats = {"hits": 0, "misses": 0, "issued": 0, "revoked": 0, "rejected": 0}
+
+    def _remember(self, key, session, expires_at):
+        now = time.time()
+        with self._lock:
+            self._cache[key] = (session, expires_at, min(expires_at, now + self.cache_ttl))
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def issue(self, user_id, role):
+        """Create a session and return its token"""
+        token = secrets.token_urlsafe(32)
+        key = _digest(token)
+        # Expiry is computed by MySQL so it compares against the same NOW()
+        expires_at = time.time() + self.ttl
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT INTO user_session (TokenHash, UserID, Role, ExpiresAt) "
+                "VALUES (%s, %s, %s, DATE_ADD(NOW(), INTERVAL %s SECOND))",
+                (key, user_id, role, self.ttl),
+            )
+            with self._lock:
+                self._issued += 1
+                self._stats["issued"] += 1
+                purge = self._issued % PURGE_EVERY == 0
+            if purge:
+                cursor.execute("DELETE FROM user_session WHERE ExpiresAt < NOW() LIMIT 1000")
+            conn.commit()
+            cursor.close()
+        self._remember(key, {"user_id": user_id, "role": role}, expires_at)
+        return token
+
+    def validate(self, token):
+        """Session dict ({"user_id", "role"}) for a live token, else None"""
+        if not token:
+            return None
+        key = _digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[2] > now:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            self._stats["misses"] += 1
+
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT s.UserID, u.Role, TIMESTAMPDIFF(SECOND, NOW(), s.ExpiresAt) "
+                "FROM user_session s JOIN useraccount u ON u.UserID = s.UserID "
+                "WHERE s.TokenHash = %s AND s.ExpiresAt > NOW()",
+                (key,),
+            )
+            row = cursor.fetchone()
+            cursor.close()
+        if row is None:
+            with self._lock:
+                self._cache.pop(key, None)
+                self._stats["rejected"] += 1
+            return None
+        session = {"user_id": row[0], "role": row[1]}
+        self._remember(key, session, now + row[2])
+        return session
+
+    def revoke(self, token):
+        key = _digest(token)
+        with self._lock:
+            self._cache.pop(key, None)
+            self._stats["revoked"] += 1
+        with db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM user_session WHERE TokenHash = %s", (key,))
+            conn.commit()
+            cursor.close()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "cached": len(self._cache),
+                "cache_size": self.cache_size,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+session_store = SessionStore()
+
+
+def bearer_token(req):
+    """Token from 'Authorization: Bearer <token>', or None"""
+    header = req.headers.get("Authorization", "")
+    scheme, _, token = header.partition(" ")
+    return token.strip() if scheme.lower() == "bearer" and token.strip() else None
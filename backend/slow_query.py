@@ -0,0 +1,187 @@
+"""
+Opt-in slow-query profiler
+Statements slower than SLOW_QUERY_MS are recorded per query shape (the
+normalised text from metrics.normalize_sql). The first time a shape is
+seen, its EXPLAIN FORMAT=JSON plan is captured on a background thread
+using a separate pooled connection, so the slow request is not delayed further.
+From the plan it records the estimated rows examined, full table scans,
+filesorts and temporary tables. The newest SLOW_QUERY_BUFFER shapes are
+kept in a ring buffer, served by GET /api/admin/slow_queries.
+
+Enable with SLOW_QUERY_PROFILING=1.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import has_request_context, request
+
+from db_config import db_connection
+from metrics import normalize_sql
+
+PROFILING_ENABLED = os.environ.get("SLOW_QUERY_PROFILING", "0") in ("1", "true", "True")
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_BUFFER = int(os.environ.get("SLOW_QUERY_BUFFER", "100"))
+# Only these can be EXPLAINed without side effects
+EXPLAINABLE = ("SELECT", "WITH")
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def summarize_plan(plan):
+    """
+    Walk an EXPLAIN FORMAT=JSON document (MySQL or MariaDB layout) and pull
+    out per-table access, estimated rows examined and filesort / temp flags
+    """
+    tables = []
+    flags = {"filesort": False, "temporary": False}
+
+    def walk(node):
+        if isinstance(node, list):
+            for item in node:
+                walk(item)
+            return
+        if not isinstance(node, dict):
+            return
+        if node.get("using_filesort") or "filesort" in node:
+            flags["filesort"] = True
+        if node.get("using_temporary_table") or "temporary_table" in node:
+            flags["temporary"] = True
+        table = node.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            rows = table.get("rows_examined_per_scan", table.get("rows", 0)) or 0
+            tables.append({
+                "table": table["table_name"],
+                "access_type": table.get("access_type"),
+                "key": table.get("key"),
+                "rows": int(rows),
+            })
+        for value in node.values():
+            walk(value)
+
+    walk(plan)
+    return {
+        "rows_examined_estimate": sum(t["rows"] for t in tables),
+        "full_scans": [t["table"] for t in tables if t["access_type"] == "ALL"],
+        "filesort": flags["filesort"],
+        "temporary_table": flags["temporary"],
+        "tables": tables,
+    }
+
+
+class SlowQueryProfiler:
+    def __init__(self, threshold_ms=SLOW_QUERY_MS, capacity=SLOW_QUERY_BUFFER):
+        self.threshold = threshold_ms / 1000
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # shape -> entry, oldest first
+        self._local = threading.local()
+        self._queue = queue.Queue(maxsize=capacity)
+        self._worker_pid = None
+
+    def observe(self, statement, params, seconds, error):
+        """db_config query observer"""
+        if seconds < self.threshold or error is not None or getattr(self._local, "explaining", False):
+            return
+        shape = normalize_sql(statement)
+        route = request.url_rule.rule if has_request_context() and request.url_rule else None
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is not None:
+                entry["occurrences"] += 1
+                entry["last_ms"] = round(seconds * 1000, 2)
+                entry["max_ms"] = max(entry["max_ms"], entry["last_ms"])
+                entry["last_seen"] = _now()
+                if route and route not in entry["routes"]:
+                    entry["routes"].append(route)
+                self._entries.move_to_end(shape)
+                return
+            entry = {
+                "statement": shape,
+                "occurrences": 1,
+                "last_ms": round(seconds * 1000, 2),
+                "max_ms": round(seconds * 1000, 2),
+                "first_seen": _now(),
+                "last_seen": _now(),
+                "routes": [route] if route else [],
+                "plan": None,
+                "analysis": None,
+                "explain_error": None,
+            }
+            self._entries[shape] = entry
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        text = statement.decode("utf-8", "replace") if isinstance(statement, bytes) else str(statement)
+        if not text.lstrip().upper().startswith(EXPLAINABLE):
+            self._set(shape, explain_error="Only SELECT statements are explained")
+            return
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((shape, text, params))
+        except queue.Full:
+            self._set(shape, explain_error="Explain queue full")
+
+    def _set(self, shape, **fields):
+        with self._lock:
+            entry = self._entries.get(shape)
+            if entry is not None:
+                entry.update(fields)
+
+    def _ensure_worker(self):
+        # Threads do not survive fork; start one per worker process
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                self._worker_pid = os.getpid()
+                threading.Thread(target=self._explain_loop, name="slow-query-explain", daemon=True).start()
+
+    def _explain_loop(self):
+        self._local.explaining = True
+        while True:
+            shape, text, params = self._queue.get()
+            started = time.perf_counter()
+            plan = analysis = error = None
+            try:
+                with db_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("EXPLAIN FORMAT=JSON " + text, params or ())
+                    row = cursor.fetchone()
+                    cursor.close()
+                    conn.rollback()
+                plan = json.loads(row[0]) if row else None
+                analysis = summarize_plan(plan)
+            except Exception as e:
+                error = str(e)
+            self._set(
+                shape, plan=plan, analysis=analysis, explain_error=error,
+                explain_ms=round((time.perf_counter() - started) * 1000, 2),
+            )
+
+    def entries(self):
+        """Slowest first"""
+        with self._lock:
+            rows = [dict(entry, routes=list(entry["routes"])) for entry in self._entries.values()]
+        return sorted(rows, key=lambda e: e["max_ms"], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def describe(self):
+        return {
+            "enabled": PROFILING_ENABLED,
+            "threshold_ms": self.threshold * 1000,
+            "capacity": self.capacity,
+            "entries": self.entries(),
+        }
+
+
+profiler = SlowQueryProfiler()
@@ -0,0 +1,80 @@
+"""
+Streaming export for list endpoints
+Rows are read from an unbuffered cursor in fetchmany() batches and written
+straight to the response as NDJSON or CSV, so memory stays constant no
+matter how large the table is. If the client goes away mid-stream the
+connection is discarded rather than returned to the pool, which would
+first read (and throw away) the rest of the result.
+"""
+
+import csv
+import io
+import os
+import traceback
+
+from flask import Response, current_app
+
+from db_config import db_connection
+
+STREAM_FORMATS = ("ndjson", "csv")
+STREAM_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", "1000"))
+
+_MIMETYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_chunk(rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow(["" if v is None else v for v in row])
+    return buf.getvalue()
+
+
+def stream_query(query, params=(), fmt="ndjson", filename="export", batch_size=None):
+    """Return a Response that streams the result of `query` in the given format"""
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported stream format: {fmt}")
+    batch_size = batch_size or STREAM_BATCH_SIZE
+    # Grab the app's JSON encoder now - the generator runs outside the app context
+    json_dumps = current_app.json.dumps
+
+    def generate():
+        try:
+            with db_connection() as conn:
+                # Unbuffered cursor: rows stay on the wire until fetched
+                cursor = conn.cursor()
+                finished = False
+                try:
+                    cursor.execute(query, params)
+                    columns = cursor.column_names
+
+                    if fmt == "csv":
+                        yield _csv_chunk([columns])
+
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        if fmt == "csv":
+                            yield _csv_chunk(rows)
+                        else:
+                            yield "".join(json_dumps(dict(zip(columns, row))) + "\n" for row in rows)
+                    finished = True
+                finally:
+                    if finished:
+                        cursor.close()
+                    else:
+                        # Client went away (GeneratorExit) or the read failed:
+                        # rows may still be pending, so close the connection
+                        conn.discard()
+        except Exception:
+            traceback.print_exc()
+            raise
+
+    headers = {"X-Accel-Buffering": "no"}
+    if fmt == "csv":
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return Response(generate(), mimetype=_MIMETYPES[fmt], headers=headers)
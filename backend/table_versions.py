@@ -0,0 +1,120 @@
+"""
+Per-table change versions and conditional GET support
+Writers call bump_versions() once per committed transaction for the
+versioned tables they changed (including rows changed by triggers, e.g.
+source.TrustRating after a credibility check). Read endpoints derive an
+ETag from the versions of the tables they read and answer If-None-Match
+with 304 after a single primary key lookup, without running the real query.
+
+The bump runs as its own one-statement transaction after the write has
+committed, so the table's hot table_versions row is locked for that
+statement only - not for the length of every writing transaction, as the
+per-row triggers used to do (a bulk ingest held it until its commit and
+blocked every other writer of the table). Writes made outside this code
+base do not bump; their changes show up at the next bump of the table.
+"""
+
+import hashlib
+from functools import wraps
+
+from flask import Response, current_app, request
+
+import traceback
+
+from db_config import db_connection
+from schema_registry import schema
+
+VERSIONED_TABLES = ("useraccount", "source", "article", "report", "credibilitycheck")
+
+TABLE_VERSIONS_SQL = """
+    CREATE TABLE IF NOT EXISTS table_versions (
+        TableName VARCHAR(64) PRIMARY KEY,
+        Version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+        UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+
+# Per-row triggers from before bump_versions(); the migration drops them
+LEGACY_TRIGGERS = tuple(
+    f"{table}_version_after_{event}"
+    for table in VERSIONED_TABLES
+    for event in ("insert", "update", "delete")
+)
+
+
+def bump_versions(conn, *tables):
+    """
+    Bump each of `tables` once, in a transaction of its own on `conn`.
+    Call after the write's commit. Never raises: the write already succeeded,
+    and a missed bump only delays ETag changes until the next one.
+    """
+    tables = sorted(set(tables))
+    if not tables:
+        return
+    try:
+        if not schema.has_table("table_versions"):
+            return
+        placeholders = ", ".join(["%s"] * len(tables))
+        cursor = conn.cursor()
+        cursor.execute(
+            f"UPDATE table_versions SET Version = Version + 1 WHERE TableName IN ({placeholders})",
+            tuple(tables),
+        )
+        conn.commit()
+        cursor.close()
+    except Exception:
+        traceback.print_exc()
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+
+
+def current_versions(tables):
+    """Read the version of each table in one primary key lookup"""
+    placeholders = ", ".join(["%s"] * len(tables))
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"SELECT TableName, Version FROM table_versions WHERE TableName IN ({placeholders})",
+            tuple(tables),
+        )
+        versions = dict(cursor.fetchall())
+        cursor.close()
+    return {table: int(versions.get(table, 0)) for table in tables}
+
+
+def make_etag(versions, extra=""):
+    raw = extra + "|" + ",".join(f"{t}={v}" for t, v in sorted(versions.items()))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def conditional(*tables):
+    """
+    Emit an ETag built from the versions of `tables` (plus the request path
+    and query string) and answer a matching If-None-Match with 304.
+    Place it below @app.route. A no-op until table_versions is migrated.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                if not schema.has_table("table_versions"):
+                    return view(*args, **kwargs)
+                etag = make_etag(current_versions(tables), request.full_path)
+            except Exception:
+                # Version lookup failing must never break the read itself
+                return view(*args, **kwargs)
+
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
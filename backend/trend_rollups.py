@@ -0,0 +1,329 @@
+"""
+Time-bucketed rollups for the trend analytics
+An incremental job folds new rows into hourly and daily aggregates:
+- report_rollup_hourly / report_rollup_daily: reports per bucket
+- check_rollup_hourly / check_rollup_daily: checks per bucket, source and
+  verdict, with the score sum (TrustRating = ScoreSum / Checks * 100)
+New reports and checks are queued in job_pending by AFTER INSERT triggers,
+in the inserting transaction. A run folds a batch of queued rows and
+dequeues them in the same transaction, so each row is counted once, whatever
+order ids commit in. Rows deleted after they were folded stay counted until
+rebuild() recomputes their date range from the base tables (every row that
+is no longer queued).
+GET /api/analytics/trends/* read only the rollup tables.
+"""
+
+import os
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from db_config import db_connection
+from schema_registry import schema
+from verdict_propagation import clear_pending, pending_ids
+
+ROLLUP_BATCH_SIZE = int(os.environ.get("ROLLUP_BATCH_SIZE", "5000"))
+REPORT_JOB = "trend_rollups.reports"
+CHECK_JOB = "trend_rollups.checks"
+# job -> (table, id column) whose inserts it folds
+PENDING_SOURCES = {
+    REPORT_JOB: ("report", "ReportID"),
+    CHECK_JOB: ("credibilitycheck", "CheckID"),
+}
+LOCK_NAME = "trend_rollups"
+
+# granularity -> longest range served, default range (days)
+MAX_DAYS = {"hour": 31, "day": 366, "week": 1830}
+DEFAULT_DAYS = {"hour": 2, "day": 30, "week": 182}
+
+REPORT_ROLLUP_HOURLY_SQL = """
+    CREATE TABLE IF NOT EXISTS report_rollup_hourly (
+        BucketStart DATETIME PRIMARY KEY,
+        Reports INT NOT NULL DEFAULT 0
+    )
+"""
+
+REPORT_ROLLUP_DAILY_SQL = """
+    CREATE TABLE IF NOT EXISTS report_rollup_daily (
+        BucketDate DATE PRIMARY KEY,
+        Reports INT NOT NULL DEFAULT 0
+    )
+"""
+
+CHECK_ROLLUP_HOURLY_SQL = """
+    CREATE TABLE IF NOT EXISTS check_rollup_hourly (
+        BucketStart DATETIME NOT NULL,
+        SourceID INT NOT NULL,
+        FinalVerdict ENUM('Fake','Real','Unverified') NOT NULL,
+        Checks INT NOT NULL DEFAULT 0,
+        ScoreSum DECIMAL(14,4) NOT NULL DEFAULT 0,
+        PRIMARY KEY (BucketStart, SourceID, FinalVerdict),
+        INDEX idx_check_hourly_source (SourceID, BucketStart)
+    )
+"""
+
+CHECK_ROLLUP_DAILY_SQL = """
+    CREATE TABLE IF NOT EXISTS check_rollup_daily (
+        BucketDate DATE NOT NULL,
+        SourceID INT NOT NULL,
+        FinalVerdict ENUM('Fake','Real','Unverified') NOT NULL,
+        Checks INT NOT NULL DEFAULT 0,
+        ScoreSum DECIMAL(14,4) NOT NULL DEFAULT 0,
+        PRIMARY KEY (BucketDate, SourceID, FinalVerdict),
+        INDEX idx_check_daily_source (SourceID, BucketDate)
+    )
+"""
+
+# rollup level (table suffix) -> (bucket column, bucket expression over a timestamp)
+LEVELS = {
+    "hourly": ("BucketStart", "TIMESTAMP(DATE({col}), MAKETIME(HOUR({col}), 0, 0))"),
+    "daily": ("BucketDate", "DATE({col})"),
+}
+# granularity served -> (rollup level, expression over its bucket column)
+GRANULARITIES = {
+    "hour": ("hourly", "{col}"),
+    "day": ("daily", "{col}"),
+    "week": ("daily", "DATE_SUB({col}, INTERVAL WEEKDAY({col}) DAY)"),  # Monday
+}
+
+
+class TrendQueryError(ValueError):
+    """Invalid granularity or date range"""
+
+
+def parse_trend_range(args, granularities=tuple(GRANULARITIES), default="day"):
+    """
+    (granularity, start, end) from ?granularity=&from=YYYY-MM-DD&to=YYYY-MM-DD.
+    `to` is inclusive; the returned end is exclusive. Weekly ranges start on
+    a Monday so the first week is not partial.
+    """
+    granularity = args.get("granularity", default)
+    if granularity not in granularities:
+        raise TrendQueryError(f"granularity must be one of: {', '.join(granularities)}")
+    try:
+        last = date.fromisoformat(args["to"]) if args.get("to") else date.today()
+        start = (date.fromisoformat(args["from"]) if args.get("from")
+                 else last - timedelta(days=DEFAULT_DAYS[granularity] - 1))
+    except ValueError:
+        raise TrendQueryError("from / to must be dates (YYYY-MM-DD)")
+    if granularity == "week":
+        start -= timedelta(days=start.weekday())
+    end = last + timedelta(days=1)
+    if start >= end:
+        raise TrendQueryError("from must not be after to")
+    if (end - start).days > MAX_DAYS[granularity]:
+        raise TrendQueryError(f"at most {MAX_DAYS[granularity]} days per request at granularity={granularity}")
+    return granularity, start, end
+
+
+def _json_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _report_rollup_sql(level, where):
+    column, bucket = LEVELS[level]
+    table = f"report_rollup_{level}"
+    return f"""
+        INSERT INTO {table} ({column}, Reports)
+        SELECT {bucket.format(col="r.ReportDate")}, COUNT(*)
+        FROM report r
+        WHERE {where}
+        GROUP BY 1
+        ON DUPLICATE KEY UPDATE Reports = {table}.Reports + VALUES(Reports)
+    """
+
+
+def _check_rollup_sql(level, where):
+    column, bucket = LEVELS[level]
+    table = f"check_rollup_{level}"
+    return f"""
+        INSERT INTO {table} ({column}, SourceID, FinalVerdict, Checks, ScoreSum)
+        SELECT {bucket.format(col="c.CheckDate")}, a.SourceID,
+               COALESCE(c.FinalVerdict, 'Unverified'), COUNT(*),
+               SUM(COALESCE(c.FactCheckScore, 0))
+        FROM credibilitycheck c
+        JOIN article a ON a.ArticleID = c.ArticleID
+        WHERE {where}
+        GROUP BY 1, 2, 3
+        ON DUPLICATE KEY UPDATE
+            Checks = {table}.Checks + VALUES(Checks),
+            ScoreSum = {table}.ScoreSum + VALUES(ScoreSum)
+    """
+
+
+# Base table and rollups of each fact; `alias` is the base table's alias in
+# the rollup SQL
+FACTS = {
+    "reports": {
+        "table": "report", "alias": "r", "id": "ReportID", "date": "ReportDate",
+        "job": REPORT_JOB, "rollup": "report_rollup", "sql": _report_rollup_sql,
+    },
+    "checks": {
+        "table": "credibilitycheck", "alias": "c", "id": "CheckID", "date": "CheckDate",
+        "job": CHECK_JOB, "rollup": "check_rollup", "sql": _check_rollup_sql,
+    },
+}
+
+
+def _advance(cursor, fact, batch_size):
+    """Fold the next batch of queued rows; returns rows dequeued"""
+    spec = FACTS[fact]
+    ids = pending_ids(cursor, spec["job"], batch_size)
+    if not ids:
+        return 0
+    # Rows deleted since they were queued simply match nothing
+    where = f"{spec['alias']}.{spec['id']} IN ({', '.join(['%s'] * len(ids))})"
+    for level in LEVELS:
+        cursor.execute(spec["sql"](level, where), tuple(ids))
+    clear_pending(cursor, spec["job"], ids)
+    return len(ids)
+
+
+def _locked(cursor):
+    cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+    return bool(cursor.fetchone()[0])
+
+
+def run_once(batch_size=ROLLUP_BATCH_SIZE):
+    """Fold up to batch_size new reports and checks; returns stats"""
+    started = time.monotonic()
+    stats = {"reports": 0, "checks": 0}
+    if not schema.has_table("job_pending"):
+        return {**stats, "skipped": "job_pending missing - run migrate_add_trend_rollups.py"}
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        if not _locked(cursor):
+            cursor.close()
+            return {**stats, "skipped": "another run is in progress"}
+        try:
+            for fact in FACTS:
+                stats[fact] = _advance(cursor, fact, batch_size)
+            # Aggregates and the dequeue commit together
+            conn.commit()
+        finally:
+            cursor.execute("DO RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.close()
+    stats["elapsed_ms"] = round((time.monotonic() - started) * 1000, 2)
+    return stats
+
+
+def rebuild(start, end):
+    """
+    Recompute the buckets in [start, end) (dates) from the base tables.
+    Rows still queued are left for the incremental run, so nothing is
+    counted twice; every other row in the range is counted.
+    """
+    started = time.monotonic()
+    stats = {}
+    if not schema.has_table("job_pending"):
+        return {"skipped": "job_pending missing - run migrate_add_trend_rollups.py"}
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        if not _locked(cursor):
+            cursor.close()
+            return {"skipped": "another run is in progress"}
+        try:
+            for fact, spec in FACTS.items():
+                alias = spec["alias"]
+                where = (
+                    f"{alias}.{spec['date']} >= %s AND {alias}.{spec['date']} < %s "
+                    f"AND NOT EXISTS (SELECT 1 FROM job_pending p "
+                    f"WHERE p.JobName = %s AND p.RowID = {alias}.{spec['id']})"
+                )
+                for level, (column, _) in LEVELS.items():
+                    cursor.execute(
+                        f"DELETE FROM {spec['rollup']}_{level} WHERE {column} >= %s AND {column} < %s",
+                        (start, end),
+                    )
+                    cursor.execute(spec["sql"](level, where), (start, end, spec["job"]))
+                cursor.execute("SELECT COUNT(*) FROM job_pending WHERE JobName = %s", (spec["job"],))
+                stats[fact] = {"pending": cursor.fetchone()[0]}
+            conn.commit()
+        finally:
+            cursor.execute("DO RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.close()
+    stats["elapsed_ms"] = round((time.monotonic() - started) * 1000, 2)
+    return stats
+
+
+def _bucket(granularity):
+    level, expr = GRANULARITIES[granularity]
+    column = LEVELS[level][0]
+    return level, column, expr.format(col=column)
+
+
+def report_trend(cursor, granularity, start, end):
+    """Reports per bucket"""
+    level, column, bucket = _bucket(granularity)
+    cursor.execute(f"""
+        SELECT {bucket} AS Bucket, SUM(Reports) AS Reports
+        FROM report_rollup_{level}
+        WHERE {column} >= %s AND {column} < %s
+        GROUP BY Bucket
+        ORDER BY Bucket
+    """, (start, end))
+    return [{"Bucket": _json_value(b), "Reports": int(n)} for b, n in cursor.fetchall()]
+
+
+def verdict_trend(cursor, granularity, start, end, source_id=None):
+    """Verdict mix per bucket, optionally for one source"""
+    level, column, bucket = _bucket(granularity)
+    where = f"{column} >= %s AND {column} < %s"
+    params = [start, end]
+    if source_id is not None:
+        where += " AND SourceID = %s"
+        params.append(source_id)
+    cursor.execute(f"""
+        SELECT {bucket} AS Bucket,
+               SUM(IF(FinalVerdict = 'Fake', Checks, 0)) AS Fake,
+               SUM(IF(FinalVerdict = 'Real', Checks, 0)) AS `Real`,
+               SUM(IF(FinalVerdict = 'Unverified', Checks, 0)) AS Unverified,
+               SUM(Checks) AS Total
+        FROM check_rollup_{level}
+        WHERE {where}
+        GROUP BY Bucket
+        ORDER BY Bucket
+    """, tuple(params))
+    return [
+        {"Bucket": _json_value(b), "Fake": int(fake), "Real": int(real),
+         "Unverified": int(unverified), "Total": int(total)}
+        for b, fake, real, unverified, total in cursor.fetchall()
+    ]
+
+
+def source_trust_trend(cursor, source_id, granularity, start, end):
+    """
+    Per bucket: checks, the average score of that bucket, and TrustRating
+    as it stood at the end of the bucket (running ScoreSum / Checks * 100,
+    the same formula the triggers use)
+    """
+    level, column, bucket = _bucket(granularity)
+    # Everything before the range, from the daily rollup (start is a date)
+    cursor.execute("""
+        SELECT COALESCE(SUM(ScoreSum), 0), COALESCE(SUM(Checks), 0)
+        FROM check_rollup_daily
+        WHERE SourceID = %s AND BucketDate < %s
+    """, (source_id, start))
+    score_total, check_total = cursor.fetchone()
+    cursor.execute(f"""
+        SELECT {bucket} AS Bucket, SUM(Checks), SUM(ScoreSum)
+        FROM check_rollup_{level}
+        WHERE SourceID = %s AND {column} >= %s AND {column} < %s
+        GROUP BY Bucket
+        ORDER BY Bucket
+    """, (source_id, start, end))
+    buckets = []
+    for b, checks, score_sum in cursor.fetchall():
+        score_total += score_sum
+        check_total += checks
+        buckets.append({
+            "Bucket": _json_value(b),
+            "Checks": int(checks),
+            "AvgScore": round(float(score_sum) / int(checks) * 100, 2) if checks else None,
+            "TrustRating": round(float(score_total) / int(check_total) * 100, 2) if check_total else None,
+        })
+    return buckets
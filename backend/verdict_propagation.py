@@ -0,0 +1,318 @@
+"""
+Verdict propagation across near-duplicate articles
+An incremental job that
+- assigns newly indexed articles (article_minhash) to content clusters,
+  merging clusters when an article bridges two of them
+- suggests a verdict for unchecked articles from the verdicts of their
+  near-duplicates, weighted by similarity
+- re-suggests for the unchecked members of a cluster when one of its
+  articles receives a new credibility check
+New rows are queued in job_pending by AFTER INSERT triggers, in the
+inserting transaction, so a row becomes pending exactly when it commits.
+Each run takes a batch of pending ids and deletes them in the transaction
+that stores the results. (An id high-water mark would skip a row whose
+lower id commits after a higher one has been processed.)
+"""
+
+import os
+import time
+
+from db_config import db_connection
+from near_duplicates import find_near_duplicates
+from schema_registry import schema
+
+PROPAGATION_BATCH_SIZE = int(os.environ.get("PROPAGATION_BATCH_SIZE", "500"))
+ARTICLE_JOB = "verdict_propagation.articles"
+CHECK_JOB = "verdict_propagation.checks"
+# job -> (table, id column) whose inserts it processes
+PENDING_SOURCES = {
+    ARTICLE_JOB: ("article_minhash", "ArticleID"),
+    CHECK_JOB: ("credibilitycheck", "CheckID"),
+}
+# MySQL named lock so overlapping runs (cron, several workers) can't interleave
+LOCK_NAME = "verdict_propagation"
+
+JOB_WATERMARK_SQL = """
+    CREATE TABLE IF NOT EXISTS job_watermark (
+        JobName VARCHAR(64) PRIMARY KEY,
+        LastID BIGINT NOT NULL DEFAULT 0,
+        UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    )
+"""
+
+JOB_PENDING_SQL = """
+    CREATE TABLE IF NOT EXISTS job_pending (
+        JobName VARCHAR(64) NOT NULL,
+        RowID BIGINT NOT NULL,
+        PRIMARY KEY (JobName, RowID)
+    )
+"""
+
+ARTICLE_CLUSTER_SQL = """
+    CREATE TABLE IF NOT EXISTS article_cluster (
+        ArticleID INT PRIMARY KEY,
+        ClusterID INT NOT NULL,
+        INDEX idx_cluster (ClusterID),
+        FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+CLUSTER_SIZE_SQL = """
+    CREATE TABLE IF NOT EXISTS article_cluster_size (
+        ClusterID INT PRIMARY KEY,
+        Size INT NOT NULL
+    )
+"""
+
+SUGGESTED_VERDICT_SQL = """
+    CREATE TABLE IF NOT EXISTS suggested_verdict (
+        ArticleID INT PRIMARY KEY,
+        SuggestedVerdict ENUM('Fake','Real') NOT NULL,
+        Confidence DECIMAL(4,3) NOT NULL,
+        BasedOnArticleID INT NOT NULL,
+        UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        FOREIGN KEY (ArticleID) REFERENCES article(ArticleID)
+            ON DELETE CASCADE ON UPDATE CASCADE
+    )
+"""
+
+SUGGESTION_UPSERT_SQL = """
+    INSERT INTO suggested_verdict (ArticleID, SuggestedVerdict, Confidence, BasedOnArticleID)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        SuggestedVerdict = VALUES(SuggestedVerdict),
+        Confidence = VALUES(Confidence),
+        BasedOnArticleID = VALUES(BasedOnArticleID)
+"""
+
+
+def _in(values):
+    return ", ".join(["%s"] * len(values))
+
+
+def get_watermark(cursor, job):
+    cursor.execute("SELECT LastID FROM job_watermark WHERE JobName = %s", (job,))
+    row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def pending_trigger_name(job):
+    return job.replace(".", "_") + "_pending"
+
+
+def pending_trigger_sql(job, table, id_column):
+    """AFTER INSERT trigger that queues each new row of `table` for `job`"""
+    return f"""
+        CREATE TRIGGER {pending_trigger_name(job)}
+        AFTER INSERT ON {table}
+        FOR EACH ROW
+            INSERT IGNORE INTO job_pending (JobName, RowID) VALUES ('{job}', NEW.{id_column})
+    """
+
+
+def install_pending(cursor, conn, job, table, id_column):
+    """
+    Create job's queueing trigger and queue the rows past its old watermark
+    (all rows for a new job). Returns rows queued, or None if the trigger
+    already existed - re-queueing then would process rows twice.
+    CREATE TRIGGER waits for open transactions on `table`, so every row the
+    trigger misses is committed and visible to the backlog query.
+    """
+    cursor.execute(JOB_PENDING_SQL)
+    cursor.execute(
+        "SELECT 1 FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME = %s",
+        (pending_trigger_name(job),),
+    )
+    if cursor.fetchone():
+        return None
+    cursor.execute(pending_trigger_sql(job, table, id_column))
+    cursor.execute(
+        f"INSERT IGNORE INTO job_pending (JobName, RowID) SELECT %s, {id_column} FROM {table} WHERE {id_column} > %s",
+        (job, get_watermark(cursor, job)),
+    )
+    queued = cursor.rowcount
+    conn.commit()
+    return queued
+
+
+def pending_ids(cursor, job, limit):
+    """Oldest `limit` queued ids of job"""
+    cursor.execute(
+        "SELECT RowID FROM job_pending WHERE JobName = %s ORDER BY RowID LIMIT %s",
+        (job, limit),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def clear_pending(cursor, job, ids):
+    """Dequeue ids; commit together with the work done for them"""
+    if ids:
+        cursor.execute(
+            f"DELETE FROM job_pending WHERE JobName = %s AND RowID IN ({_in(ids)})",
+            (job, *ids),
+        )
+
+
+def suggest_verdict(matches):
+    """
+    Similarity-weighted vote over the checked near-duplicates.
+    Returns (verdict, confidence, based_on_article_id) or None.
+    Confidence is the winning share of the vote scaled by the similarity of
+    the closest article that carries the winning verdict.
+    """
+    weights = {}
+    best = {}
+    for match in matches:
+        verdict = match["FinalVerdict"]
+        if verdict not in ("Fake", "Real"):
+            continue
+        weights[verdict] = weights.get(verdict, 0.0) + match["Similarity"]
+        if verdict not in best or match["Similarity"] > best[verdict]["Similarity"]:
+            best[verdict] = match
+    if not weights:
+        return None
+    verdict = max(weights, key=weights.get)
+    share = weights[verdict] / sum(weights.values())
+    closest = best[verdict]
+    return verdict, round(share * closest["Similarity"], 3), closest["ArticleID"]
+
+
+def _checked(cursor, article_ids):
+    if not article_ids:
+        return set()
+    cursor.execute(
+        f"SELECT DISTINCT ArticleID FROM credibilitycheck WHERE ArticleID IN ({_in(article_ids)})",
+        tuple(article_ids),
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+def _assign_clusters(cursor, article_ids, matches):
+    """Put each new article in the cluster of its matches (merging if several)"""
+    touched = set()
+    merged = set()
+    for article_id in article_ids:
+        match_ids = [m["ArticleID"] for m in matches.get(article_id, [])]
+        clusters = set()
+        if match_ids:
+            cursor.execute(
+                f"SELECT DISTINCT ClusterID FROM article_cluster WHERE ArticleID IN ({_in(match_ids)})",
+                tuple(match_ids),
+            )
+            clusters = {row[0] for row in cursor.fetchall()}
+        target = min(clusters | {article_id})
+        others = clusters - {target}
+        if others:
+            cursor.execute(
+                f"UPDATE article_cluster SET ClusterID = %s WHERE ClusterID IN ({_in(others)})",
+                (target, *others),
+            )
+            merged |= others
+        cursor.execute("""
+            INSERT INTO article_cluster (ArticleID, ClusterID) VALUES (%s, %s)
+            ON DUPLICATE KEY UPDATE ClusterID = VALUES(ClusterID)
+        """, (article_id, target))
+        touched.add(target)
+
+    touched -= merged
+    if merged:
+        cursor.execute(f"DELETE FROM article_cluster_size WHERE ClusterID IN ({_in(merged)})", tuple(merged))
+    if touched:
+        # Recount only the clusters this batch changed
+        cursor.execute(f"""
+            REPLACE INTO article_cluster_size (ClusterID, Size)
+            SELECT ClusterID, COUNT(*) FROM article_cluster
+            WHERE ClusterID IN ({_in(touched)})
+            GROUP BY ClusterID
+        """, tuple(touched))
+    return touched
+
+
+def _suggest(cursor, article_ids, matches):
+    """Upsert (or clear) suggestions for the unchecked articles in article_ids"""
+    unchecked = [a for a in article_ids if a not in _checked(cursor, article_ids)]
+    upserts = []
+    cleared = []
+    for article_id in unchecked:
+        suggestion = suggest_verdict(matches.get(article_id, []))
+        if suggestion:
+            upserts.append((article_id, *suggestion))
+        else:
+            cleared.append(article_id)
+    if upserts:
+        cursor.executemany(SUGGESTION_UPSERT_SQL, upserts)
+    if cleared:
+        cursor.execute(f"DELETE FROM suggested_verdict WHERE ArticleID IN ({_in(cleared)})", tuple(cleared))
+    return len(upserts)
+
+
+def _signatures(cursor, article_ids):
+    cursor.execute(
+        f"SELECT ArticleID, Signature FROM article_minhash WHERE ArticleID IN ({_in(article_ids)}) ORDER BY ArticleID",
+        tuple(article_ids),
+    )
+    return cursor.fetchall()
+
+
+def run_once(batch_size=PROPAGATION_BATCH_SIZE):
+    """Process up to batch_size new articles and new checks; returns stats"""
+    started = time.monotonic()
+    stats = {"articles": 0, "checks": 0, "clusters_touched": 0, "suggestions": 0}
+    if not schema.has_table("job_pending"):
+        return {**stats, "skipped": "job_pending missing - run migrate_add_verdict_propagation.py"}
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT GET_LOCK(%s, 0)", (LOCK_NAME,))
+        if not cursor.fetchone()[0]:
+            cursor.close()
+            return {**stats, "skipped": "another run is in progress"}
+        try:
+            # 1. Newly indexed articles -> clusters + suggestions
+            queued = pending_ids(cursor, ARTICLE_JOB, batch_size)
+            # Articles deleted since they were queued have no signature left
+            rows = _signatures(cursor, queued) if queued else []
+            if rows:
+                article_ids = [row[0] for row in rows]
+                matches = find_near_duplicates(cursor, rows)
+                stats["clusters_touched"] = len(_assign_clusters(cursor, article_ids, matches))
+                stats["suggestions"] += _suggest(cursor, article_ids, matches)
+            clear_pending(cursor, ARTICLE_JOB, queued)
+            stats["articles"] = len(queued)
+
+            # 2. New checks -> drop suggestions that are now real verdicts and
+            #    refresh the unchecked members of the affected clusters
+            queued = pending_ids(cursor, CHECK_JOB, batch_size)
+            checks = []
+            if queued:
+                cursor.execute(
+                    f"SELECT CheckID, ArticleID FROM credibilitycheck WHERE CheckID IN ({_in(queued)})",
+                    tuple(queued),
+                )
+                checks = cursor.fetchall()
+            if checks:
+                checked_ids = sorted({row[1] for row in checks})
+                cursor.execute(
+                    f"DELETE FROM suggested_verdict WHERE ArticleID IN ({_in(checked_ids)})",
+                    tuple(checked_ids),
+                )
+                cursor.execute(f"""
+                    SELECT DISTINCT member.ArticleID
+                    FROM article_cluster checked
+                    JOIN article_cluster member ON member.ClusterID = checked.ClusterID
+                    WHERE checked.ArticleID IN ({_in(checked_ids)})
+                """, tuple(checked_ids))
+                members = sorted({row[0] for row in cursor.fetchall()} - set(checked_ids))
+                if members:
+                    signed = _signatures(cursor, members)
+                    matches = find_near_duplicates(cursor, signed)
+                    stats["suggestions"] += _suggest(cursor, [row[0] for row in signed], matches)
+            clear_pending(cursor, CHECK_JOB, queued)
+            stats["checks"] = len(queued)
+
+            conn.commit()
+        finally:
+            cursor.execute("DO RELEASE_LOCK(%s)", (LOCK_NAME,))
+            cursor.close()
+    stats["elapsed_ms"] = round((time.monotonic() - started) * 1000, 2)
+    return stats
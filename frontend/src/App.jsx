@@ -1,4 +1,5 @@
 import React, { useMemo, useState, useEffect, useContext } from "react";
+import axios from "axios";
 import "bootstrap/dist/css/bootstrap.min.css";
 import "./App.css";
 import AddUser from "./components/AddUser";
@@ -30,15 +31,21 @@ function useAuth() {
   useEffect(() => {
     if (auth) localStorage.setItem("nid_auth", JSON.stringify(auth));
     else localStorage.removeItem("nid_auth");
+    // Session token lets the API resolve the caller's role without a lookup
+    if (auth?.token) axios.defaults.headers.common["Authorization"] = `Bearer ${auth.token}`;
+    else delete axios.defaults.headers.common["Authorization"];
   }, [auth]);
 
-  const logout = () => setAuth(null);
+  const logout = () => {
+    if (auth?.token) axios.post("/api/auth/logout").catch(() => {});
+    setAuth(null);
+  };
   return { auth, setAuth, logout };
 }
 
 function LoginSignup({ onAuth }) {
   const [mode, setMode] = useState("login");
-  const [form, setForm] = useState({ name: "", email: "", password: "", role: "user" });
+  const [form, setForm] = useState({ name: "", email: "", password: "" });
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
@@ -52,7 +59,7 @@ function LoginSignup({ onAuth }) {
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify(
           mode === "signup"
-            ? { name: form.name, email: form.email, password: form.password, role: form.role }
+            ? { name: form.name, email: form.email, password: form.password }
             : { email: form.email, password: form.password }
         ),
       });
@@ -88,17 +95,6 @@ function LoginSignup({ onAuth }) {
             <label className="form-label">Password</label>
             <input type="password" className="form-control" required value={form.password} onChange={(e)=>setForm({...form, password:e.target.value})} />
           </div>
-          {mode === "signup" && (
-            <div className="col-md-6">
-              <label className="form-label">Role</label>
-              <select className="form-control" value={form.role} onChange={(e)=>setForm({...form, role:e.target.value})}>
-                <option value="user">user</option>
-                <option value="reporter">reporter</option>
-                <option value="fact-checker">fact-checker</option>
-                <option value="admin">admin</option>
-              </select>
-            </div>
-          )}
           <div className="col-12 d-flex gap-2">
             <button className="btn btn-primary" disabled={loading} type="submit">{loading ? "Please wait..." : (mode === "signup" ? "Create Account" : "Sign In")}</button>
             <button className="btn btn-outline-primary" type="button" onClick={()=>setMode(mode === "signup" ? "login" : "signup")}>{mode === "signup" ? "Have an account? Sign in" : "New here? Sign up"}</button>
@@ -212,7 +208,7 @@ function App() {
             <h5 className="mb-0">🧠 Perform Credibility Check</h5>
           </div>
           <div className="card-body">
-            <PerformCheck onSuccess={handleDataUpdate} />
+            <PerformCheck user={authState.auth.user} onSuccess={handleDataUpdate} />
           </div>
         </div>
       )}
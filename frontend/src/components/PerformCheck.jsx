@@ -1,57 +1,37 @@
 import React, { useState, useEffect } from "react";
 import axios from "axios";
 
-export default function PerformCheck({ onSuccess }) {
+// The API records the check as the signed-in user (from the session token)
+export default function PerformCheck({ user, onSuccess }) {
   const [form, setForm] = useState({
     article_id: "",
     factcheck_score: "0.50",
     final_verdict: "Unverified",
-    checked_by: "",
   });
   const [articles, setArticles] = useState([]);
-  const [users, setUsers] = useState([]);
-  const [factCheckers, setFactCheckers] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState("");
 
   useEffect(() => {
     axios.get("/api/articles").then((res) => setArticles(res.data)).catch(() => setArticles([]));
-    axios.get("/api/users").then((res) => {
-      setUsers(res.data);
-      // Filter only fact-checkers and admins
-      const authorizedUsers = res.data.filter(u => u.Role === 'fact-checker' || u.Role === 'admin');
-      setFactCheckers(authorizedUsers);
-    }).catch(() => {
-      setUsers([]);
-      setFactCheckers([]);
-    });
   }, []);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
     setError("");
     
-    // Validate that selected user is a fact-checker or admin
-    const selectedUser = users.find(u => u.UserID === parseInt(form.checked_by));
-    if (selectedUser && selectedUser.Role !== 'fact-checker' && selectedUser.Role !== 'admin') {
-      setError("Only fact-checkers and admins can perform credibility checks. Please select an authorized user.");
-      return;
-    }
-    
     try {
       setLoading(true);
       const res = await axios.post("/api/perform_check", {
         article_id: parseInt(form.article_id),
         factcheck_score: parseFloat(form.factcheck_score),
         final_verdict: form.final_verdict,
-        checked_by: parseInt(form.checked_by),
       });
       alert(res.data.message || "Check recorded");
       setForm({
         article_id: "",
         factcheck_score: "0.50",
         final_verdict: "Unverified",
-        checked_by: "",
       });
       if (typeof onSuccess === "function") onSuccess();
     } catch (err) {
@@ -74,11 +54,6 @@ export default function PerformCheck({ onSuccess }) {
           <strong>⚠️ Error:</strong> {error}
         </div>
       )}
-      {factCheckers.length === 0 && (
-        <div className="alert alert-warning mb-3">
-          <strong>⚠️ No authorized users found:</strong> Please create a user with role "fact-checker" or "admin" to perform credibility checks.
-        </div>
-      )}
       <form onSubmit={handleSubmit}>
         <div className="mb-3">
           <label className="form-label">Article</label>
@@ -127,26 +102,15 @@ export default function PerformCheck({ onSuccess }) {
         </div>
 
         <div className="mb-3">
-          <label className="form-label">Checked By (Fact-Checker/Admin Only)</label>
-          <select
+          <label className="form-label">Checked By</label>
+          <input
+            type="text"
             className="form-control"
-            value={form.checked_by}
-            onChange={(e) => {
-              setForm({ ...form, checked_by: e.target.value });
-              setError("");
-            }}
-            required
-            disabled={factCheckers.length === 0}
-          >
-            <option value="">-- Select a fact-checker or admin --</option>
-            {factCheckers.map((u) => (
-              <option key={u.UserID} value={u.UserID}>
-                {u.Name} ({u.Role})
-              </option>
-            ))}
-          </select>
+            value={user ? `${user.Name} (${user.Role})` : ""}
+            readOnly
+          />
           <small className="form-text text-muted">
-            Only fact-checkers and admins are authorized to perform credibility checks
+            Checks are recorded as the signed-in fact-checker or admin
           </small>
         </div>
 
@@ -11,32 +11,18 @@ const ViewSources = () => {
 
   const fetchSources = async () => {
     try {
-      const response = await fetch('http://localhost:5000/api/sources');
+      // Average credibility comes back with each source from one grouped query
+      const response = await fetch('http://localhost:5000/api/sources?include=avg_credibility');
       if (!response.ok) {
         throw new Error('Failed to fetch sources');
       }
       const data = await response.json();
       setSources(data);
-      
-      // Fetch average credibility for each source using the function (in parallel)
-      const scorePromises = data.map(async (source) => {
-        try {
-          const scoreResponse = await fetch(`http://localhost:5000/api/sources/${source.SourceID}/avg_credibility`);
-          if (scoreResponse.ok) {
-            const scoreData = await scoreResponse.json();
-            return { sourceId: source.SourceID, score: scoreData.avg_credibility };
-          }
-        } catch (err) {
-          console.error(`Error fetching credibility for source ${source.SourceID}:`, err);
-        }
-        return null;
-      });
-      
-      const scoreResults = await Promise.all(scorePromises);
+
       const scores = {};
-      scoreResults.forEach(result => {
-        if (result) {
-          scores[result.sourceId] = result.score;
+      data.forEach(source => {
+        if (source.AvgCredibility !== undefined && source.AvgCredibility !== null) {
+          scores[source.SourceID] = source.AvgCredibility;
         }
       });
       setCredibilityScores(scores);